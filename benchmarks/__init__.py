@@ -0,0 +1 @@
+# Benchmarks for the Hackathon Team Finder Discord Bot
@@ -0,0 +1,91 @@
+"""
+Approximate (MinHash/LSH) matching benchmark
+
+Compares LSH shortlist reranking against exact candidate-index lookups on a
+synthetic guild and reports recall and latency per band/row setting, so the
+LSH_BANDS and LSH_ROWS defaults can be tuned.
+
+Run with: python -m benchmarks.lsh --users 100000 --grid 8x2 16x2 16x4 32x4 --output lsh.json
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Any, Tuple
+from utils.candidate_index import CandidateIndex
+from utils.lsh_index import MinHashLSH
+from .suite import summarize, environment
+from .synthetic import GuildGenerator, profile_for_api
+
+def parse_grid(values: List[str]) -> List[Tuple[int, int]]:
+    """Parse BANDSxROWS settings"""
+    return [tuple(int(part) for part in value.lower().split("x")) for value in values]
+
+def run(users: int, grid: List[Tuple[int, int]], queries: int, k: int, seed: int) -> Dict[str, Any]:
+    generator = GuildGenerator(seed)
+    profiles = [profile_for_api(profile) for profile in generator.profiles(users)]
+    index = CandidateIndex()
+    for profile in profiles:
+        index.add(profile)
+
+    rng = random.Random(seed)
+    sample = rng.sample(profiles, min(queries, len(profiles)))
+    exact_latencies, exact_results = [], []
+    for profile in sample:
+        started = time.perf_counter()
+        exact_results.append(index.top_k(profile, k=k, exclude=profile["user_id"]))
+        exact_latencies.append(time.perf_counter() - started)
+
+    report = {"users": users, "queries": len(sample), "k": k, "exact": summarize(exact_latencies), "settings": []}
+    for bands, rows in grid:
+        lsh = MinHashLSH(bands=bands, rows=rows)
+        started = time.perf_counter()
+        for profile in profiles:
+            lsh.add(profile)
+        build_seconds = time.perf_counter() - started
+
+        latencies, id_recall, score_recall, shortlist_sizes = [], [], [], []
+        for profile, exact in zip(sample, exact_results):
+            started = time.perf_counter()
+            approximate = lsh.top_k(index, profile, k)
+            latencies.append(time.perf_counter() - started)
+            shortlist_sizes.append(len(lsh.candidates(profile)))
+            if exact:
+                # Ties make ID overlap pessimistic, so score mass is reported too
+                id_recall.append(len({u for u, _ in approximate} & {u for u, _ in exact}) / len(exact))
+                score_recall.append(sum(s for _, s in approximate) / sum(s for _, s in exact))
+
+        setting = {
+            "bands": bands,
+            "rows": rows,
+            "build_seconds": build_seconds,
+            "recall_at_k": sum(id_recall) / len(id_recall) if id_recall else None,
+            "score_recall_at_k": sum(score_recall) / len(score_recall) if score_recall else None,
+            "mean_shortlist": sum(shortlist_sizes) / len(shortlist_sizes),
+            "latency": summarize(latencies),
+            "index": lsh.stats()
+        }
+        report["settings"].append(setting)
+        print(f"{bands}x{rows}: recall@{k}={setting['recall_at_k']:.3f} score_recall={setting['score_recall_at_k']:.3f} "
+              f"p50={setting['latency']['p50_ms']:.2f}ms (exact {report['exact']['p50_ms']:.2f}ms) "
+              f"shortlist={setting['mean_shortlist']:.0f}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LSH approximate matching against exact matching")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--grid", nargs="+", default=["8x2", "16x2", "16x4", "32x4"], help="BANDSxROWS settings")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), **run(args.users, parse_grid(args.grid), args.queries, args.k, args.seed)}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
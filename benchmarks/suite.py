@@ -0,0 +1,195 @@
+"""
+Matching and storage benchmark suite
+
+Times calculate_compatibility, find_compatible_teammates, get_all_users,
+save_user_profile and add_user_to_hackathon against a temporary SQLite
+database filled with a synthetic guild, and reports how many profile classes
+the guild collapses into. Every size runs in its own
+subprocess so peak RSS is measured per size, and results are written as JSON
+so runs can be compared.
+
+Run with: python -m benchmarks.suite --sizes 1000 10000 100000 1000000 --output bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional
+from .synthetic import GuildGenerator, profile_for_api
+
+SEED_BATCH_SIZE = 10000
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def summarize(latencies: List[float], items_per_call: int = 1) -> Dict[str, Any]:
+    """Throughput and latency percentiles from per-call latencies in seconds"""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "calls": len(ordered),
+        "throughput_per_s": len(ordered) * items_per_call / total if total else None,
+        "mean_ms": total / len(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "total_s": total,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def time_calls(fn: Callable[[int], Any], calls: int) -> List[float]:
+    """Latency of each call fn(i)"""
+    latencies = []
+    for i in range(calls):
+        started = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def seed_database(database, generator: GuildGenerator, size: int, hackathon_count: int):
+    """Bulk-load the synthetic guild outside of the timed sections"""
+    with database.get_db_manager().engine.begin() as connection:
+        for start in range(0, size, SEED_BATCH_SIZE):
+            batch = generator.profiles(min(SEED_BATCH_SIZE, size - start), start=start)
+            connection.execute(database.UserProfile.__table__.insert(), batch)
+        hackathons = generator.hackathons(hackathon_count, size)
+        connection.execute(
+            database.Hackathon.__table__.insert(),
+            [{key: value for key, value in hackathon.items() if key != "teams"} for hackathon in hackathons]
+        )
+        # A fresh database numbers the hackathons from 1 in insert order
+        participants = [
+            {"hackathon_id": hackathon_id, "user_id": member["user_id"], "guild_id": hackathon["guild_id"],
+             "username": member["username"], "joined_at": datetime.fromisoformat(member["joined_at"])}
+            for hackathon_id, hackathon in enumerate(hackathons, 1)
+            for member in hackathon["teams"]
+        ]
+        for start in range(0, len(participants), SEED_BATCH_SIZE):
+            connection.execute(database.HackathonParticipant.__table__.insert(), participants[start:start + SEED_BATCH_SIZE])
+
+def run_size(size: int, seed: int, workdir: str) -> Dict[str, Any]:
+    """Run every benchmark for one guild size in this process"""
+    path = os.path.join(workdir, f"bench_{size}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    logging.getLogger("utils.database").setLevel(logging.WARNING)
+    from utils import database
+    from utils.candidate_index import CandidateIndex
+    from utils.matching import calculate_compatibility, find_compatible_teammates
+
+    generator = GuildGenerator(seed)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    seed_database(database, generator, size, hackathon_count=20)
+    results: Dict[str, Any] = {"seed_seconds": time.perf_counter() - started}
+
+    # Pure scoring on a pool of in-memory profiles
+    pool = [profile_for_api(generator.profile(i)) for i in rng.sample(range(size), min(size, 5000))]
+    pairs = [(rng.choice(pool), rng.choice(pool)) for _ in range(20000)]
+    results["calculate_compatibility"] = summarize(time_calls(lambda i: calculate_compatibility(*pairs[i]), len(pairs)))
+
+    results["get_all_users"] = summarize(
+        time_calls(lambda i: database.get_all_users(generator.guild_id), max(1, min(10, 100000 // size))),
+        items_per_call=size
+    )
+
+    users = {user["user_id"]: user for user in database.get_all_users(generator.guild_id)}
+    index = CandidateIndex()
+    for user in users.values():
+        index.add(user)
+    profile_classes = index.class_stats()
+    del index
+    queries = rng.sample(list(users.values()), min(len(users), 50))
+    calls = max(1, min(50, 200000 // size))
+    # The first call encodes the guild; the timed calls use the kept engine
+    find_compatible_teammates(queries[0], k=5)
+    results["find_compatible_teammates"] = summarize(
+        time_calls(lambda i: find_compatible_teammates(queries[i % len(queries)], k=5), calls)
+    )
+    del users
+
+    # Writes: half updates of existing users, half new users
+    updates = [profile_for_api(generator.profile(i)) for i in rng.sample(range(size), min(size, 100))]
+    for profile in updates:
+        profile["timezone"] = rng.choice(["UTC", "EST", "PST"])
+    inserts = [profile_for_api(generator.profile(i)) for i in range(size, size + 100)]
+    writes = updates + inserts
+    for profile in writes:
+        del profile["created_at"], profile["updated_at"]
+    results["save_user_profile"] = summarize(time_calls(lambda i: database.save_user_profile(writes[i]), len(writes)))
+
+    # Joins land on the most popular hackathon, the largest participant list
+    joiners = [generator.user_id(i) for i in range(size, size + 100)]
+    results["add_user_to_hackathon"] = summarize(
+        time_calls(lambda i: database.add_user_to_hackathon(generator.guild_id, 1, joiners[i], f"hacker{size + i}"), len(joiners))
+    )
+
+    return {"users": size, "seed": seed, "results": results, "profile_classes": profile_classes, "peak_rss_mb": peak_rss_mb()}
+
+def environment() -> Dict[str, Any]:
+    """Metadata that makes runs comparable"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit
+    }
+
+def run(sizes: List[int], seed: int, output: Optional[str]) -> Dict[str, Any]:
+    """Run each size in a fresh subprocess and collect the JSON results"""
+    report = {"environment": environment(), "runs": []}
+    with tempfile.TemporaryDirectory(prefix="hackbot-bench-") as workdir:
+        for size in sizes:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", "--single", str(size), "--seed", str(seed), "--workdir", workdir],
+                capture_output=True, text=True, check=True
+            )
+            run_result = json.loads(completed.stdout.strip().splitlines()[-1])
+            report["runs"].append(run_result)
+            print(f"{size} users: " + ", ".join(
+                f"{name} p50={metrics['p50_ms']:.3f}ms"
+                for name, metrics in run_result["results"].items() if isinstance(metrics, dict)
+            ), file=sys.stderr)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark matching and storage")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_size(args.single, args.seed, args.workdir)))
+    else:
+        run(args.sizes, args.seed, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Seeded synthetic guild generator for benchmarks
+
+Profiles are drawn from the config vocabularies with a realistic skew: a few
+roles, skills and timezones dominate, most users are beginners or
+intermediate, and a share of users copy one of a handful of "starter"
+profiles, the way many students list the same beginner stack.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Sequence
+from config import USER_ROLES, TECH_SKILLS, EXPERIENCE_LEVELS, TIMEZONES
+
+EXPERIENCE_WEIGHTS = [0.40, 0.35, 0.18, 0.07]
+TIMEZONE_WEIGHTS = [0.10, 0.30, 0.12, 0.05, 0.22, 0.08, 0.07, 0.03, 0.03]
+TEMPLATE_SHARE = 0.15
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    """Zipf weights, most popular first"""
+    return [1.0 / (rank + 1) ** exponent for rank in range(count)]
+
+def weighted_sample(rng: random.Random, population: Sequence[str], weights: Sequence[float], count: int) -> List[str]:
+    """Sample count distinct items, favouring heavier weights"""
+    chosen: List[str] = []
+    seen = set()
+    while len(chosen) < min(count, len(population)):
+        item = rng.choices(population, weights)[0]
+        if item not in seen:
+            seen.add(item)
+            chosen.append(item)
+    return chosen
+
+class GuildGenerator:
+    """Deterministic generator of one guild's profiles and hackathons for one seed"""
+
+    def __init__(self, seed: int = 0, guild_id: str = "1"):
+        self.seed = seed
+        self.guild_id = guild_id
+        vocabulary_rng = random.Random(seed)
+        # Popularity order is shuffled per seed so no vocabulary position is special
+        self.skills = list(TECH_SKILLS)
+        vocabulary_rng.shuffle(self.skills)
+        self.skill_weights = zipf_weights(len(self.skills))
+        self.roles = list(USER_ROLES)
+        vocabulary_rng.shuffle(self.roles)
+        self.role_weights = zipf_weights(len(self.roles), exponent=0.8)
+        self.templates = [self._random_profile_fields(vocabulary_rng) for _ in range(8)]
+        self.template_weights = zipf_weights(len(self.templates))
+
+    def _random_profile_fields(self, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "roles": weighted_sample(rng, self.roles, self.role_weights, rng.choice([1, 1, 1, 2, 2, 3])),
+            "tech_skills": weighted_sample(rng, self.skills, self.skill_weights, rng.randint(2, 8)),
+            "experience": rng.choices(EXPERIENCE_LEVELS, EXPERIENCE_WEIGHTS)[0],
+            "timezone": rng.choices(TIMEZONES, TIMEZONE_WEIGHTS)[0]
+        }
+
+    def user_id(self, i: int) -> str:
+        """Snowflake-shaped user ID"""
+        return str(100000000000000000 + i * 7919)
+
+    def profile(self, i: int) -> Dict[str, Any]:
+        """Profile number i; the same seed and i always give the same profile"""
+        rng = random.Random(self.seed * 1000003 + i)
+        if rng.random() < TEMPLATE_SHARE:
+            fields = dict(rng.choices(self.templates, self.template_weights)[0])
+        else:
+            fields = self._random_profile_fields(rng)
+        created_at = datetime(2024, 1, 1) + timedelta(minutes=i)
+        return {
+            "guild_id": self.guild_id,
+            "user_id": self.user_id(i),
+            "username": f"hacker{i}",
+            **fields,
+            "looking_for_team": rng.random() < 0.8,
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+
+    def profiles(self, count: int, start: int = 0) -> List[Dict[str, Any]]:
+        return [self.profile(i) for i in range(start, start + count)]
+
+    def hackathons(self, count: int, user_count: int) -> List[Dict[str, Any]]:
+        """Hackathons whose sign-ups follow a long tail: a few events draw most users"""
+        rng = random.Random(self.seed + 7)
+        weights = zipf_weights(count)
+        total = sum(weights)
+        hackathons = []
+        for h in range(count):
+            participant_count = min(user_count, int(user_count * 0.5 * weights[h] / total))
+            members = rng.sample(range(user_count), participant_count)
+            hackathons.append({
+                "guild_id": self.guild_id,
+                "name": f"Synthetic Hackathon {h + 1}",
+                "date": f"Day {h + 1}",
+                "description": "Generated for benchmarks",
+                "teams": [
+                    {"user_id": self.user_id(i), "username": f"hacker{i}", "joined_at": "2024-01-01T00:00:00"}
+                    for i in members
+                ]
+            })
+        return hackathons
+
+def profile_for_api(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile as the bot passes it around, with ISO timestamps"""
+    return {
+        **profile,
+        "created_at": profile["created_at"].isoformat(),
+        "updated_at": profile["updated_at"].isoformat()
+    }
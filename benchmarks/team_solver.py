@@ -0,0 +1,58 @@
+"""
+Team formation solver benchmark
+
+Run with: python -m benchmarks.team_solver [--sizes 100 1000 10000] [--budget 5]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Any
+from config import TEAM_SOLVER_ROLE_WEIGHT
+from utils.team_solver import form_teams, encode_participants, evaluate
+from .synthetic import GuildGenerator, profile_for_api
+
+def make_participants(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Skewed synthetic participant profiles"""
+    return [profile_for_api(profile) for profile in GuildGenerator(seed).profiles(count)]
+
+def random_baseline(participants: List[Dict[str, Any]], team_size: int, seed: int = 0) -> float:
+    """Objective of a random split, for comparison"""
+    order = list(range(len(participants)))
+    random.Random(seed).shuffle(order)
+    teams = [order[i:i + team_size] for i in range(0, len(order), team_size)]
+    return evaluate(teams, encode_participants(participants), TEAM_SOLVER_ROLE_WEIGHT)
+
+def run(sizes: List[int], team_size: int, budget: float, restarts: int, workers: int) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        participants = make_participants(size)
+        started = time.perf_counter()
+        result = form_teams(participants, team_size=team_size, time_budget=budget, restarts=restarts, workers=workers or None)
+        results.append({
+            "participants": size,
+            "team_size": team_size,
+            "teams": len(result["teams"]),
+            "objective": result["objective"],
+            "random_objective": random_baseline(participants, team_size),
+            "swaps": result["swaps"],
+            "restarts": result["restarts"],
+            "workers": result["workers"],
+            "wall_seconds": time.perf_counter() - started
+        })
+        print(json.dumps(results[-1]))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the team formation solver")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--team-size", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=5.0)
+    parser.add_argument("--restarts", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=0, help="0 uses one worker per CPU")
+    args = parser.parse_args()
+    run(args.sizes, args.team_size, args.budget, args.restarts, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 """
 Main bot file for the Hackathon Team Finder Discord Bot
+
+python bot.py runs the bot in this process (with --sharded, every shard through
+one AutoShardedClient); launcher.py runs clusters of shards as separate
+processes, each built with create_bot().
 """
 
+import argparse
 import discord
 from discord import app_commands
 import os
+from typing import List, Optional
 from dotenv import load_dotenv
-from config import BOT_TOKEN, BOT_STATUS
+from config import BOT_TOKEN, BOT_STATUS, SHARD_COUNT, HEALTH_CHECK_PORT, DISCORD_STUB_URL, TEAM_MAX_SIZE
 from discord.ext import commands
 from utils.permissions import is_admin
 from modals.user_profile_modal import UserProfileModal
@@ -18,10 +24,17 @@ import threading
 # Import commands from organized modules
 from commands.profile_commands import create_profile, update_profile, view_profile
 from commands.hackathon_commands import (
-    add_hackathon, list_hackathons, remove_hackathon, 
-    find_team, pick_hackathon, remove_from_hackathon
+    add_hackathon, list_hackathons, remove_hackathon,
+    find_team, pick_hackathon, remove_from_hackathon, form_hackathon_teams
 )
 from commands.info_commands import server_stats
+from utils.write_queue import get_write_queue
+from utils.jobs import get_job_runner
+from utils.team_solver import shutdown_solver_pool
+from utils.stats_store import get_stats_store
+from utils.partitions import drop_guild
+from utils.data_manager import set_current_user
+from utils.stub_gateway import point_discord_at
 
 # Load environment variables from .env file (if it exists and is readable)
 try:
@@ -36,40 +49,37 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = discord.Client(intents=intents)
-tree = app_commands.CommandTree(bot)
-
-# Register slash commands 
-@tree.command(name="create-profile", description="Create your developer profile")
+# Slash commands, added to each bot's command tree by create_bot()
+@app_commands.command(name="create-profile", description="Create your developer profile")
 async def create_profile_command(interaction: discord.Interaction):
     await create_profile(interaction)
 
-@tree.command(name="update-profile", description="Update your existing profile")
+@app_commands.command(name="update-profile", description="Update your existing profile")
 async def update_profile_command(interaction: discord.Interaction):
     await update_profile(interaction)
 
-@tree.command(name="view-profile", description="View your current profile")
+@app_commands.command(name="view-profile", description="View your current profile")
 async def view_profile_command(interaction: discord.Interaction):
     await view_profile(interaction)
 
-@tree.command(name="add-hackathon", description="Add a new hackathon (Admin only)")
+@app_commands.command(name="add-hackathon", description="Add a new hackathon (Admin only)")
 async def add_hackathon_command(interaction: discord.Interaction):
     await add_hackathon(interaction)
 
-@tree.command(name="list-hackathons", description="List all available hackathons")
+@app_commands.command(name="list-hackathons", description="List all available hackathons")
 async def list_hackathons_command(interaction: discord.Interaction):
     await list_hackathons(interaction)
 
-@tree.command(name="remove-hackathon", description="Remove a hackathon (Admin only)")
+@app_commands.command(name="remove-hackathon", description="Remove a hackathon (Admin only)")
 @app_commands.describe(hackathon_id="The ID of the hackathon to remove")
 async def remove_hackathon_command(interaction: discord.Interaction, hackathon_id: int):
     await remove_hackathon(interaction, hackathon_id)
 
-@tree.command(name="find-team", description="Find team members for a hackathon")
+@app_commands.command(name="find-team", description="Find team members for a hackathon")
 async def find_team_command(interaction: discord.Interaction):
     await find_team(interaction)
 
-@tree.command(name="pick-hackathon", description="Pick a hackathon and find team members")
+@app_commands.command(name="pick-hackathon", description="Pick a hackathon and find team members")
 @app_commands.describe(
     hackathon_id="The ID of the hackathon",
     looking_for="What type of developer you're looking for"
@@ -77,28 +87,118 @@ async def find_team_command(interaction: discord.Interaction):
 async def pick_hackathon_command(interaction: discord.Interaction, hackathon_id: int, looking_for: str):
     await pick_hackathon(interaction, hackathon_id, looking_for)
 
-@tree.command(name="remove-from-hackathon", description="Remove yourself from a hackathon")
+@app_commands.command(name="remove-from-hackathon", description="Remove yourself from a hackathon")
 @app_commands.describe(hackathon_id="The ID of the hackathon to leave")
 async def remove_from_hackathon_command(interaction: discord.Interaction, hackathon_id: int):
     await remove_from_hackathon(interaction, hackathon_id)
 
-@tree.command(name="stats", description="View server statistics")
+@app_commands.command(name="form-teams", description="Split all hackathon participants into teams (Admin only)")
+@app_commands.describe(
+    hackathon_id="The ID of the hackathon",
+    team_size="Maximum number of members per team"
+)
+async def form_teams_command(interaction: discord.Interaction, hackathon_id: int,
+                             team_size: app_commands.Range[int, 2, TEAM_MAX_SIZE] = 4):
+    await form_hackathon_teams(interaction, hackathon_id, team_size)
+
+@app_commands.command(name="stats", description="View server statistics")
 async def stats_command(interaction: discord.Interaction):
     await server_stats(interaction)
 
-@bot.event
-async def on_ready():
-    """Bot ready event - this runs when the bot starts up"""
-    print(f"🤖 {bot.user} is ready and online!")
-    print(f"📊 Bot is in {len(bot.guilds)} guild(s)")
-    
-    # Set bot status
-    activity = discord.Activity(type=discord.ActivityType.watching, name=BOT_STATUS)
-    await bot.change_presence(activity=activity)
-    
-    # Sync commands
-    await tree.sync()
-    print("✅ Commands synced!")
+COMMANDS = [
+    create_profile_command, update_profile_command, view_profile_command,
+    add_hackathon_command, list_hackathons_command, remove_hackathon_command,
+    find_team_command, pick_hackathon_command, remove_from_hackathon_command,
+    form_teams_command, stats_command
+]
+
+class HackathonCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Runs before every command: its reads see this user's own recent writes
+
+        All data belongs to a guild, so commands are refused in direct messages.
+        """
+        if interaction.guild_id is None:
+            await interaction.response.send_message("❌ Please use this command in a server.", ephemeral=True)
+            return False
+        set_current_user(str(interaction.user.id))
+        return True
+
+class _HackathonClient:
+    """Commands and events shared by the single-connection and sharded bots
+
+    sync_commands: push the command list to Discord once ready; commands are
+    global, so with several clusters only one of them needs to.
+    stagger_identify: wait before this client's first IDENTIFY too, so clusters
+    started one after another stay within Discord's identify rate limit.
+    """
+
+    def __init__(self, *, sync_commands: bool = True, stagger_identify: bool = False, **options):
+        super().__init__(intents=intents, **options)
+        self.tree = HackathonCommandTree(self)
+        for command in COMMANDS:
+            self.tree.add_command(command)
+        self.sync_commands = sync_commands
+        self.stagger_identify = stagger_identify
+
+    async def before_identify_hook(self, shard_id: Optional[int], *, initial: bool = False):
+        if DISCORD_STUB_URL:
+            return
+        await super().before_identify_hook(shard_id, initial=initial and not self.stagger_identify)
+
+    async def close(self):
+        """Cancel running command jobs, commit queued database writes and stop the solver pool before disconnecting"""
+        await get_job_runner().close()
+        await get_write_queue().close()
+        shutdown_solver_pool(wait=False)
+        await super().close()
+
+    async def on_ready(self):
+        """Bot ready event - this runs when the bot starts up"""
+        print(f"🤖 {self.user} is ready and online!")
+        print(f"📊 Bot is in {len(self.guilds)} guild(s)")
+        if self.shard_count:
+            print(f"🧩 Running shard(s) {self.shard_ids or list(range(self.shard_count))} of {self.shard_count}")
+
+        # Set bot status
+        activity = discord.Activity(type=discord.ActivityType.watching, name=BOT_STATUS)
+        await self.change_presence(activity=activity)
+
+        # Sync commands
+        if self.sync_commands:
+            await self.tree.sync()
+            print("✅ Commands synced!")
+
+        # Count each guild's statistics now rather than on its first /stats
+        loop = asyncio.get_running_loop()
+        for guild in self.guilds:
+            await loop.run_in_executor(None, get_stats_store, str(guild.id))
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Free the in-memory indexes and caches of a guild the bot has left; its rows stay in the database"""
+        drop_guild(str(guild.id))
+
+class HackathonBot(_HackathonClient, discord.Client):
+    """The bot on a single gateway connection"""
+
+class ShardedHackathonBot(_HackathonClient, discord.AutoShardedClient):
+    """The bot on several shards, all of them or the shard_ids of one cluster"""
+
+def create_bot(sharded: bool = False, shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None,
+               sync_commands: bool = True, stagger_identify: bool = False) -> discord.Client:
+    """A bot with every command registered; shard_count None asks Discord how many shards to run"""
+    if DISCORD_STUB_URL:
+        point_discord_at(DISCORD_STUB_URL)
+    if not sharded:
+        return HackathonBot(sync_commands=sync_commands)
+    return ShardedHackathonBot(
+        shard_ids=shard_ids, shard_count=shard_count,
+        sync_commands=sync_commands, stagger_identify=stagger_identify
+    )
+
+def get_bot_token() -> Optional[str]:
+    """DISCORD_TOKEN; a stub gateway accepts any token, so one is not needed to run against it"""
+    return BOT_TOKEN or ("stub" if DISCORD_STUB_URL else None)
 
 # Create Flask app for health check
 app = Flask(__name__)
@@ -108,18 +208,25 @@ def health_check():
     return "Bot is running!", 200
 
 def run_flask():
-    app.run(host='0.0.0.0', port=8000)
-
-# Start Flask in a separate thread
-flask_thread = threading.Thread(target=run_flask, daemon=True)
-flask_thread.start()
+    app.run(host='0.0.0.0', port=HEALTH_CHECK_PORT)
 
 # Run the bot
 if __name__ == "__main__":
-    if not BOT_TOKEN:
+    parser = argparse.ArgumentParser(description="Run the Hackathon Team Finder bot in this process")
+    parser.add_argument("--sharded", action="store_true",
+                        help="connect SHARD_COUNT shards (0: Discord's recommendation) through an AutoShardedClient")
+    args = parser.parse_args()
+
+    token = get_bot_token()
+    if not token:
         print("❌ Error: DISCORD_TOKEN not found in environment variables!")
         print("Please set your Discord bot token in the .env file or environment variables.")
         exit(1)
-    
+
+    # Start Flask in a separate thread
+    flask_thread = threading.Thread(target=run_flask, daemon=True)
+    flask_thread.start()
+
     print("🚀 Starting Discord Bot...")
-    bot.run(BOT_TOKEN) 
\ No newline at end of file
+    bot = create_bot(sharded=args.sharded, shard_count=SHARD_COUNT or None)
+    bot.run(token)
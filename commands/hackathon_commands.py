@@ -3,16 +3,39 @@ Hackathon-related commands for the Hackathon Team Finder Discord Bot
 """
 
 import discord
+import asyncio
 from datetime import datetime
 from modals.hackathon_modal import HackathonModal
 from utils.data_manager import (
-    get_user_by_id, get_all_users, get_all_hackathons, 
-    save_single_hackathon, delete_hackathon_by_id,
-    join_hackathon, leave_hackathon
+    get_user_by_id_async, delete_hackathon_by_id_async, get_hackathon_by_id_async,
+    join_hackathon_async, leave_hackathon_async
 )
 from utils.permissions import is_admin
-from utils.matching import find_compatible_teammates
-from config import EMBED_COLORS, USER_ROLES
+from utils.candidate_index import get_candidate_index
+from utils.match_service import get_match_service
+from utils.team_solver import form_teams
+from utils.jobs import get_job_runner
+from views.hackathon_pager import HackathonPager
+from views.match_pager import MatchPager
+from config import EMBED_COLORS, USER_ROLES, TEAM_MAX_SIZE
+
+# Discord rejects embeds over these sizes
+EMBED_FIELD_VALUE_LIMIT = 1024
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELD_LIMIT = 25
+
+def _team_field_value(members, roles) -> str:
+    """A team's member names and roles, cut to fit one embed field"""
+    roles_line = f"Roles: {', '.join(roles).title() if roles else 'Not specified'}"
+    if len(roles_line) > EMBED_FIELD_VALUE_LIMIT // 2:
+        roles_line = roles_line[:EMBED_FIELD_VALUE_LIMIT // 2 - 1] + "…"
+    names = [member.get('username', 'Unknown User') for member in members]
+    budget = EMBED_FIELD_VALUE_LIMIT - len(roles_line) - 1
+    shown, count = ", ".join(names), len(names)
+    while len(shown) > budget and count > 0:
+        count -= 1
+        shown = f"{', '.join(names[:count])} and {len(names) - count} more" if count else f"{len(names)} members"
+    return f"{shown}\n{roles_line}"
 
 async def add_hackathon(interaction: discord.Interaction):
     """Add a new hackathon - admin only, opens the hackathon creation form"""
@@ -20,32 +43,13 @@ async def add_hackathon(interaction: discord.Interaction):
         await interaction.response.send_message("❌ You need admin permissions to add hackathons.", ephemeral=True)
         return
     
-    modal = HackathonModal()
+    modal = HackathonModal(str(interaction.guild_id))
     await interaction.response.send_modal(modal)
 
 async def list_hackathons(interaction: discord.Interaction):
-    """List all available hackathons - show them in a nice embed"""
-    hackathons = get_all_hackathons()
-    
-    if not hackathons:
-        await interaction.response.send_message("❌ No hackathons available.", ephemeral=True)
-        return
-    
-    # Build the hackathon list embed
-    embed = discord.Embed(
-        title="🏆 Available Hackathons",
-        color=EMBED_COLORS["success"]
-    )
-    
-    for hackathon in hackathons:
-        teams_count = len(hackathon.get('teams', []))
-        embed.add_field(
-            name=f"#{hackathon['id']} - {hackathon['name']}",
-            value=f"📅 {hackathon.get('date', 'TBD')}\n👥 {teams_count} participants\n📝 {hackathon.get('description', 'No description')[:100]}...",
-            inline=False
-        )
-    
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    """List all available hackathons - one page at a time, with next/previous buttons"""
+    pager = HackathonPager(interaction.user.id, str(interaction.guild_id))
+    await pager.start(interaction, "❌ No hackathons available.")
 
 async def remove_hackathon(interaction: discord.Interaction, hackathon_id: int):
     """Remove a hackathon - admin only"""
@@ -53,7 +57,7 @@ async def remove_hackathon(interaction: discord.Interaction, hackathon_id: int):
         await interaction.response.send_message("❌ You need admin permissions to remove hackathons.", ephemeral=True)
         return
     
-    success = delete_hackathon_by_id(hackathon_id)
+    success = await delete_hackathon_by_id_async(str(interaction.guild_id), hackathon_id)
     
     if success:
         await interaction.response.send_message(f"✅ Hackathon #{hackathon_id} has been removed.", ephemeral=True)
@@ -62,75 +66,24 @@ async def remove_hackathon(interaction: discord.Interaction, hackathon_id: int):
 
 async def find_team(interaction: discord.Interaction):
     """Find team members for a hackathon - show compatible users"""
+    guild_id = str(interaction.guild_id)
     user_id = str(interaction.user.id)
-    user_profile = get_user_by_id(user_id)
-    
-    if not user_profile:
-        await interaction.response.send_message("❌ You need to create a profile first. Use `/create-profile`.", ephemeral=True)
-        return
-    
-    all_users = get_all_users()
-    # Convert to dict format for compatibility
-    users_dict = {user['user_id']: user for user in all_users}
-    
-    compatible_users = find_compatible_teammates(user_profile, users_dict)
-    
-    if not compatible_users:
-        await interaction.response.send_message("❌ No compatible team members found.", ephemeral=True)
-        return
-    
-    # Build the team finder embed
-    embed = discord.Embed(
-        title="🤝 Compatible Team Members",
-        description="Here are users who might be good teammates:",
-        color=EMBED_COLORS["success"]
-    )
     
-    for i, (user_id, compatibility_score) in enumerate(compatible_users[:5], 1):
-        user_data = users_dict[user_id]
-        # Add error handling for missing keys
-        roles = user_data.get('roles', [])
-        tech_skills = user_data.get('tech_skills', [])
+    async def work(job):
+        user_profile = await get_user_by_id_async(guild_id, user_id)
+        if not user_profile:
+            return {"content": "❌ You need to create a profile first. Use `/create-profile`."}
         
-        embed.add_field(
-            name=f"{i}. {user_data.get('username', 'Unknown User')} (Score: {compatibility_score:.1f})",
-            value=f"Roles: {', '.join(roles).title() if roles else 'Not specified'}\nSkills: {', '.join(tech_skills[:3]) if tech_skills else 'Not specified'}",
-            inline=False
-        )
+        # Scoring runs in the match service's pool so the gateway loop stays responsive;
+        # each page of ranked matches is fetched when its button is pressed
+        pager = MatchPager(interaction.user.id, user_profile)
+        return await pager.first_page("❌ No compatible team members found.")
     
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    # Ranking a large guild can outlast Discord's reply window, so answer from a deferred job
+    await get_job_runner().submit(interaction, "find_team", work)
 
-async def pick_hackathon(interaction: discord.Interaction, hackathon_id: int, looking_for: str):
-    """Pick a hackathon and find team members for it"""
-    user_id = str(interaction.user.id)
-    user_profile = get_user_by_id(user_id)
-    
-    if not user_profile:
-        await interaction.response.send_message("❌ You need to create a profile first. Use `/create-profile`.", ephemeral=True)
-        return
-    
-    # Get hackathons from database
-    hackathons = get_all_hackathons()
-    
-    # Find the specific hackathon
-    hackathon = next((h for h in hackathons if h["id"] == hackathon_id), None)
-    if not hackathon:
-        await interaction.response.send_message(f"❌ Hackathon #{hackathon_id} not found.", ephemeral=True)
-        return
-    
-    # Add user to hackathon
-    success = join_hackathon(hackathon_id, user_id, user_profile['username'])
-    
-    if not success:
-        await interaction.response.send_message(f"❌ You're already participating in {hackathon['name']}.", ephemeral=True)
-        return
-    
-    # Find compatible team members
-    all_users = get_all_users()
-    users_dict = {user['user_id']: user for user in all_users}
-    compatible_users = find_compatible_teammates(user_profile, users_dict)
-    
-    # Build the response embed
+def _team_search_embed(hackathon, looking_for: str, matches, scored: int, total: int) -> discord.Embed:
+    """The /pick-hackathon reply; a search still under way says how far it has got"""
     embed = discord.Embed(
         title=f"🎯 {hackathon['name']} - Team Search",
         description=f"You're looking for: **{looking_for}**",
@@ -140,10 +93,11 @@ async def pick_hackathon(interaction: discord.Interaction, hackathon_id: int, lo
     teams_count = len(hackathon.get('teams', []))
     embed.add_field(name="Hackathon Details", value=f"📅 {hackathon.get('date', 'TBD')}\n👥 {teams_count} participants", inline=False)
     
-    if compatible_users:
+    if matches:
         embed.add_field(name="🤝 Compatible Team Members", value="", inline=False)
-        for i, (user_id, compatibility_score) in enumerate(compatible_users[:3], 1):
-            user_data = users_dict[user_id]
+        for i, match in enumerate(matches, 1):
+            user_data = match['profile'] or {}
+            compatibility_score = match['compatibility_score']
             # Add error handling for missing keys
             roles = user_data.get('roles', [])
             tech_skills = user_data.get('tech_skills', [])
@@ -153,18 +107,109 @@ async def pick_hackathon(interaction: discord.Interaction, hackathon_id: int, lo
                 value=f"Roles: {', '.join(roles).title() if roles else 'Not specified'}\nSkills: {', '.join(tech_skills[:3]) if tech_skills else 'Not specified'}",
                 inline=True
             )
-    else:
+    elif scored == total:
         embed.add_field(name="🤝 Team Members", value="No compatible team members found yet.", inline=False)
     
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    if scored < total:
+        embed.set_footer(text=f"Searching… {scored}/{total} candidates checked")
+    return embed
+
+async def pick_hackathon(interaction: discord.Interaction, hackathon_id: int, looking_for: str):
+    """Pick a hackathon and find team members for it"""
+    guild_id = str(interaction.guild_id)
+    user_id = str(interaction.user.id)
+    
+    async def work(job):
+        user_profile = await get_user_by_id_async(guild_id, user_id)
+        if not user_profile:
+            return {"content": "❌ You need to create a profile first. Use `/create-profile`."}
+        
+        # Find the specific hackathon
+        hackathon = await get_hackathon_by_id_async(guild_id, hackathon_id)
+        if not hackathon:
+            return {"content": f"❌ Hackathon #{hackathon_id} not found."}
+        
+        # Add user to hackathon; shielded so a cancelled job never abandons the write half way
+        success = await asyncio.shield(join_hackathon_async(guild_id, hackathon_id, user_id, user_profile['username']))
+        
+        if not success:
+            return {"content": f"❌ You're already participating in {hackathon['name']}."}
+        
+        # Find compatible team members among this hackathon's participants, filtered by role in the database;
+        # large hackathons are scored in chunks and the best matches so far are shown as they improve
+        matches, scored, total = [], 0, 0
+        async for matches, scored, total in get_match_service().stream_team_matches(
+                user_profile, hackathon_id, k=3, looking_for=looking_for):
+            if scored < total:
+                await job.progress(embed=_team_search_embed(hackathon, looking_for, matches, scored, total))
+        
+        return {"embed": _team_search_embed(hackathon, looking_for, matches, scored, total)}
+    
+    # Picking another hackathon runs alongside; only a repeat for the same hackathon replaces the last one
+    await get_job_runner().submit(interaction, "pick_hackathon", work, key=hackathon_id)
 
 async def remove_from_hackathon(interaction: discord.Interaction, hackathon_id: int):
     """Remove user from a hackathon"""
     user_id = str(interaction.user.id)
     
-    success = leave_hackathon(hackathon_id, user_id)
+    success = await leave_hackathon_async(str(interaction.guild_id), hackathon_id, user_id)
     
     if success:
         await interaction.response.send_message(f"✅ You've been removed from hackathon #{hackathon_id}.", ephemeral=True)
     else:
-        await interaction.response.send_message(f"❌ You're not participating in hackathon #{hackathon_id}.", ephemeral=True) 
\ No newline at end of file
+        await interaction.response.send_message(f"❌ You're not participating in hackathon #{hackathon_id}.", ephemeral=True) 
+
+async def form_hackathon_teams(interaction: discord.Interaction, hackathon_id: int, team_size: int):
+    """Split every participant of a hackathon into teams - admin only"""
+    if not is_admin(interaction.user):
+        await interaction.response.send_message("❌ You need admin permissions to form teams.", ephemeral=True)
+        return
+    
+    if not 2 <= team_size <= TEAM_MAX_SIZE:
+        await interaction.response.send_message(f"❌ Team size must be between 2 and {TEAM_MAX_SIZE}.", ephemeral=True)
+        return
+    
+    guild_id = str(interaction.guild_id)
+    
+    async def work(job):
+        hackathon = await get_hackathon_by_id_async(guild_id, hackathon_id)
+        if not hackathon:
+            return {"content": f"❌ Hackathon #{hackathon_id} not found."}
+        
+        # Only participants with a profile can be scored
+        loop = asyncio.get_running_loop()
+        # The guild's index may still have to be loaded, so fetch it off the event loop
+        index = await loop.run_in_executor(None, get_candidate_index, guild_id)
+        participants = [index.get_profile(member.get('user_id')) for member in hackathon.get('teams', [])]
+        participants = [profile for profile in participants if profile]
+        
+        if len(participants) < 2:
+            return {"content": f"❌ {hackathon['name']} needs at least 2 participants with profiles."}
+        
+        # The solver runs for its whole time budget, off the event loop
+        result = await loop.run_in_executor(None, form_teams, participants, team_size)
+        
+        embed = discord.Embed(
+            title=f"🧩 {hackathon['name']} - Suggested Teams",
+            description=f"{len(participants)} participants in {len(result['teams'])} teams (total score {result['objective']:.1f})",
+            color=EMBED_COLORS["hackathon"]
+        )
+        
+        # Teams are listed until the embed's field count or total size would run out,
+        # keeping room for the closing "More Teams" field
+        shown = 0
+        for i, team in enumerate(result['teams'], 1):
+            members = [index.get_profile(user_id) or {} for user_id in team]
+            roles = sorted({role for member in members for role in member.get('roles', [])})
+            name, value = f"Team {i}", _team_field_value(members, roles)
+            if shown == EMBED_FIELD_LIMIT - 1 or len(embed) + len(name) + len(value) > EMBED_TOTAL_LIMIT - 100:
+                break
+            embed.add_field(name=name, value=value, inline=False)
+            shown += 1
+        
+        if len(result['teams']) > shown:
+            embed.add_field(name="More Teams", value=f"{len(result['teams']) - shown} more teams not shown.", inline=False)
+        
+        return {"embed": embed}
+    
+    await get_job_runner().submit(interaction, "form_teams", work, key=hackathon_id)
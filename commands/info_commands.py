@@ -3,27 +3,36 @@ Info-related commands for the Hackathon Team Finder Discord Bot
 """
 
 import discord
-from utils.data_manager import get_all_users
+import asyncio
+from typing import Dict, Any
+from utils.data_manager import get_data_version
+from utils.stats_store import get_stats_store
+from utils.render_cache import get_render_cache
+from utils.jobs import get_job_runner
 from config import EMBED_COLORS
 
 async def server_stats(interaction: discord.Interaction):
     """Show server statistics - total users, active profiles, etc."""
-    users = get_all_users()
-    
-    total_users = len(users)
-    active_profiles = len([u for u in users if u.get('looking_for_team', True)])
-    
-    # Count roles
-    role_counts = {}
-    for user in users:
-        for role in user.get('roles', []):
-            role_counts[role] = role_counts.get(role, 0) + 1
-    
-    # Count experience levels
-    experience_counts = {}
-    for user in users:
-        exp = user.get('experience', 'unknown')
-        experience_counts[exp] = experience_counts.get(exp, 0) + 1
+    # The first call after startup may still be counting profiles, so answer from a deferred job
+    guild_id = str(interaction.guild_id)
+    await get_job_runner().submit(interaction, "server_stats", lambda job: _server_stats_work(guild_id))
+
+async def _server_stats_work(guild_id: str) -> Dict[str, Any]:
+    # Counts are kept current by every profile and hackathon write; only the
+    # guild's first use (if on_ready has not built them yet) scans the database
+    loop = asyncio.get_running_loop()
+    store = await loop.run_in_executor(None, get_stats_store, guild_id)
+    # Everyone in the guild sees the same embed until its next profile or hackathon write
+    version = get_data_version(guild_id, 'profiles', 'hackathons')
+    embed = get_render_cache().get_or_render(("server_stats", guild_id), version, lambda: _stats_embed(store.snapshot()))
+    return {"embed": embed}
+
+def _stats_embed(stats: Dict[str, Any]) -> discord.Embed:
+    total_users = stats["total_users"]
+    active_profiles = stats["looking_for_team"]
+    role_counts = stats["role_counts"]
+    experience_counts = stats["experience_counts"]
+    timezone_counts = stats["timezone_counts"]
     
     embed = discord.Embed(
         title="📊 Server Statistics",
@@ -45,4 +54,18 @@ async def server_stats(interaction: discord.Interaction):
         exp_text = "\n".join([f"• {exp.title()}: {count}" for exp, count in experience_counts.items()])
         embed.add_field(name="Experience Levels", value=exp_text, inline=True)
     
-    await interaction.response.send_message(embed=embed, ephemeral=True) 
\ No newline at end of file
+    # Timezone distribution
+    if timezone_counts:
+        top_timezones = sorted(timezone_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        tz_text = "\n".join([f"• {tz}: {count}" for tz, count in top_timezones])
+        embed.add_field(name="Timezones", value=tz_text, inline=True)
+    
+    # Hackathons with the most participants
+    if stats["busiest_hackathons"]:
+        hackathons_text = "\n".join([
+            f"• #{hackathon['id']} {hackathon['name']}: {hackathon['participant_count']}"
+            for hackathon in stats["busiest_hackathons"]
+        ])
+        embed.add_field(name=f"Busiest Hackathons ({stats['hackathons']} total)", value=hackathons_text, inline=False)
+    
+    return embed
@@ -4,7 +4,7 @@ Profile-related commands for the Hackathon Team Finder Discord Bot
 
 import discord
 from modals.user_profile_modal import UserProfileModal
-from utils.data_manager import get_user_by_id, get_all_users
+from utils.data_manager import get_user_by_id_async
 from config import EMBED_COLORS
 
 async def create_profile(interaction: discord.Interaction):
@@ -15,7 +15,7 @@ async def create_profile(interaction: discord.Interaction):
 async def update_profile(interaction: discord.Interaction):
     """Update existing user profile - check if profile exists first"""
     user_id = str(interaction.user.id)
-    profile = get_user_by_id(user_id)
+    profile = await get_user_by_id_async(str(interaction.guild_id), user_id)
     
     if not profile:
         await interaction.response.send_message("❌ You don't have a profile yet. Use `/create-profile` first.", ephemeral=True)
@@ -27,7 +27,7 @@ async def update_profile(interaction: discord.Interaction):
 async def view_profile(interaction: discord.Interaction):
     """View user profile - show all the profile details in a nice embed"""
     user_id = str(interaction.user.id)
-    profile = get_user_by_id(user_id)
+    profile = await get_user_by_id_async(str(interaction.guild_id), user_id)
     
     if not profile:
         await interaction.response.send_message("❌ You don't have a profile yet. Use `/create-profile` first.", ephemeral=True)
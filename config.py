@@ -54,4 +54,113 @@ EXPERIENCE_LEVELS = [
 # Timezones
 TIMEZONES = [
     "UTC", "EST", "CST", "MST", "PST", "GMT", "CET", "JST", "AEST"
-] 
\ No newline at end of file
+]
+
+# Database connection pool sizing (Postgres; SQLite uses SQLAlchemy's defaults)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Rows fetched per round trip by streaming reads
+DB_STREAM_BATCH_SIZE = int(os.getenv("DB_STREAM_BATCH_SIZE", "1000"))
+
+# Rows per statement in bulk profile and hackathon writes
+BULK_WRITE_BATCH_SIZE = int(os.getenv("BULK_WRITE_BATCH_SIZE", "1000"))
+
+# Match cache sizing (per-user top-k lists)
+MATCH_CACHE_MAX_USERS = int(os.getenv("MATCH_CACHE_MAX_USERS", "5000"))
+MATCH_CACHE_DEPTH = int(os.getenv("MATCH_CACHE_DEPTH", "10"))
+
+# Hackathon matches only consider participants sharing at least this many skills (0 disables)
+MATCH_MIN_SKILL_OVERLAP = int(os.getenv("MATCH_MIN_SKILL_OVERLAP", "0"))
+
+# With DATABASE_REPLICA_URL set, reads go to the replica except for users who
+# wrote within this many seconds, who keep reading from the primary
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
+# Apply pending schema migrations at startup; the SQLite fallback always does,
+# other databases refuse to start below the latest revision unless this is set
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "0") == "1"
+
+# Profiles, hackathons and participants belong to a guild; rows created before
+# data was partitioned by guild are given this guild ID when the schema is
+# upgraded (set it to the server the bot was running in). Migration 0003
+# refuses to run while it is unset and there are rows to assign
+LEGACY_GUILD_ID = os.getenv("LEGACY_GUILD_ID")
+
+# Async profile saves, joins and leaves are grouped into one commit per batch:
+# a batch is flushed when it reaches the size limit or the interval (seconds) passes
+WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", "1") == "1"
+WRITE_QUEUE_FLUSH_INTERVAL = float(os.getenv("WRITE_QUEUE_FLUSH_INTERVAL", "0.05"))
+WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "200"))
+
+# Pagers: rows per page (an embed holds at most 25 fields) and how long buttons stay live (seconds)
+HACKATHON_PAGE_SIZE = int(os.getenv("HACKATHON_PAGE_SIZE", "10"))
+MATCH_PAGE_SIZE = int(os.getenv("MATCH_PAGE_SIZE", "5"))
+PAGER_TIMEOUT = float(os.getenv("PAGER_TIMEOUT", "300"))
+
+# Read-through caches in utils.data_manager: entries expire after the TTL (seconds)
+# and each cache is bounded by both an entry count and an approximate byte budget
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "10000"))
+PROFILE_CACHE_MAX_BYTES = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+HACKATHON_CACHE_MAX_ENTRIES = int(os.getenv("HACKATHON_CACHE_MAX_ENTRIES", "500"))
+HACKATHON_CACHE_MAX_BYTES = int(os.getenv("HACKATHON_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+HACKATHON_CACHE_TTL = float(os.getenv("HACKATHON_CACHE_TTL", "60"))
+
+# Scores between profile classes (users with identical roles, skills, experience and timezone)
+CLASS_SCORE_CACHE_SIZE = int(os.getenv("CLASS_SCORE_CACHE_SIZE", "200000"))
+
+# Team formation solver (/form-teams)
+TEAM_SOLVER_ROLE_WEIGHT = float(os.getenv("TEAM_SOLVER_ROLE_WEIGHT", "0.5"))
+TEAM_SOLVER_TIME_BUDGET = float(os.getenv("TEAM_SOLVER_TIME_BUDGET", "5.0"))
+TEAM_SOLVER_RESTARTS = int(os.getenv("TEAM_SOLVER_RESTARTS", "4"))
+# Solver pool processes (0: one per restart, up to the CPU count)
+TEAM_SOLVER_WORKERS = int(os.getenv("TEAM_SOLVER_WORKERS", "0"))
+# Largest team /form-teams accepts
+TEAM_MAX_SIZE = int(os.getenv("TEAM_MAX_SIZE", "10"))
+
+# Matching service: "thread" shares the in-process index, "process" gives each worker its own copy
+MATCH_EXECUTOR = os.getenv("MATCH_EXECUTOR", "thread")
+MATCH_POOL_SIZE = int(os.getenv("MATCH_POOL_SIZE", "4"))
+
+# "exact" scores every relevant candidate; "approximate" reranks a MinHash/LSH shortlist
+MATCHING_MODE = os.getenv("MATCHING_MODE", "exact")
+LSH_BANDS = int(os.getenv("LSH_BANDS", "16"))
+LSH_ROWS = int(os.getenv("LSH_ROWS", "4"))
+
+# Deferred-response jobs for slow commands: at most JOB_MAX_CONCURRENCY run at once,
+# each for up to JOB_TIMEOUT seconds, with partial results shown at most every
+# JOB_PROGRESS_INTERVAL seconds; latency percentiles keep the last JOB_TIMING_SAMPLES jobs
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "60"))
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", "8"))
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "1.0"))
+JOB_TIMING_SAMPLES = int(os.getenv("JOB_TIMING_SAMPLES", "1000"))
+
+# Hackathon matches are scored in chunks of this many candidates, showing the best so far after each
+MATCH_STREAM_CHUNK_SIZE = int(os.getenv("MATCH_STREAM_CHUNK_SIZE", "2000"))
+
+# Rendered hackathon list pages and /stats embeds, cached per data version
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "256"))
+
+# Health check HTTP server (bot.py, or launcher.py for the whole cluster set)
+HEALTH_CHECK_PORT = int(os.getenv("HEALTH_CHECK_PORT", "8000"))
+
+# Sharded mode: SHARD_COUNT shards in total (0 uses Discord's recommendation);
+# launcher.py runs them as clusters of SHARDS_PER_CLUSTER, one process each
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARDS_PER_CLUSTER = int(os.getenv("SHARDS_PER_CLUSTER", "4"))
+
+# Clusters report health every CLUSTER_HEARTBEAT_INTERVAL seconds and are restarted
+# after CLUSTER_HEARTBEAT_TIMEOUT seconds of silence; a stopping cluster gets
+# CLUSTER_STOP_TIMEOUT seconds to flush its writes, and a starting one
+# CLUSTER_READY_TIMEOUT seconds to connect its shards before the next one starts
+CLUSTER_HEARTBEAT_INTERVAL = float(os.getenv("CLUSTER_HEARTBEAT_INTERVAL", "5"))
+CLUSTER_HEARTBEAT_TIMEOUT = float(os.getenv("CLUSTER_HEARTBEAT_TIMEOUT", "30"))
+CLUSTER_STOP_TIMEOUT = float(os.getenv("CLUSTER_STOP_TIMEOUT", "30"))
+CLUSTER_READY_TIMEOUT = float(os.getenv("CLUSTER_READY_TIMEOUT", "120"))
+
+# Talk to a local stub gateway (python -m utils.stub_gateway) instead of Discord,
+# e.g. http://127.0.0.1:8765
+DISCORD_STUB_URL = os.getenv("DISCORD_STUB_URL")
@@ -0,0 +1,88 @@
+"""
+Sharded multi-process launcher for the Hackathon Team Finder Discord Bot
+
+Runs SHARD_COUNT shards (0: as many as Discord recommends) as clusters of
+SHARDS_PER_CLUSTER shards, one process per cluster, all against the shared
+database. The health check on HEALTH_CHECK_PORT answers 200 only while every
+cluster is connected and reporting; /clusters has the per-cluster detail.
+SIGHUP restarts the clusters one at a time, SIGTERM or Ctrl+C stops them all
+after they flush their queued writes.
+
+Run with: python launcher.py
+Try locally without a token: python launcher.py --stub-gateway --shards 4 --shards-per-cluster 2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import threading
+from flask import Flask, jsonify
+from config import BOT_TOKEN, SHARD_COUNT, SHARDS_PER_CLUSTER, HEALTH_CHECK_PORT, DISCORD_STUB_URL
+from utils.cluster import ClusterManager, fetch_recommended_shards
+from utils.stub_gateway import StubGateway, point_discord_at
+
+logger = logging.getLogger("launcher")
+
+def create_health_app(manager: ClusterManager) -> Flask:
+    app = Flask(__name__)
+
+    @app.route('/')
+    def health_check():
+        status = manager.status()
+        total = len(status["clusters"])
+        if status["healthy"] == total:
+            return "Bot is running!", 200
+        return f"{status['healthy']} of {total} clusters healthy", 503
+
+    @app.route('/clusters')
+    def cluster_status():
+        return jsonify(manager.status())
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=SHARD_COUNT,
+                        help="total shard count (default SHARD_COUNT; 0 asks Discord)")
+    parser.add_argument("--shards-per-cluster", type=int, default=SHARDS_PER_CLUSTER,
+                        help="shards run by each process (default SHARDS_PER_CLUSTER)")
+    parser.add_argument("--stub-gateway", action="store_true",
+                        help="start a local stub gateway and connect the clusters to it instead of Discord")
+    parser.add_argument("--stub-guilds", type=int, default=40, help="guilds the stub gateway serves")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[launcher] %(levelname)s %(name)s: %(message)s")
+
+    stub_url = DISCORD_STUB_URL
+    if args.stub_gateway:
+        stub_url = StubGateway(args.stub_guilds, recommended_shards=args.shards or 1).run_in_thread()
+        # Cluster processes read it from the environment they are spawned with
+        os.environ["DISCORD_STUB_URL"] = stub_url
+        logger.info("Stub gateway for %d guilds listening on %s", args.stub_guilds, stub_url)
+    if stub_url:
+        point_discord_at(stub_url)
+
+    token = BOT_TOKEN or ("stub" if stub_url else None)
+    if not token:
+        print("❌ Error: DISCORD_TOKEN not found in environment variables!")
+        print("Please set your Discord bot token in the .env file or environment variables.")
+        exit(1)
+
+    shard_count = args.shards or asyncio.run(fetch_recommended_shards(token))
+    manager = ClusterManager(shard_count, args.shards_per_cluster)
+    logger.info("Running %d shard(s) as %d cluster(s)", shard_count, len(manager.clusters))
+
+    health_app = create_health_app(manager)
+    threading.Thread(target=lambda: health_app.run(host='0.0.0.0', port=HEALTH_CHECK_PORT), daemon=True).start()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: manager.request_shutdown())
+    signal.signal(signal.SIGINT, lambda signum, frame: manager.request_shutdown())
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: manager.request_rolling_restart())
+
+    manager.supervise()
+    logger.info("All clusters stopped")
+
+if __name__ == "__main__":
+    main()
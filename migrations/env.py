@@ -0,0 +1,62 @@
+"""
+Alembic environment for the Hackathon Team Finder Discord Bot
+
+Run from the repository root with DATABASE_URL set, e.g. `alembic upgrade head`.
+utils.schema runs the same migrations on the bot's own connection at startup.
+"""
+
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import Connection
+from utils.database import Base, sqlite_metadata, get_database_url
+
+config = context.config
+
+# The bot configures its own logging; only the CLI needs alembic.ini's
+if config.config_file_name is not None and "connection" not in config.attributes:
+    fileConfig(config.config_file_name)
+
+def target_metadata_for(dialect_name: str):
+    """Models, plus the SQLite-only skill table when migrating SQLite"""
+    if dialect_name == "sqlite":
+        return [Base.metadata, sqlite_metadata]
+    return Base.metadata
+
+def run_migrations_offline():
+    """Emit the migration SQL for DATABASE_URL without connecting"""
+    url = get_database_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata_for(url.split(":", 1)[0].split("+", 1)[0]),
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def _run_migrations(connection: Connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata_for(connection.dialect.name),
+        # SQLite alters tables by copying them
+        render_as_batch=connection.dialect.name == "sqlite"
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Migrate on the connection utils.schema passed in, or connect to DATABASE_URL"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
+    engine = create_engine(get_database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run_migrations(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
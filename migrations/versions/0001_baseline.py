@@ -0,0 +1,110 @@
+"""Baseline schema: profiles, hackathons, participants and the skill filters
+
+Databases created by Base.metadata.create_all before migrations existed are
+brought up to this revision too: every table, index and trigger is only
+created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+SKILL_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS user_skills_insert AFTER INSERT ON user_profiles BEGIN
+        INSERT OR IGNORE INTO user_skills (skill, user_id) SELECT value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_update AFTER UPDATE OF tech_skills ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE user_id = OLD.user_id;
+        INSERT OR IGNORE INTO user_skills (skill, user_id) SELECT value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_delete AFTER DELETE ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE user_id = OLD.user_id;
+    END""",
+]
+
+def _existing_tables():
+    """Tables already in the database; none when only emitting SQL"""
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+def upgrade():
+    tables = _existing_tables()
+    dialect_name = context.get_context().dialect.name
+
+    if 'user_profiles' not in tables:
+        op.create_table(
+            'user_profiles',
+            sa.Column('user_id', sa.String(50), primary_key=True),
+            sa.Column('username', sa.String(100), nullable=False),
+            sa.Column('roles', sa.JSON()),
+            sa.Column('tech_skills', sa.JSON()),
+            sa.Column('experience', sa.String(50)),
+            sa.Column('timezone', sa.String(10)),
+            sa.Column('looking_for_team', sa.Boolean()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime())
+        )
+
+    if 'hackathons' not in tables:
+        op.create_table(
+            'hackathons',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('name', sa.String(200), nullable=False),
+            sa.Column('description', sa.Text()),
+            sa.Column('date', sa.String(100)),
+            sa.Column('teams', sa.JSON()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime())
+        )
+
+    if 'hackathon_participants' not in tables:
+        op.create_table(
+            'hackathon_participants',
+            sa.Column('hackathon_id', sa.Integer(), sa.ForeignKey('hackathons.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('user_id', sa.String(50), primary_key=True),
+            sa.Column('username', sa.String(100)),
+            sa.Column('joined_at', sa.DateTime())
+        )
+    op.create_index('ix_hackathon_participants_user_id', 'hackathon_participants', ['user_id'], if_not_exists=True)
+    op.create_index('ix_hackathon_participants_joined', 'hackathon_participants', ['hackathon_id', 'joined_at'], if_not_exists=True)
+
+    if dialect_name == 'postgresql':
+        # Skill and role pre-filters query the jsonb casts of the list columns
+        op.create_index('ix_user_profiles_tech_skills_gin', 'user_profiles', [sa.text('CAST(tech_skills AS JSONB)')],
+                        postgresql_using='gin', if_not_exists=True)
+        op.create_index('ix_user_profiles_roles_gin', 'user_profiles', [sa.text('CAST(roles AS JSONB)')],
+                        postgresql_using='gin', if_not_exists=True)
+    elif dialect_name == 'sqlite':
+        # Normalized skills, kept in sync with user_profiles.tech_skills by triggers
+        if 'user_skills' not in tables:
+            op.create_table(
+                'user_skills',
+                sa.Column('skill', sa.String(100), primary_key=True),
+                sa.Column('user_id', sa.String(50), primary_key=True)
+            )
+        op.create_index('ix_user_skills_user_id', 'user_skills', ['user_id'], if_not_exists=True)
+        for trigger in SKILL_TRIGGERS:
+            op.execute(trigger)
+        op.execute(
+            "INSERT OR IGNORE INTO user_skills (skill, user_id) "
+            "SELECT value, user_profiles.user_id FROM user_profiles, json_each(user_profiles.tech_skills)"
+        )
+
+def downgrade():
+    dialect_name = context.get_context().dialect.name
+    if dialect_name == 'sqlite':
+        for trigger in ('user_skills_insert', 'user_skills_update', 'user_skills_delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.drop_table('user_skills')
+    op.drop_table('hackathon_participants')
+    op.drop_table('hackathons')
+    op.drop_table('user_profiles')
@@ -0,0 +1,41 @@
+"""Index the user_profiles columns that matching and stats filter on
+
+On Postgres the indexes are built CONCURRENTLY, outside the migration
+transaction, so a large user_profiles table stays writable during the build.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import context, op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_user_profiles_looking_for_team', 'looking_for_team'),
+    ('ix_user_profiles_timezone', 'timezone'),
+    ('ix_user_profiles_experience', 'experience'),
+    ('ix_user_profiles_updated_at', 'updated_at'),
+]
+
+def upgrade():
+    if context.get_context().dialect.name == 'postgresql':
+        with context.get_context().autocommit_block():
+            for name, column in INDEXES:
+                op.create_index(name, 'user_profiles', [column], postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, column in INDEXES:
+            op.create_index(name, 'user_profiles', [column], if_not_exists=True)
+
+def downgrade():
+    if context.get_context().dialect.name == 'postgresql':
+        with context.get_context().autocommit_block():
+            for name, _ in INDEXES:
+                op.drop_index(name, 'user_profiles', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in INDEXES:
+            op.drop_index(name, 'user_profiles', if_exists=True)
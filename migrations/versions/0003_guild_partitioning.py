@@ -0,0 +1,223 @@
+"""Partition profiles, hackathons and participants by guild
+
+Profiles become one per user per guild, keyed by (guild_id, user_id), and
+hackathons and their participants record the guild they belong to. Every
+per-guild read filters on guild_id first, so the single-column filter indexes
+from 0002 are replaced with composite ones led by guild_id.
+
+Existing rows are assigned to the guild LEGACY_GUILD_ID names, which must be
+set to the server the bot was running in. There is no safe default: rows given
+a guild the bot is not in would vanish from every command. The upgrade fails
+if the variable is unset and the tables hold any rows (and always in offline
+mode, where it cannot look); an empty database upgrades without it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+from config import LEGACY_GUILD_ID
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+OLD_INDEXES = [
+    ('ix_user_profiles_looking_for_team', 'user_profiles', ['looking_for_team']),
+    ('ix_user_profiles_timezone', 'user_profiles', ['timezone']),
+    ('ix_user_profiles_experience', 'user_profiles', ['experience']),
+    ('ix_user_profiles_updated_at', 'user_profiles', ['updated_at']),
+    ('ix_hackathon_participants_user_id', 'hackathon_participants', ['user_id']),
+]
+
+INDEXES = [
+    ('ix_user_profiles_guild_looking_for_team', 'user_profiles', ['guild_id', 'looking_for_team']),
+    ('ix_user_profiles_guild_timezone', 'user_profiles', ['guild_id', 'timezone']),
+    ('ix_user_profiles_guild_experience', 'user_profiles', ['guild_id', 'experience']),
+    ('ix_user_profiles_guild_updated_at', 'user_profiles', ['guild_id', 'updated_at']),
+    ('ix_hackathons_guild_id', 'hackathons', ['guild_id', 'id']),
+    ('ix_hackathon_participants_guild_user', 'hackathon_participants', ['guild_id', 'user_id']),
+]
+
+SKILL_TRIGGER_NAMES = ('user_skills_insert', 'user_skills_update', 'user_skills_delete')
+
+SKILL_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS user_skills_insert AFTER INSERT ON user_profiles BEGIN
+        INSERT OR IGNORE INTO user_skills (guild_id, skill, user_id)
+        SELECT NEW.guild_id, value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_update AFTER UPDATE OF tech_skills ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE guild_id = OLD.guild_id AND user_id = OLD.user_id;
+        INSERT OR IGNORE INTO user_skills (guild_id, skill, user_id)
+        SELECT NEW.guild_id, value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_delete AFTER DELETE ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE guild_id = OLD.guild_id AND user_id = OLD.user_id;
+    END""",
+]
+
+# The 0001 triggers, restored on downgrade
+LEGACY_SKILL_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS user_skills_insert AFTER INSERT ON user_profiles BEGIN
+        INSERT OR IGNORE INTO user_skills (skill, user_id) SELECT value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_update AFTER UPDATE OF tech_skills ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE user_id = OLD.user_id;
+        INSERT OR IGNORE INTO user_skills (skill, user_id) SELECT value, NEW.user_id FROM json_each(NEW.tech_skills);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_skills_delete AFTER DELETE ON user_profiles BEGIN
+        DELETE FROM user_skills WHERE user_id = OLD.user_id;
+    END""",
+]
+
+def _profile_columns():
+    """user_profiles as 0001 created it, with no primary key, for SQLite batch copies"""
+    return [
+        sa.Column('user_id', sa.String(50), nullable=False),
+        sa.Column('username', sa.String(100), nullable=False),
+        sa.Column('roles', sa.JSON()),
+        sa.Column('tech_skills', sa.JSON()),
+        sa.Column('experience', sa.String(50)),
+        sa.Column('timezone', sa.String(10)),
+        sa.Column('looking_for_team', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime())
+    ]
+
+def _create_indexes(indexes, dialect_name: str):
+    if dialect_name == 'postgresql':
+        # Built CONCURRENTLY, like 0002, so the tables stay writable during the build
+        with context.get_context().autocommit_block():
+            for name, table, columns in indexes:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in indexes:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+def _drop_indexes(indexes):
+    for name, table, _ in indexes:
+        op.drop_index(name, table, if_exists=True)
+
+def _legacy_guild_id() -> str:
+    """LEGACY_GUILD_ID, or a placeholder when there are no existing rows for it to name"""
+    if LEGACY_GUILD_ID:
+        return LEGACY_GUILD_ID
+    if context.is_offline_mode():
+        raise RuntimeError(
+            "Set LEGACY_GUILD_ID to the ID of the server the bot was running in: "
+            "existing profiles, hackathons and participants are assigned to it"
+        )
+    bind = op.get_bind()
+    rows = sum(
+        bind.execute(sa.text(f"SELECT COUNT(*) FROM {table}")).scalar()
+        for table in ('user_profiles', 'hackathons', 'hackathon_participants')
+    )
+    if rows:
+        raise RuntimeError(
+            f"The database holds {rows} profile, hackathon and participant rows from before data was "
+            "partitioned by guild; set LEGACY_GUILD_ID to the ID of the server the bot was running in "
+            "and run the upgrade again"
+        )
+    return '0'
+
+def _add_guild_column(table: str, guild_id: str, drop_default: bool = True):
+    """Add a NOT NULL guild_id filled with guild_id, then drop the default unless told not to"""
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.add_column(sa.Column('guild_id', sa.String(50), nullable=False, server_default=guild_id))
+    if drop_default:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('guild_id', server_default=None)
+
+def upgrade():
+    dialect_name = context.get_context().dialect.name
+    # Checked before anything changes, so a refused upgrade leaves the schema as it was
+    legacy_guild_id = _legacy_guild_id()
+
+    if dialect_name == 'sqlite':
+        # The skill table is rebuilt below; its triggers must not fire while user_profiles is copied
+        for trigger in SKILL_TRIGGER_NAMES:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    _drop_indexes(OLD_INDEXES)
+
+    # On SQLite the user_profiles copy below drops the default along with the old key
+    _add_guild_column('user_profiles', legacy_guild_id, drop_default=dialect_name != 'sqlite')
+    _add_guild_column('hackathons', legacy_guild_id)
+    _add_guild_column('hackathon_participants', legacy_guild_id)
+
+    if dialect_name == 'sqlite':
+        # SQLite cannot alter a primary key: copy the table, described without one so the new key replaces it
+        old_profiles = sa.Table(
+            'user_profiles', sa.MetaData(), *_profile_columns(),
+            sa.Column('guild_id', sa.String(50), nullable=False, server_default=legacy_guild_id)
+        )
+        with op.batch_alter_table('user_profiles', copy_from=old_profiles) as batch_op:
+            batch_op.alter_column('guild_id', server_default=None)
+            batch_op.create_primary_key('user_profiles_pkey', ['guild_id', 'user_id'])
+
+        op.drop_table('user_skills')
+        op.create_table(
+            'user_skills',
+            sa.Column('guild_id', sa.String(50), primary_key=True),
+            sa.Column('skill', sa.String(100), primary_key=True),
+            sa.Column('user_id', sa.String(50), primary_key=True)
+        )
+        op.create_index('ix_user_skills_guild_user', 'user_skills', ['guild_id', 'user_id'])
+        for trigger in SKILL_TRIGGERS:
+            op.execute(trigger)
+        op.execute(
+            "INSERT OR IGNORE INTO user_skills (guild_id, skill, user_id) "
+            "SELECT user_profiles.guild_id, value, user_profiles.user_id FROM user_profiles, json_each(user_profiles.tech_skills)"
+        )
+    else:
+        op.drop_constraint('user_profiles_pkey', 'user_profiles', type_='primary')
+        op.create_primary_key('user_profiles_pkey', 'user_profiles', ['guild_id', 'user_id'])
+
+    _create_indexes(INDEXES, dialect_name)
+
+def downgrade():
+    dialect_name = context.get_context().dialect.name
+    if not context.is_offline_mode():
+        guilds = op.get_bind().execute(sa.text("SELECT COUNT(DISTINCT guild_id) FROM user_profiles")).scalar()
+        if guilds > 1:
+            raise RuntimeError(
+                f"user_profiles holds {guilds} guilds; a user may have a profile in several of them, "
+                "which the single-guild schema cannot store"
+            )
+
+    _drop_indexes(INDEXES)
+    if dialect_name == 'sqlite':
+        for trigger in SKILL_TRIGGER_NAMES:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        old_profiles = sa.Table(
+            'user_profiles', sa.MetaData(), *_profile_columns(), sa.Column('guild_id', sa.String(50), nullable=False)
+        )
+        with op.batch_alter_table('user_profiles', copy_from=old_profiles) as batch_op:
+            batch_op.drop_column('guild_id')
+            batch_op.create_primary_key('user_profiles_pkey', ['user_id'])
+    else:
+        op.drop_constraint('user_profiles_pkey', 'user_profiles', type_='primary')
+        op.drop_column('user_profiles', 'guild_id')
+        op.create_primary_key('user_profiles_pkey', 'user_profiles', ['user_id'])
+
+    for table in ('hackathons', 'hackathon_participants'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('guild_id')
+
+    if dialect_name == 'sqlite':
+        op.drop_table('user_skills')
+        op.create_table(
+            'user_skills',
+            sa.Column('skill', sa.String(100), primary_key=True),
+            sa.Column('user_id', sa.String(50), primary_key=True)
+        )
+        op.create_index('ix_user_skills_user_id', 'user_skills', ['user_id'])
+        for trigger in LEGACY_SKILL_TRIGGERS:
+            op.execute(trigger)
+        op.execute(
+            "INSERT OR IGNORE INTO user_skills (skill, user_id) "
+            "SELECT value, user_profiles.user_id FROM user_profiles, json_each(user_profiles.tech_skills)"
+        )
+    _create_indexes(OLD_INDEXES, dialect_name)
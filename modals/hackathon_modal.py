@@ -4,12 +4,13 @@ Hackathon Modal for creating new hackathons
 
 import discord
 from discord.ui import Modal, TextInput
-from utils.data_manager import save_single_hackathon, get_all_hackathons
+from utils.data_manager import save_single_hackathon_async, get_hackathon_summaries_async, set_current_user
 from datetime import datetime
 
 class HackathonModal(Modal):
-    def __init__(self):
+    def __init__(self, guild_id: str):
         super().__init__(title="Add New Hackathon")
+        self.guild_id = guild_id
         
         # Hackathon name
         self.name = TextInput(
@@ -43,12 +44,11 @@ class HackathonModal(Modal):
     
     async def on_submit(self, interaction: discord.Interaction):
         """Handle the form submission"""
-        # Get existing hackathons to generate new ID
-        existing_hackathons = get_all_hackathons()
-        new_id = max([h["id"] for h in existing_hackathons], default=0) + 1
+        set_current_user(str(interaction.user.id))
         
         # Create new hackathon
         new_hackathon = {
+            "guild_id": self.guild_id,
             "name": self.name.value.strip(),
             "date": self.date.value.strip(),
             "description": self.description.value.strip(),
@@ -58,12 +58,16 @@ class HackathonModal(Modal):
         }
         
         # Save to database
-        success = save_single_hackathon(new_hackathon)
+        success = await save_single_hackathon_async(new_hackathon)
         
         if not success:
             await interaction.response.send_message("❌ Failed to create hackathon. Please try again.", ephemeral=True)
             return
         
+        # IDs are assigned by the database and shared by every guild; the newest in this guild is ours
+        existing_hackathons = await get_hackathon_summaries_async(self.guild_id)
+        new_id = max([h["id"] for h in existing_hackathons], default=0)
+        
         # Create success embed
         embed = discord.Embed(
             title="✅ Hackathon Added Successfully!",
@@ -4,7 +4,7 @@ User Profile Modal for creating and updating user profiles
 
 import discord
 from discord.ui import Modal, TextInput
-from utils.data_manager import save_user, get_user_by_id
+from utils.data_manager import save_user_async, set_current_user
 from config import USER_ROLES, TECH_SKILLS, EXPERIENCE_LEVELS, TIMEZONES
 from datetime import datetime
 
@@ -71,6 +71,7 @@ class UserProfileModal(Modal):
     async def on_submit(self, interaction: discord.Interaction):
         """Handle the form submission"""
         user_id = str(interaction.user.id)
+        set_current_user(user_id)
         
         # Parse the input data
         username = self.username.value.strip()
@@ -86,6 +87,7 @@ class UserProfileModal(Modal):
         
         # Create or update the profile
         profile_data = {
+            "guild_id": str(interaction.guild_id),
             "user_id": user_id,
             "username": username,
             "roles": roles,
@@ -100,7 +102,7 @@ class UserProfileModal(Modal):
             profile_data["created_at"] = datetime.now().isoformat()
         
         # Save to database
-        success = save_user(profile_data)
+        success = await save_user_async(profile_data)
         
         if not success:
             await interaction.response.send_message("❌ Failed to save profile. Please try again.", ephemeral=True)
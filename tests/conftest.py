@@ -0,0 +1,42 @@
+"""
+Shared fixtures: every test runs against a throwaway SQLite database
+
+DATABASE_URL is set before any utils module is imported, since the async
+database manager connects at import time.
+"""
+
+import os
+import sys
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="hackathon-bot-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import delete
+
+from utils import database, partitions, data_manager, matching
+from utils.render_cache import get_render_cache
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Empty tables, partitions and caches so tests do not see each other's data"""
+    yield
+    session = database.get_db_session()
+    try:
+        for model in (database.HackathonParticipant, database.Hackathon, database.UserProfile):
+            session.execute(delete(model))
+        session.commit()
+    finally:
+        session.close()
+    for guild_partitions in partitions._registry:
+        for guild_id in guild_partitions.loaded():
+            guild_partitions.drop(guild_id)
+    data_manager.clear_caches()
+    get_render_cache().clear()
+    matching._participant_ids.clear()
+    database.read_your_writes._written.clear()
+    database.data_versions._versions.clear()
+    database.data_versions._bumped_at.clear()
@@ -0,0 +1,32 @@
+"""
+Row builders shared by the tests
+"""
+
+from typing import Dict, Any
+
+def make_profile(guild_id: str, user_id: str, **fields) -> Dict[str, Any]:
+    """A complete profile dict for save_user_profile"""
+    profile = {
+        "guild_id": guild_id,
+        "user_id": user_id,
+        "username": f"user{user_id}",
+        "roles": ["backend"],
+        "tech_skills": ["python"],
+        "experience": "intermediate",
+        "timezone": "UTC",
+        "looking_for_team": True
+    }
+    profile.update(fields)
+    return profile
+
+def make_hackathon(guild_id: str, hackathon_id: int, **fields) -> Dict[str, Any]:
+    """A complete hackathon dict for save_hackathon"""
+    hackathon = {
+        "guild_id": guild_id,
+        "id": hackathon_id,
+        "name": f"Hackathon {hackathon_id}",
+        "description": "Build something",
+        "date": "2026-11-01"
+    }
+    hackathon.update(fields)
+    return hackathon
@@ -0,0 +1,57 @@
+import asyncio
+
+from utils import database, async_database
+from tests.factories import make_profile, make_hackathon
+
+def test_bulk_profile_upsert_inserts_and_updates():
+    database.save_user_profile(make_profile("1", "10", timezone="UTC"))
+    results = database.bulk_save_user_profiles([
+        make_profile("1", "10", timezone="JST"),
+        make_profile("1", "11"),
+        make_profile("1", "11", timezone="PST"),
+        make_profile("2", "10"),
+        {"guild_id": "1"}
+    ])
+    assert results == [True, True, True, True, False]
+    assert database.get_user_profile("1", "10")["timezone"] == "JST"
+    # A user repeated within a guild keeps the last profile
+    assert database.get_user_profile("1", "11")["timezone"] == "PST"
+    assert database.get_user_profile("2", "10")["timezone"] == "UTC"
+
+def test_bulk_hackathon_upsert_updates_and_restores():
+    database.save_hackathon(make_hackathon("1", None, name="Original"))
+    existing = database.get_all_hackathons("1")[0]
+    results = database.bulk_save_hackathons([
+        make_hackathon("1", existing["id"], name="Renamed", teams=[{"user_id": "10", "username": "ada"}]),
+        make_hackathon("1", 500, name="Restored"),
+        make_hackathon("1", None, name="New")
+    ])
+    assert results == [True, True, True]
+    names = {hackathon["id"]: hackathon["name"] for hackathon in database.get_all_hackathons("1")}
+    assert names[existing["id"]] == "Renamed" and names[500] == "Restored"
+    assert "New" in names.values()
+    assert [member["user_id"] for member in database.get_hackathon("1", existing["id"])["teams"]] == ["10"]
+
+def test_bulk_hackathon_upsert_never_moves_another_guilds_hackathon():
+    database.save_hackathon(make_hackathon("1", None, name="Guild one's", teams=[{"user_id": "10", "username": "ada"}]))
+    owned = database.get_all_hackathons("1")[0]
+    results = database.bulk_save_hackathons([
+        make_hackathon("2", owned["id"], name="Hijacked", teams=[]),
+        make_hackathon("2", 700, name="Guild two's")
+    ])
+    assert results == [False, True]
+    stored = database.get_hackathon("1", owned["id"])
+    assert stored["name"] == "Guild one's"
+    assert [member["user_id"] for member in stored["teams"]] == ["10"]
+    assert database.get_hackathon("2", owned["id"]) is None
+    assert [hackathon["name"] for hackathon in database.get_all_hackathons("2")] == ["Guild two's"]
+
+def test_save_hackathon_rejects_another_guilds_id():
+    database.save_hackathon(make_hackathon("1", None, name="Guild one's"))
+    owned = database.get_all_hackathons("1")[0]
+    assert database.save_hackathon(make_hackathon("2", owned["id"], name="Hijacked")) is False
+    assert asyncio.run(async_database.save_hackathon(make_hackathon("2", owned["id"], name="Hijacked"))) is False
+    assert database.save_hackathon(make_hackathon("1", 12345, name="Missing")) is False
+    assert database.get_hackathon("1", owned["id"])["name"] == "Guild one's"
+    assert database.save_hackathon(make_hackathon("1", owned["id"], name="Renamed")) is True
+    assert database.get_hackathon("1", owned["id"])["name"] == "Renamed"
@@ -0,0 +1,15 @@
+from utils.cluster import plan_clusters
+from utils.stub_gateway import StubGateway
+
+def test_clusters_cover_every_shard_once():
+    assert plan_clusters(5, 2) == [[0, 1], [2, 3], [4]]
+    assert plan_clusters(3, 0) == [[0], [1], [2]]
+    assert plan_clusters(4, 10) == [[0, 1, 2, 3]]
+
+def test_stub_assigns_each_guild_to_its_discord_shard():
+    gateway = StubGateway(guilds=20)
+    shard_count = 3
+    assigned = [gateway.shard_guilds(shard_id, shard_count) for shard_id in range(shard_count)]
+    assert sorted(guild_id for guilds in assigned for guild_id in guilds) == sorted(gateway.guild_ids)
+    for shard_id, guilds in enumerate(assigned):
+        assert all((guild_id >> 22) % shard_count == shard_id for guild_id in guilds)
@@ -0,0 +1,39 @@
+from utils import data_manager, database
+from tests.factories import make_profile, make_hackathon
+
+def test_profile_cache_follows_saves_and_deletes():
+    data_manager.save_user(make_profile("1", "10", experience="beginner"))
+    assert data_manager.get_user_by_id("1", "10")["experience"] == "beginner"
+
+    data_manager.save_user(make_profile("1", "10", experience="advanced"))
+    assert data_manager.get_user_by_id("1", "10")["experience"] == "advanced"
+
+    data_manager.delete_user("1", "10")
+    assert data_manager.get_user_by_id("1", "10") == {}
+
+def test_profile_cache_is_per_guild():
+    data_manager.save_user(make_profile("1", "10", experience="beginner"))
+    data_manager.save_user(make_profile("2", "10", experience="advanced"))
+    assert data_manager.get_user_by_id("1", "10")["experience"] == "beginner"
+    assert data_manager.get_user_by_id("2", "10")["experience"] == "advanced"
+
+def test_fill_after_concurrent_write_is_dropped(monkeypatch):
+    data_manager.save_user(make_profile("1", "10", experience="beginner"))
+    data_manager.clear_caches()
+    real_get = database.get_user_profile
+
+    def read_then_write(guild_id, user_id, *args, **kwargs):
+        stale = real_get(guild_id, user_id, *args, **kwargs)
+        database.save_user_profile(make_profile("1", "10", experience="advanced"))
+        return stale
+
+    monkeypatch.setattr(data_manager, "get_user_profile", read_then_write)
+    assert data_manager.get_user_by_id("1", "10")["experience"] == "beginner"
+    monkeypatch.setattr(data_manager, "get_user_profile", real_get)
+    assert data_manager.get_user_by_id("1", "10")["experience"] == "advanced"
+
+def test_hackathon_cache_drops_entry_on_join():
+    hackathon_id = database.bulk_save_hackathons([make_hackathon("1", None, name="H")])[0]
+    assert data_manager.get_hackathon_by_id("1", hackathon_id)["teams"] == []
+    assert data_manager.join_hackathon("1", hackathon_id, "10", "ada")
+    assert [member["user_id"] for member in data_manager.get_hackathon_by_id("1", hackathon_id)["teams"]] == ["10"]
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from commands.hackathon_commands import pick_hackathon
+from utils import database, jobs, write_queue
+from utils.jobs import JobRunner, SUPERSEDED_MESSAGE
+from tests.factories import make_profile, make_hackathon
+
+class FakeResponse:
+    def __init__(self):
+        self.deferred = False
+
+    def is_done(self) -> bool:
+        return self.deferred
+
+    async def defer(self, **kwargs):
+        self.deferred = True
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for deferred jobs"""
+
+    def __init__(self, user_id: int, guild_id: int = 1):
+        self.user = SimpleNamespace(id=user_id)
+        self.guild_id = guild_id
+        self.response = FakeResponse()
+        self.edits = []
+
+    async def edit_original_response(self, **message):
+        self.edits.append(message)
+
+@pytest.fixture
+def fresh_runners(monkeypatch):
+    monkeypatch.setattr(jobs, "_job_runner", JobRunner(timeout=10.0))
+    monkeypatch.setattr(write_queue, "_write_queue", None)
+
+async def slow_work(job):
+    await asyncio.sleep(0.2)
+    return {"content": "done"}
+
+async def wait_for_jobs(runner):
+    while runner.jobs:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0)
+
+def test_rerun_with_the_same_key_supersedes():
+    runner = JobRunner()
+
+    async def run():
+        first, second = FakeInteraction(10), FakeInteraction(10)
+        await runner.submit(first, "pick_hackathon", slow_work, key=1)
+        await runner.submit(second, "pick_hackathon", slow_work, key=1)
+        await wait_for_jobs(runner)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.edits[-1]["content"] == SUPERSEDED_MESSAGE
+    assert second.edits[-1] == {"content": "done"}
+
+def test_different_keys_and_users_run_side_by_side():
+    runner = JobRunner()
+
+    async def run():
+        interactions = [FakeInteraction(10), FakeInteraction(10), FakeInteraction(11)]
+        await runner.submit(interactions[0], "pick_hackathon", slow_work, key=1)
+        await runner.submit(interactions[1], "pick_hackathon", slow_work, key=2)
+        await runner.submit(interactions[2], "pick_hackathon", slow_work, key=1)
+        await wait_for_jobs(runner)
+        return interactions
+
+    for interaction in asyncio.run(run()):
+        assert interaction.edits[-1] == {"content": "done"}
+    assert runner.stats()["commands"]["pick_hackathon"]["done"] == 3
+
+def test_picking_two_hackathons_joins_both(fresh_runners):
+    database.save_user_profile(make_profile("1", "10"))
+    database.bulk_save_hackathons([make_hackathon("1", None, name="First"), make_hackathon("1", None, name="Second")])
+    first_id, second_id = [hackathon["id"] for hackathon in database.get_hackathon_summaries("1")]
+
+    async def run():
+        first, second = FakeInteraction(10), FakeInteraction(10)
+        await pick_hackathon(first, first_id, "backend")
+        await pick_hackathon(second, second_id, "backend")
+        await wait_for_jobs(jobs.get_job_runner())
+        await write_queue.get_write_queue().close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    for interaction in (first, second):
+        assert "embed" in interaction.edits[-1]
+    for hackathon_id in (first_id, second_id):
+        assert [member["user_id"] for member in database.get_hackathon("1", hackathon_id)["teams"]] == ["10"]
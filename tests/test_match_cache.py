@@ -0,0 +1,47 @@
+import random
+
+from utils import database
+from utils.candidate_index import get_candidate_index
+from utils.match_cache import get_match_cache
+from utils.matching import MIN_COMPATIBILITY_SCORE
+from tests.factories import make_profile
+from tests.test_matching import random_profile
+
+def fresh_top_k(guild_id, profile, k):
+    return get_candidate_index(guild_id).top_k(profile, k=k, min_score=MIN_COMPATIBILITY_SCORE, exclude=profile["user_id"])
+
+def test_repeated_lookups_hit_the_cache():
+    rng = random.Random(1)
+    profiles = [random_profile(rng, "1", i) for i in range(40)]
+    database.bulk_save_user_profiles(profiles)
+    cache = get_match_cache("1")
+    first = cache.top_k(profiles[0], 5)
+    assert cache.top_k(profiles[0], 5) == first == fresh_top_k("1", profiles[0], 5)
+    stats = cache.stats()["top_lists"]
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+def test_profile_writes_patch_cached_lists():
+    rng = random.Random(2)
+    profiles = [random_profile(rng, "1", i) for i in range(40)]
+    database.bulk_save_user_profiles(profiles)
+    cache = get_match_cache("1")
+    queries = profiles[:8]
+    for query in queries:
+        cache.top_k(query, 5)
+
+    # A new profile sharing the first query's skills, one removal and one edit
+    query = queries[0]
+    database.save_user_profile(make_profile("1", "5000", roles=["designer"], tech_skills=list(query["tech_skills"]),
+                                            experience=query["experience"], timezone=query["timezone"]))
+    database.delete_user_profile("1", profiles[20]["user_id"])
+    database.save_user_profile(dict(profiles[21], timezone="JST", roles=["data"]))
+
+    for other in queries:
+        assert cache.top_k(other, 5) == fresh_top_k("1", other, 5)
+
+def test_caches_are_per_guild():
+    database.save_user_profile(make_profile("1", "10"))
+    database.save_user_profile(make_profile("1", "11"))
+    database.save_user_profile(make_profile("2", "20"))
+    assert [user_id for user_id, _ in get_match_cache("1").top_k(make_profile("1", "10"), 5)] == ["11"]
+    assert get_match_cache("2").top_k(make_profile("2", "20"), 5) == []
@@ -0,0 +1,46 @@
+import asyncio
+import random
+
+import pytest
+
+from utils import database
+from utils.match_service import MatchService
+from tests.test_matching import random_profile
+
+@pytest.fixture
+def process_service():
+    service = MatchService("process", 1)
+    database.add_profile_listener(service.handle_profile_change)
+    yield service
+    database.remove_profile_listener(service.handle_profile_change)
+    service.shutdown()
+
+def _ranked(matches):
+    return [(match["user_id"], match["compatibility_score"]) for match in matches]
+
+def test_process_pool_is_spawned(process_service):
+    assert process_service._get_executor()._mp_context.get_start_method() == "spawn"
+
+def test_process_workers_match_the_thread_path(process_service):
+    rng = random.Random(5)
+    profiles = [random_profile(rng, "1", i) for i in range(40)]
+    database.bulk_save_user_profiles(profiles)
+    thread_service = MatchService("thread", 1)
+    try:
+        for profile in profiles[:3]:
+            expected = asyncio.run(thread_service.find_teammates(profile, 5))
+            assert _ranked(asyncio.run(process_service.find_teammates(profile, 5))) == _ranked(expected)
+    finally:
+        thread_service.shutdown()
+
+def test_process_worker_catches_up_on_profile_changes(process_service):
+    rng = random.Random(6)
+    profiles = [random_profile(rng, "1", i) for i in range(10)]
+    database.bulk_save_user_profiles(profiles)
+    query = profiles[0]
+    first = asyncio.run(process_service.find_teammates(query, 20))
+    assert profiles[1]["user_id"] in {match["user_id"] for match in first}
+
+    database.delete_user_profile("1", profiles[1]["user_id"])
+    after = asyncio.run(process_service.find_teammates(query, 20))
+    assert profiles[1]["user_id"] not in {match["user_id"] for match in after}
@@ -0,0 +1,64 @@
+import random
+
+from config import USER_ROLES, TECH_SKILLS, EXPERIENCE_LEVELS, TIMEZONES
+from utils import database
+from utils.matching import calculate_compatibility, find_compatible_teammates, get_compatibility_engine, MIN_COMPATIBILITY_SCORE
+from tests.factories import make_profile
+
+def random_profile(rng: random.Random, guild_id: str, i: int):
+    return make_profile(
+        guild_id, str(1000 + i),
+        roles=rng.sample(USER_ROLES, rng.randint(1, 3)),
+        tech_skills=rng.sample(TECH_SKILLS, rng.randint(1, 6)),
+        experience=rng.choice(EXPERIENCE_LEVELS),
+        timezone=rng.choice(TIMEZONES)
+    )
+
+def brute_force(profile, candidates, k):
+    scored = [
+        (other["user_id"], calculate_compatibility(profile, other))
+        for other in candidates if other["user_id"] != profile["user_id"]
+    ]
+    scored = [(user_id, score) for user_id, score in scored if score > MIN_COMPATIBILITY_SCORE]
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:k]
+
+def assert_same_matches(found, expected):
+    assert [user_id for user_id, _ in found] == [user_id for user_id, _ in expected]
+    for (_, score), (_, expected_score) in zip(found, expected):
+        assert abs(score - expected_score) < 1e-9
+
+def test_matches_brute_force_scores():
+    rng = random.Random(7)
+    profiles = [random_profile(rng, "1", i) for i in range(60)]
+    database.bulk_save_user_profiles(profiles)
+    for profile in profiles[:10]:
+        assert_same_matches(find_compatible_teammates(profile, k=5), brute_force(profile, profiles, 5))
+
+def test_engine_is_kept_per_guild():
+    database.save_user_profile(make_profile("1", "10"))
+    database.save_user_profile(make_profile("1", "11"))
+    database.save_user_profile(make_profile("2", "20"))
+    engine = get_compatibility_engine("1")
+    assert get_compatibility_engine("1") is engine
+    assert len(engine) == 2
+    matches = find_compatible_teammates(make_profile("1", "10"))
+    assert [user_id for user_id, _ in matches] == ["11"]
+
+def test_engine_follows_profile_writes():
+    rng = random.Random(3)
+    profiles = [random_profile(rng, "1", i) for i in range(20)]
+    database.bulk_save_user_profiles(profiles)
+    query = profiles[0]
+    find_compatible_teammates(query, k=5)
+    engine = get_compatibility_engine("1")
+
+    # Saves and deletes after the engine was built reach it through the listeners
+    added = make_profile("1", "999", roles=list(query["roles"]), tech_skills=list(query["tech_skills"]),
+                         experience=query["experience"], timezone=query["timezone"])
+    database.save_user_profile(added)
+    database.delete_user_profile("1", profiles[1]["user_id"])
+    current = [added] + [profile for profile in profiles if profile["user_id"] != profiles[1]["user_id"]]
+
+    assert get_compatibility_engine("1") is engine
+    assert_same_matches(find_compatible_teammates(query, k=5), brute_force(query, current, 5))
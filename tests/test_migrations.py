@@ -0,0 +1,42 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, text
+
+import config
+from utils.schema import alembic_config
+
+@pytest.fixture
+def engine_at_0002(tmp_path):
+    """A database as it was before guild partitioning, holding one profile"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0002")
+        connection.execute(text("INSERT INTO user_profiles (user_id, username) VALUES ('10', 'ada')"))
+    yield engine
+    engine.dispose()
+
+def _revision(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+def test_upgrade_refuses_legacy_rows_without_guild(engine_at_0002, monkeypatch):
+    monkeypatch.setattr(config, "LEGACY_GUILD_ID", None)
+    with pytest.raises(RuntimeError, match="LEGACY_GUILD_ID"):
+        with engine_at_0002.begin() as connection:
+            command.upgrade(alembic_config(connection), "0003")
+    assert _revision(engine_at_0002) == "0002"
+
+def test_upgrade_assigns_legacy_rows_to_guild(engine_at_0002, monkeypatch):
+    monkeypatch.setattr(config, "LEGACY_GUILD_ID", "42")
+    with engine_at_0002.begin() as connection:
+        command.upgrade(alembic_config(connection), "0003")
+    with engine_at_0002.connect() as connection:
+        assert connection.execute(text("SELECT guild_id, user_id FROM user_profiles")).all() == [("42", "10")]
+
+def test_empty_database_upgrades_without_guild(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LEGACY_GUILD_ID", None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+    assert _revision(engine) is not None
+    engine.dispose()
@@ -0,0 +1,53 @@
+import asyncio
+
+from utils import database, async_database
+from tests.factories import make_hackathon
+
+def seed(guild_id: str, count: int):
+    database.bulk_save_hackathons([make_hackathon(guild_id, None, name=f"{guild_id}-{i}") for i in range(count)])
+    return [hackathon["id"] for hackathon in database.get_hackathon_summaries(guild_id)]
+
+def test_pages_forward_and_back_by_id():
+    ids = seed("1", 7)
+    seed("2", 3)
+
+    first, more = database.get_hackathon_summaries_page("1", limit=3)
+    assert [summary["id"] for summary in first] == ids[:3] and more
+    second, more = database.get_hackathon_summaries_page("1", after_id=first[-1]["id"], limit=3)
+    assert [summary["id"] for summary in second] == ids[3:6] and more
+    last, more = database.get_hackathon_summaries_page("1", after_id=second[-1]["id"], limit=3)
+    assert [summary["id"] for summary in last] == ids[6:] and not more
+
+    # Backwards pages come out in ID order too
+    back, more = database.get_hackathon_summaries_page("1", before_id=last[0]["id"], limit=3)
+    assert [summary["id"] for summary in back] == ids[3:6] and more
+    back, more = database.get_hackathon_summaries_page("1", before_id=back[0]["id"], limit=3)
+    assert [summary["id"] for summary in back] == ids[:3] and not more
+
+def test_pages_carry_participant_counts():
+    database.save_hackathon(make_hackathon("1", None, teams=[{"user_id": "10", "username": "ada"}, {"user_id": "11", "username": "bob"}]))
+    page, more = database.get_hackathon_summaries_page("1")
+    assert not more
+    assert page[0]["participant_count"] == 2
+    assert "teams" not in page[0]
+
+def test_exact_page_has_no_next_page():
+    ids = seed("1", 4)
+    page, more = database.get_hackathon_summaries_page("1", limit=4)
+    assert [summary["id"] for summary in page] == ids and not more
+
+def test_keyset_cursor_survives_deletes():
+    ids = seed("1", 6)
+    first, _ = database.get_hackathon_summaries_page("1", limit=2)
+    # Rows removed before the cursor do not shift the next page
+    database.delete_hackathon("1", ids[0])
+    database.delete_hackathon("1", ids[1])
+    second, more = database.get_hackathon_summaries_page("1", after_id=first[-1]["id"], limit=2)
+    assert [summary["id"] for summary in second] == ids[2:4] and more
+
+def test_async_pages_match_sync_pages():
+    ids = seed("1", 5)
+    sync_page = database.get_hackathon_summaries_page("1", after_id=ids[0], limit=2)
+    async_page = asyncio.run(async_database.get_hackathon_summaries_page("1", after_id=ids[0], limit=2))
+    assert [summary["id"] for summary in async_page[0]] == [summary["id"] for summary in sync_page[0]] == ids[1:3]
+    assert async_page[1] == sync_page[1] is True
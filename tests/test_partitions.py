@@ -0,0 +1,56 @@
+import pytest
+
+from utils import database
+from utils.partitions import GuildPartitions
+from utils.candidate_index import get_candidate_index, _candidate_indexes
+from tests.factories import make_profile
+
+def test_change_during_load_is_not_overwritten():
+    """A listener change that lands mid-load survives the loader's older row for the same key"""
+    def load(guild_id, partition, snapshot):
+        rows = [("a", "old"), ("b", "old")]
+        # The snapshot has read its rows; a write commits before they are applied
+        partitions.apply(guild_id, ["a"], lambda partition: partition.update(a="new"))
+        for key, value in rows:
+            snapshot.fill([key], lambda: partition.__setitem__(key, value))
+
+    partitions = GuildPartitions(lambda guild_id: {}, load, lambda: None)
+    assert partitions.get("1") == {"a": "new", "b": "old"}
+
+def test_change_for_unloaded_guild_is_skipped():
+    partitions = GuildPartitions(lambda guild_id: {}, lambda guild_id, partition, snapshot: None, lambda: None)
+    assert not partitions.apply("1", ["a"], lambda partition: partition.update(a="new"))
+    assert partitions.get("1") == {}
+    assert partitions.apply("1", ["a"], lambda partition: partition.update(a="new"))
+    assert partitions.peek("1") == {"a": "new"}
+
+def test_failed_load_discards_changes_made_during_it():
+    calls = []
+
+    def load(guild_id, partition, snapshot):
+        calls.append(guild_id)
+        partitions.apply(guild_id, ["a"], lambda partition: partition.update(a="new"))
+        if len(calls) == 1:
+            raise RuntimeError("connection lost")
+
+    partitions = GuildPartitions(lambda guild_id: {}, load, lambda: None)
+    with pytest.raises(RuntimeError):
+        partitions.get("1")
+    assert partitions.peek("1") is None
+    assert partitions.get("1") == {"a": "new"}
+
+def test_profile_deleted_during_index_load_stays_deleted(monkeypatch):
+    database.bulk_save_user_profiles([make_profile("1", str(10 + i)) for i in range(4)])
+    real_iter = database.iter_user_profiles
+
+    def iter_then_delete(*args, **kwargs):
+        rows = list(real_iter(*args, **kwargs))
+        # Committed (and announced) after the snapshot was read, before it is applied
+        database.delete_user_profile("1", "10")
+        yield from rows
+
+    monkeypatch.setattr(database, "iter_user_profiles", iter_then_delete)
+    index = get_candidate_index("1")
+    assert "10" not in {profile["user_id"] for profile in index.profiles()}
+    assert len(list(index.profiles())) == 3
+    assert _candidate_indexes.stats()["loaded"] == 1
@@ -0,0 +1,46 @@
+import asyncio
+
+from utils import database
+from utils.render_cache import RenderCache
+from commands.info_commands import _server_stats_work
+from tests.factories import make_profile
+
+def test_renders_once_per_version():
+    cache = RenderCache(max_entries=8)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return len(renders)
+
+    version = database.get_data_version("1", "profiles")
+    assert cache.get_or_render("stats", version, render) == 1
+    assert cache.get_or_render("stats", version, render) == 1
+
+    database.save_user_profile(make_profile("2", "10"))
+    assert database.get_data_version("1", "profiles") == version
+    database.save_user_profile(make_profile("1", "10"))
+    assert cache.get_or_render("stats", database.get_data_version("1", "profiles"), render) == 2
+    assert cache.stats()["renders"] == 2
+
+def test_unsettled_version_is_not_cached(monkeypatch):
+    monkeypatch.setenv("DATABASE_REPLICA_URL", "sqlite:///unused.db")
+    database.save_user_profile(make_profile("1", "10"))
+    version = database.get_data_version("1", "profiles")
+    assert version is None
+
+    cache = RenderCache(max_entries=8)
+    assert cache.get_or_render("stats", version, lambda: "first") == "first"
+    assert cache.get_or_render("stats", version, lambda: "second") == "second"
+    assert cache.stats()["uncacheable"] == 2
+
+def test_stats_embed_follows_profile_writes():
+    def total_users():
+        embed = asyncio.run(_server_stats_work("1"))["embed"]
+        return next(field.value for field in embed.fields if field.name == "Total Users")
+
+    database.save_user_profile(make_profile("1", "10"))
+    assert total_users() == "1"
+    assert total_users() == "1"
+    database.save_user_profile(make_profile("1", "11"))
+    assert total_users() == "2"
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from utils import database, async_database
+from utils.candidate_index import get_candidate_index
+from utils.matching import get_compatibility_engine, get_participant_ids
+from utils.stats_store import get_stats_store
+from tests.factories import make_profile, make_hackathon
+
+@pytest.fixture
+def lagging_replica(monkeypatch):
+    """An empty replica that never catches up, so every read served by it is visibly stale"""
+    path = os.path.join(tempfile.mkdtemp(prefix="replica-"), "replica.db")
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(engine)
+    database.sqlite_metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setenv("DATABASE_REPLICA_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(database.get_db_manager(), "ReplicaSessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(async_database.async_db_manager, "ReplicaSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+    yield
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+def forget_recent_writes():
+    database.read_your_writes._written.clear()
+
+def test_reads_go_to_the_replica_unless_the_user_just_wrote(lagging_replica):
+    database.save_user_profile(make_profile("1", "10"))
+    # The writer reads its own write from the primary
+    assert database.get_user_profile("1", "10") is not None
+    forget_recent_writes()
+    assert database.get_user_profile("1", "10") is None
+    assert database.get_user_profile("1", "10", primary=True) is not None
+    assert asyncio.run(async_database.get_user_profile("1", "10")) is None
+
+def test_current_user_reads_stick_to_the_primary(lagging_replica):
+    database.save_user_profile(make_profile("1", "10"))
+    forget_recent_writes()
+    database.set_current_user("42")
+    try:
+        database.save_user_profile(make_profile("1", "11"))
+        # User 42 wrote (as the acting user), so even reads about others go to the primary
+        assert database.get_user_profile("1", "10") is not None
+    finally:
+        database.set_current_user(None)
+
+def test_data_versions_are_withheld_while_the_replica_may_lag(lagging_replica):
+    database.save_user_profile(make_profile("1", "10"))
+    assert database.get_data_version("1", "profiles") is None
+    assert database.get_data_version("2", "profiles") is not None
+
+def test_index_loads_read_the_primary(lagging_replica):
+    database.bulk_save_user_profiles([make_profile("1", str(10 + i)) for i in range(4)])
+    database.save_hackathon(make_hackathon("1", None, teams=[{"user_id": "10", "username": "ada"}]))
+    forget_recent_writes()
+
+    # Per-request reads still see the stale replica
+    assert database.get_all_hackathons("1") == []
+    assert len(get_candidate_index("1")) == 4
+    assert len(get_compatibility_engine("1")) == 4
+    stats = get_stats_store("1").snapshot()
+    assert stats["total_users"] == 4 and stats["hackathons"] == 1
+
+    hackathon_id = database.get_hackathon_summaries("1", primary=True)[0]["id"]
+    assert get_participant_ids("1", hackathon_id) == frozenset({"10"})
@@ -0,0 +1,73 @@
+import asyncio
+
+from utils import database
+from utils.async_database import apply_write_batch
+from utils.stats_store import get_stats_store
+from tests.factories import make_profile, make_hackathon
+
+def _counts(guild_id):
+    return {entry["id"]: entry["participant_count"] for entry in get_stats_store(guild_id).snapshot(10)["busiest_hackathons"]}
+
+def _join(guild_id, hackathon_id, user_id):
+    assert asyncio.run(apply_write_batch([('join', guild_id, hackathon_id, user_id, user_id)])) == [True]
+
+def _leave(guild_id, hackathon_id, user_id):
+    assert asyncio.run(apply_write_batch([('leave', guild_id, hackathon_id, user_id)])) == [True]
+
+def test_counts_follow_writes_after_load():
+    database.bulk_save_user_profiles([make_profile("1", "10"), make_profile("1", "11", roles=["frontend"])])
+    hackathon_id = database.bulk_save_hackathons([make_hackathon("1", None, name="H")])[0]
+    _join("1", hackathon_id, "10")
+    assert _counts("1") == {hackathon_id: 1}
+
+    _join("1", hackathon_id, "11")
+    _leave("1", hackathon_id, "10")
+    database.delete_user_profile("1", "10")
+    stats = get_stats_store("1").snapshot()
+    assert _counts("1") == {hackathon_id: 1}
+    assert stats["total_users"] == 1
+    assert stats["role_counts"] == {"frontend": 1}
+
+def test_join_during_load_is_counted_once(monkeypatch):
+    """A join announced after the participant rows were read, which already include it, counts once"""
+    hackathon_id = database.bulk_save_hackathons([make_hackathon("1", None, name="H")])[0]
+    _join("1", hackathon_id, "10")
+    real_iter = database.iter_participants
+
+    def iter_then_rejoin(*args, **kwargs):
+        rows = list(real_iter(*args, **kwargs))
+        _join("1", hackathon_id, "11")
+        database._notify_participant_listeners("1", hackathon_id, "10", True)
+        yield from rows
+
+    monkeypatch.setattr(database, "iter_participants", iter_then_rejoin)
+    assert _counts("1") == {hackathon_id: 2}
+
+def test_changes_during_load_beat_the_snapshot(monkeypatch):
+    database.bulk_save_user_profiles([make_profile("1", "10"), make_profile("1", "11")])
+    hackathon_id = database.bulk_save_hackathons([make_hackathon("1", None, name="Old name")])[0]
+    _join("1", hackathon_id, "10")
+    real_hackathons, real_participants, real_profiles = (
+        database.iter_hackathons, database.iter_participants, database.iter_user_profiles
+    )
+
+    def read_then_write(real, write):
+        def iterate(*args, **kwargs):
+            rows = list(real(*args, **kwargs))
+            write()
+            yield from rows
+        return iterate
+
+    monkeypatch.setattr(database, "iter_hackathons", read_then_write(
+        real_hackathons, lambda: database.save_hackathon(make_hackathon("1", hackathon_id, name="New name"))
+    ))
+    monkeypatch.setattr(database, "iter_participants", read_then_write(
+        real_participants, lambda: _leave("1", hackathon_id, "10")
+    ))
+    monkeypatch.setattr(database, "iter_user_profiles", read_then_write(
+        real_profiles, lambda: database.delete_user_profile("1", "11")
+    ))
+
+    stats = get_stats_store("1").snapshot()
+    assert stats["total_users"] == 1
+    assert stats["busiest_hackathons"] == [{"id": hackathon_id, "name": "New name", "participant_count": 0}]
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+from utils import database
+from utils.candidate_index import get_candidate_index, _candidate_indexes
+from tests.factories import make_profile, make_hackathon
+
+class FailingSession:
+    """A session whose streamed results break after a number of rows, like a dropped connection"""
+
+    def __init__(self, session, rows_before_failure):
+        self._session = session
+        self._rows_before_failure = rows_before_failure
+
+    def execute(self, statement, *args, **kwargs):
+        result = self._session.execute(statement, *args, **kwargs)
+
+        def rows():
+            for position, row in enumerate(result):
+                if position == self._rows_before_failure:
+                    raise OperationalError("SELECT", {}, Exception("server closed the connection"))
+                yield row
+        return rows()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+def break_streams(monkeypatch, rows_before_failure=2):
+    real_read_session, real_session = database.get_read_session, database.get_db_session
+    monkeypatch.setattr(database, "get_read_session", lambda *user_ids: FailingSession(real_read_session(*user_ids), rows_before_failure))
+    monkeypatch.setattr(database, "get_db_session", lambda: FailingSession(real_session(), rows_before_failure))
+
+def test_partial_profile_stream_raises(monkeypatch):
+    database.bulk_save_user_profiles([make_profile("1", str(10 + i)) for i in range(5)])
+    break_streams(monkeypatch)
+    seen = []
+    with pytest.raises(SQLAlchemyError):
+        for row in database.iter_user_profiles(guild_id="1"):
+            seen.append(row.user_id)
+    assert len(seen) == 2
+
+def test_partial_hackathon_stream_raises(monkeypatch):
+    database.bulk_save_hackathons([make_hackathon("1", None, name=f"H{i}") for i in range(5)])
+    break_streams(monkeypatch)
+    with pytest.raises(SQLAlchemyError):
+        list(database.iter_hackathons(guild_id="1"))
+
+def test_failed_partition_load_is_retried(monkeypatch):
+    database.bulk_save_user_profiles([make_profile("1", str(10 + i)) for i in range(5)])
+    break_streams(monkeypatch)
+    with pytest.raises(SQLAlchemyError):
+        get_candidate_index("1")
+    assert _candidate_indexes.peek("1") is None
+    assert _candidate_indexes.stats() == {"loaded": 0, "loading": 0}
+
+    monkeypatch.undo()
+    assert len(get_candidate_index("1")) == 5
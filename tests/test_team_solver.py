@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from commands.hackathon_commands import _team_field_value, EMBED_FIELD_VALUE_LIMIT
+from utils import team_solver
+from utils.matching import calculate_compatibility
+from utils.team_solver import encode_participants, pair_score, team_sizes, form_teams, get_solver_pool, shutdown_solver_pool
+from tests.test_matching import random_profile
+
+@pytest.fixture
+def participants():
+    rng = random.Random(11)
+    return [random_profile(rng, "1", i) for i in range(30)]
+
+def assert_valid_split(result, participants, team_size):
+    members = [user_id for team in result["teams"] for user_id in team]
+    assert sorted(members) == sorted(profile["user_id"] for profile in participants)
+    assert all(1 <= len(team) <= team_size for team in result["teams"])
+    sizes = [len(team) for team in result["teams"]]
+    assert max(sizes) - min(sizes) <= 1
+
+def test_team_sizes():
+    assert team_sizes(0, 4) == []
+    assert team_sizes(10, 4) == [4, 3, 3]
+    assert team_sizes(8, 4) == [4, 4]
+    assert team_sizes(3, 10) == [3]
+
+def test_pair_score_matches_calculate_compatibility(participants):
+    encoded = encode_participants(participants)
+    for i in range(len(participants)):
+        for j in range(i + 1, len(participants)):
+            assert pair_score(encoded[i], encoded[j]) == pytest.approx(calculate_compatibility(participants[i], participants[j]))
+
+def test_in_process_solve(participants):
+    result = form_teams(participants, team_size=4, time_budget=0.2, restarts=2, workers=1)
+    assert_valid_split(result, participants, 4)
+    assert result["workers"] == 1
+
+def test_parallel_solves_share_one_pool(participants, monkeypatch):
+    monkeypatch.setattr(team_solver, "_solver_pool_workers", 2)
+    shutdown_solver_pool()
+    try:
+        first = form_teams(participants, team_size=5, time_budget=0.3, restarts=2)
+        pool = get_solver_pool()
+        second = form_teams(participants, team_size=5, time_budget=0.3, restarts=2)
+        assert get_solver_pool() is pool
+        assert pool._mp_context.get_start_method() == "spawn"
+        for result in (first, second):
+            assert result["workers"] == 2
+            assert_valid_split(result, participants, 5)
+    finally:
+        shutdown_solver_pool()
+
+def test_team_field_fits_an_embed_field():
+    members = [{"username": "x" * 32 + str(i)} for i in range(40)]
+    value = _team_field_value(members, ["backend", "frontend"])
+    assert len(value) <= EMBED_FIELD_VALUE_LIMIT
+    assert value.endswith("Roles: Backend, Frontend")
+    assert " more" in value
+    assert _team_field_value([{"username": "ada"}, {}], []) == "ada, Unknown User\nRoles: Not specified"
@@ -0,0 +1,75 @@
+import asyncio
+
+from utils import database
+from utils.async_database import apply_write_batch
+from utils.write_queue import WriteQueue
+from tests.factories import make_profile, make_hackathon
+
+def saved_hackathon_id(guild_id: str) -> int:
+    database.save_hackathon(make_hackathon(guild_id, None))
+    return database.get_all_hackathons(guild_id)[0]["id"]
+
+def participant_ids(guild_id: str, hackathon_id: int):
+    return sorted(member["user_id"] for member in database.get_hackathon(guild_id, hackathon_id)["teams"])
+
+def test_malformed_operations_fail_alone():
+    hackathon_id = saved_hackathon_id("1")
+    operations = [
+        ('save_profile', make_profile("1", "10")),
+        ('save_profile', make_profile("1", "11", created_at="not a timestamp")),
+        ('teleport', "1", hackathon_id, "10"),
+        (),
+        None,
+        ('join', "1"),
+        ('join', "1", "not an id", "10", "ada"),
+        ('save_profile', "not a profile"),
+        ('join', "1", hackathon_id, "10", "ada"),
+        ('join', "1", hackathon_id, "10", "ada"),
+        ('join', "2", hackathon_id, "12", "eve"),
+        ('leave', "1", hackathon_id, "13")
+    ]
+    results = asyncio.run(apply_write_batch(operations))
+    assert results == [True, False, False, False, False, False, False, False, True, False, False, False]
+    assert database.get_user_profile("1", "10") is not None
+    assert database.get_user_profile("1", "11") is None
+    assert participant_ids("1", hackathon_id) == ["10"]
+
+def test_queue_group_commits_concurrent_writes():
+    hackathon_id = saved_hackathon_id("1")
+    queue = WriteQueue(flush_interval=0.05, max_batch=100)
+
+    async def run():
+        saves = [queue.save_profile(make_profile("1", str(10 + i))) for i in range(5)]
+        joins = [queue.join("1", hackathon_id, str(10 + i), f"user{i}") for i in range(5)]
+        results = await asyncio.gather(*saves, *joins, queue.join("1", hackathon_id, "10", "again"))
+        left = await queue.leave("1", hackathon_id, "10")
+        await queue.close()
+        return results, left
+
+    results, left = asyncio.run(run())
+    assert results == [True] * 10 + [False]
+    assert left is True
+    assert queue.stats()["batches"] == 2
+    assert queue.stats()["largest_batch"] == 11
+    assert participant_ids("1", hackathon_id) == ["11", "12", "13", "14"]
+
+def test_queue_flushes_full_batches_early_and_the_rest_on_close():
+    queue = WriteQueue(flush_interval=60.0, max_batch=3)
+
+    async def run():
+        full = [asyncio.ensure_future(queue.save_profile(make_profile("1", str(10 + i)))) for i in range(6)]
+        await asyncio.sleep(0.1)
+        # Full batches commit without waiting out the interval
+        committed_early = sum(task.done() for task in full)
+        last = asyncio.ensure_future(queue.save_profile(make_profile("1", "99")))
+        await asyncio.sleep(0.1)
+        waiting = not last.done()
+        await queue.close()
+        return committed_early, waiting, await asyncio.gather(*full, last)
+
+    committed_early, waiting, results = asyncio.run(run())
+    assert committed_early == 6
+    assert waiting
+    assert results == [True] * 7
+    assert queue.stats()["batches"] == 3
+    assert queue.stats()["largest_batch"] == 3
@@ -0,0 +1,429 @@
+"""
+Async database utilities for the Hackathon Team Finder Discord Bot
+
+The same CRUD surface as utils.database, on SQLAlchemy's AsyncEngine (asyncpg
+for Postgres, aiosqlite for the SQLite fallback), so command handlers and
+modals never stall the gateway loop on a database round trip. Models,
+row-to-dict conversion and change listeners are shared with utils.database,
+which stays available for scripts and benchmarks.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, AsyncIterator, Sequence, Tuple
+from sqlalchemy import insert, delete, select
+from sqlalchemy.engine import make_url, Row
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from datetime import datetime
+from config import DB_STREAM_BATCH_SIZE, HACKATHON_PAGE_SIZE
+from .database import (
+    UserProfile, Hackathon, HackathonParticipant, get_db_manager, get_database_url, get_replica_url, read_your_writes, engine_options, _enable_sqlite_savepoints, _column_values,
+    _user_to_dict, _hackathon_to_dict, _hackathon_summary, _participants_statement, _summaries_statement,
+    _summaries_page_statement, _summaries_page, _leave_statement, _group_participants, _team_values, _upsert_statement, _projection, _candidate_statement,
+    _notify_profile_listeners, _notify_hackathon_listeners, _notify_participant_listeners
+)
+
+logger = logging.getLogger(__name__)
+
+# Async driver for each database backend
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite'
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+class AsyncDatabaseManager:
+    """Database manager for async operations; the schema is checked by utils.database"""
+
+    def __init__(self):
+        self.engine = None
+        self.SessionLocal = None
+        self.replica_engine = None
+        self.ReplicaSessionLocal = None
+        self._setup_database()
+
+    def _setup_database(self):
+        """Set up the async engine (connections are opened lazily)"""
+        try:
+            # Connecting the sync manager first checks (or upgrades) the schema
+            get_db_manager()
+            database_url = get_database_url()
+            self.engine = create_async_engine(get_async_database_url(database_url), **engine_options(database_url))
+            if self.engine.dialect.name == 'sqlite':
+                # Batched writes isolate each operation in a savepoint
+                _enable_sqlite_savepoints(self.engine.sync_engine)
+            # Rows are converted to dicts after commit, so keep them loaded
+            self.SessionLocal = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+            replica_url = get_replica_url()
+            if replica_url:
+                self.replica_engine = create_async_engine(get_async_database_url(replica_url), **engine_options(replica_url))
+                self.ReplicaSessionLocal = async_sessionmaker(self.replica_engine, autoflush=False, expire_on_commit=False)
+        except Exception as e:
+            logger.error(f"Failed to set up async database: {e}")
+            raise
+
+    def get_session(self) -> AsyncSession:
+        """Get async database session"""
+        return self.SessionLocal()
+
+    def get_read_session(self, *user_ids: Optional[str]) -> AsyncSession:
+        """Session for a read about these users, on the primary if any of them (or the current user) just wrote"""
+        if self.ReplicaSessionLocal is None or read_your_writes.is_sticky(*user_ids):
+            return self.SessionLocal()
+        return self.ReplicaSessionLocal()
+
+    async def dispose(self):
+        """Close all pooled connections"""
+        await self.engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
+
+# Global async database manager instance
+async_db_manager = AsyncDatabaseManager()
+
+async def _load_participants(session: AsyncSession, hackathon_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Participant dicts per hackathon ID"""
+    return _group_participants(hackathon_ids, await session.scalars(_participants_statement(hackathon_ids)))
+
+# User profile operations
+async def save_user_profile(user_data: Dict[str, Any]) -> bool:
+    """Save or update a user's profile in their guild in one upsert statement"""
+    async with async_db_manager.get_session() as session:
+        try:
+            values = _column_values(UserProfile, user_data)
+            # Every async driver (asyncpg, aiosqlite) has a native upsert
+            statement = _upsert_statement(async_db_manager.engine.dialect.name, UserProfile, values, ['guild_id', 'user_id'])
+            saved_profile = _user_to_dict((await session.execute(statement.values(values))).one())
+            await session.commit()
+            logger.info(f"User profile saved/updated for user {user_data['user_id']} in guild {user_data['guild_id']}")
+            _notify_profile_listeners(user_data['guild_id'], user_data['user_id'], saved_profile)
+            return True
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error saving user profile: {e}")
+            return False
+
+async def get_user_profile(guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a user's profile in a guild"""
+    async with async_db_manager.get_read_session(user_id) as session:
+        try:
+            user = await session.get(UserProfile, (guild_id, user_id))
+            if user:
+                return _user_to_dict(user)
+            return None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user profile: {e}")
+            return None
+
+async def get_all_users(guild_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get all user profiles of a guild, or of every guild when guild_id is None"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            users = await session.execute(_projection(UserProfile, None, guild_id))
+            return [_user_to_dict(user) for user in users]
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting all users: {e}")
+            return []
+
+async def stream_user_profiles(columns: Optional[Sequence[str]] = None, guild_id: Optional[str] = None,
+                               batch_size: int = DB_STREAM_BATCH_SIZE) -> AsyncIterator[Row]:
+    """Stream user profiles (of one guild when guild_id is given) as named tuples of the requested columns
+
+    A failure part way through is raised rather than ending the stream early.
+    """
+    async with async_db_manager.get_read_session() as session:
+        try:
+            result = await session.stream(_projection(UserProfile, columns, guild_id).execution_options(yield_per=batch_size))
+            async for row in result:
+                yield row
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming user profiles: {e}")
+            raise
+
+async def get_candidate_ids(guild_id: str, hackathon_id: Optional[int] = None, required_role: Optional[str] = None,
+                            skills: Sequence[str] = (), min_skill_overlap: int = 0, looking_for_team: bool = True,
+                            exclude_user_id: Optional[str] = None) -> frozenset:
+    """User IDs of a guild passing the match pre-filters, evaluated in the database"""
+    async with async_db_manager.get_read_session(exclude_user_id) as session:
+        try:
+            statement = _candidate_statement(
+                async_db_manager.engine.dialect.name, guild_id, hackathon_id, required_role, skills, min_skill_overlap,
+                looking_for_team, exclude_user_id
+            )
+            return frozenset(await session.scalars(statement))
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting match candidates: {e}")
+            return frozenset()
+
+async def delete_user_profile(guild_id: str, user_id: str) -> bool:
+    """Delete a user's profile in a guild"""
+    async with async_db_manager.get_session() as session:
+        try:
+            user = await session.get(UserProfile, (guild_id, user_id))
+            if user:
+                await session.delete(user)
+                await session.commit()
+                logger.info(f"User profile deleted for user {user_id} in guild {guild_id}")
+                _notify_profile_listeners(guild_id, user_id, None)
+                return True
+            return False
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error deleting user profile: {e}")
+            return False
+
+# Hackathon operations
+async def save_hackathon(hackathon_data: Dict[str, Any]) -> bool:
+    """Save or update a guild's hackathon; a 'teams' list replaces the participants
+
+    Returns False when an id is given that no hackathon of this guild has.
+    """
+    async with async_db_manager.get_session() as session:
+        try:
+            values = _column_values(Hackathon, hackathon_data)
+            values.pop('teams', None)
+            if 'id' in hackathon_data and hackathon_data['id']:
+                existing_hackathon = await session.get(Hackathon, hackathon_data['id'])
+                # Another guild's hackathon is never touched
+                if not existing_hackathon or existing_hackathon.guild_id != hackathon_data['guild_id']:
+                    logger.warning(f"Hackathon {hackathon_data['id']} not found in guild {hackathon_data['guild_id']}; nothing saved")
+                    return False
+                for key, value in values.items():
+                    if key not in ('id', 'guild_id'):
+                        setattr(existing_hackathon, key, value)
+                existing_hackathon.updated_at = datetime.utcnow()
+                hackathon = existing_hackathon
+            else:
+                hackathon = Hackathon(**values)
+                session.add(hackathon)
+
+            await session.flush()
+            if 'teams' in hackathon_data:
+                await session.execute(delete(HackathonParticipant).where(HackathonParticipant.hackathon_id == hackathon.id))
+                team_values = _team_values(hackathon.guild_id, hackathon.id, hackathon_data['teams'] or [])
+                if team_values:
+                    await session.execute(insert(HackathonParticipant), team_values)
+            teams = (await _load_participants(session, [hackathon.id]))[hackathon.id]
+            saved_hackathon = _hackathon_to_dict(hackathon, teams)
+            await session.commit()
+            logger.info(f"Hackathon saved/updated: {hackathon_data.get('name', 'Unknown')}")
+            _notify_hackathon_listeners(saved_hackathon['guild_id'], saved_hackathon['id'], saved_hackathon)
+            return True
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error saving hackathon: {e}")
+            return False
+
+async def get_hackathon(guild_id: str, hackathon_id: int) -> Optional[Dict[str, Any]]:
+    """Get a guild's hackathon by ID, with its participants"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            hackathon = await session.get(Hackathon, hackathon_id)
+            if hackathon and hackathon.guild_id == guild_id:
+                teams = (await _load_participants(session, [hackathon_id]))[hackathon_id]
+                return _hackathon_to_dict(hackathon, teams)
+            return None
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting hackathon: {e}")
+            return None
+
+async def get_all_hackathons(guild_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get all hackathons of a guild (of every guild when guild_id is None), with their participants"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            hackathons = (await session.execute(_projection(Hackathon, None, guild_id))).all()
+            participants = await _load_participants(session, [hackathon.id for hackathon in hackathons])
+            return [_hackathon_to_dict(hackathon, participants[hackathon.id]) for hackathon in hackathons]
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting all hackathons: {e}")
+            return []
+
+async def stream_hackathons(columns: Optional[Sequence[str]] = None, guild_id: Optional[str] = None,
+                            batch_size: int = DB_STREAM_BATCH_SIZE) -> AsyncIterator[Row]:
+    """Stream hackathons (of one guild when guild_id is given) as named tuples of the requested columns, in ID order"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            result = await session.stream(_projection(Hackathon, columns, guild_id).execution_options(yield_per=batch_size))
+            async for row in result:
+                yield row
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming hackathons: {e}")
+            raise
+
+async def get_hackathon_summaries(guild_id: str) -> List[Dict[str, Any]]:
+    """Get a guild's hackathons with a participant_count instead of the participant list"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            rows = await session.execute(_summaries_statement(guild_id))
+            return [_hackathon_summary(hackathon, count) for hackathon, count in rows]
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting hackathon summaries: {e}")
+            return []
+
+async def get_hackathon_summaries_page(guild_id: str, after_id: Optional[int] = None, before_id: Optional[int] = None,
+                                       limit: int = HACKATHON_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], bool]:
+    """One page of a guild's hackathon summaries after (or before) a hackathon ID, and whether more follow"""
+    async with async_db_manager.get_read_session() as session:
+        try:
+            rows = await session.execute(_summaries_page_statement(guild_id, after_id, before_id, limit))
+            return _summaries_page(rows, limit, before_id is not None)
+
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting hackathon summaries page: {e}")
+            return [], False
+
+async def delete_hackathon(guild_id: str, hackathon_id: int) -> bool:
+    """Delete a guild's hackathon and its participants"""
+    async with async_db_manager.get_session() as session:
+        try:
+            hackathon = await session.get(Hackathon, hackathon_id)
+            if hackathon and hackathon.guild_id == guild_id:
+                name = hackathon.name
+                await session.execute(delete(HackathonParticipant).where(HackathonParticipant.hackathon_id == hackathon_id))
+                await session.delete(hackathon)
+                await session.commit()
+                logger.info(f"Hackathon deleted: {name}")
+                _notify_hackathon_listeners(guild_id, hackathon_id, None)
+                return True
+            return False
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error deleting hackathon: {e}")
+            return False
+
+async def add_user_to_hackathon(guild_id: str, hackathon_id: int, user_id: str, username: str) -> bool:
+    """Add user to one of their guild's hackathons; the primary key rejects duplicate joins"""
+    async with async_db_manager.get_session() as session:
+        try:
+            hackathon = await session.get(Hackathon, hackathon_id)
+            if hackathon is None or hackathon.guild_id != guild_id:
+                return False
+            session.add(HackathonParticipant(
+                hackathon_id=hackathon_id,
+                user_id=user_id,
+                guild_id=guild_id,
+                username=username,
+                joined_at=datetime.utcnow()
+            ))
+            await session.commit()
+            logger.info(f"User {username} added to hackathon {hackathon_id}")
+            _notify_participant_listeners(guild_id, hackathon_id, user_id, True)
+            return True
+
+        except IntegrityError:
+            await session.rollback()
+            logger.info(f"User {username} is already in hackathon {hackathon_id}")
+            return False
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error adding user to hackathon: {e}")
+            return False
+
+async def remove_user_from_hackathon(guild_id: str, hackathon_id: int, user_id: str) -> bool:
+    """Remove user from one of their guild's hackathons"""
+    async with async_db_manager.get_session() as session:
+        try:
+            removed = (await session.execute(_leave_statement(guild_id, hackathon_id, user_id))).rowcount
+            await session.commit()
+            if removed:
+                logger.info(f"User {user_id} removed from hackathon {hackathon_id}")
+                _notify_participant_listeners(guild_id, hackathon_id, user_id, False)
+                return True
+            logger.info(f"User {user_id} not found in hackathon {hackathon_id}")
+            return False
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error removing user from hackathon: {e}")
+            return False
+
+# Batched writes
+async def apply_write_batch(operations: Sequence[Tuple]) -> List[bool]:
+    """Apply queued profile saves, joins and leaves in one commit; returns success per operation
+
+    Operations are ('save_profile', user_data), ('join', guild_id, hackathon_id,
+    user_id, username) and ('leave', guild_id, hackathon_id, user_id), applied
+    in order. Each runs in its own savepoint, so a rejected or malformed
+    write (a duplicate join, a bad timestamp, an unknown operation) fails
+    alone instead of taking the batch down with it.
+    """
+    results = [False] * len(operations)
+    notifications = []
+    async with async_db_manager.get_session() as session:
+        try:
+            dialect_name = async_db_manager.engine.dialect.name
+            join_ids = {
+                operation[2] for operation in operations
+                if isinstance(operation, tuple) and len(operation) == 5 and operation[0] == 'join' and isinstance(operation[2], int)
+            }
+            # A join only counts against a hackathon of the same guild
+            hackathon_keys = {
+                tuple(row) for row in await session.execute(select(Hackathon.guild_id, Hackathon.id).where(Hackathon.id.in_(join_ids)))
+            } if join_ids else set()
+            
+            for position, operation in enumerate(operations):
+                kind = operation[0] if isinstance(operation, tuple) and operation else None
+                try:
+                    async with session.begin_nested():
+                        if kind == 'save_profile':
+                            values = _column_values(UserProfile, operation[1])
+                            statement = _upsert_statement(dialect_name, UserProfile, values, ['guild_id', 'user_id'])
+                            saved_profile = _user_to_dict((await session.execute(statement.values(values))).one())
+                            notifications.append((
+                                _notify_profile_listeners, (saved_profile['guild_id'], saved_profile['user_id'], saved_profile)
+                            ))
+                        elif kind == 'join':
+                            _, guild_id, hackathon_id, user_id, username = operation
+                            if (guild_id, hackathon_id) not in hackathon_keys:
+                                continue
+                            await session.execute(insert(HackathonParticipant).values(
+                                hackathon_id=hackathon_id, user_id=user_id, guild_id=guild_id, username=username,
+                                joined_at=datetime.utcnow()
+                            ))
+                            notifications.append((_notify_participant_listeners, (guild_id, hackathon_id, user_id, True)))
+                        elif kind == 'leave':
+                            _, guild_id, hackathon_id, user_id = operation
+                            if not (await session.execute(_leave_statement(guild_id, hackathon_id, user_id))).rowcount:
+                                continue
+                            notifications.append((_notify_participant_listeners, (guild_id, hackathon_id, user_id, False)))
+                        else:
+                            raise ValueError(f"Unknown write operation: {kind}")
+                    results[position] = True
+                    
+                except IntegrityError:
+                    logger.info(f"Write rejected by a constraint: {operation[:4]}")
+                except SQLAlchemyError as e:
+                    logger.error(f"Error applying {kind} in write batch: {e}")
+                except Exception as e:
+                    logger.error(f"Malformed {kind} operation in write batch: {e!r}")
+            
+            await session.commit()
+            logger.info(f"Applied {results.count(True)} of {len(operations)} batched writes in one commit")
+            
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Error committing write batch: {e}")
+            return [False] * len(operations)
+    
+    for notify, args in notifications:
+        notify(*args)
+    return results
@@ -0,0 +1,416 @@
+"""
+In-process candidate index for the Hackathon Team Finder Discord Bot
+
+Profiles are indexed by skill, role, timezone and experience so a match lookup
+only scores the candidates that can matter. Anyone sharing a skill with the
+query is scored exactly; everyone else has no skill overlap, so their score is
+fully decided by roles, experience and timezone. Those candidates are walked
+in score tiers from the best possible tier down, and the walk stops as soon as
+no remaining tier can beat the current top-k cutoff or the score threshold.
+
+Profiles with the same roles, skills, experience and timezone always score
+the same, so they are interned into one profile class. Skill postings point
+at classes, each class is scored once per lookup (and the class-pair score is
+cached across lookups), and the score is then expanded to the class members.
+Each guild has its own index, loaded from that guild's profiles on first use.
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Set
+from config import CLASS_SCORE_CACHE_SIZE
+from .lru_cache import LRUCache
+from .partitions import GuildPartitions, Snapshot
+from .matching import PreparedProfile, prepare_profile, score_prepared, MIN_COMPATIBILITY_SCORE
+
+logger = logging.getLogger(__name__)
+
+class _Ranked:
+    """Heap entry ordered so the worst match sits at the top of a min-heap"""
+    __slots__ = ("score", "user_id")
+
+    def __init__(self, score: float, user_id: str):
+        self.score = score
+        self.user_id = user_id
+
+    def __lt__(self, other: "_Ranked") -> bool:
+        if self.score != other.score:
+            return self.score < other.score
+        return self.user_id > other.user_id
+
+class _ProfileClass:
+    """Interned group of users whose profiles score identically; hashed by identity"""
+    __slots__ = ("prepared", "members")
+
+    def __init__(self, prepared: PreparedProfile):
+        self.prepared = prepared
+        self.members: List[str] = []
+
+class _TopK:
+    """Bounded heap of the best matches; unbounded when k is None
+
+    With an after cursor (a previous page's last (user_id, score) pair), only
+    matches ranked below it are kept.
+    """
+
+    def __init__(self, k: Optional[int], after: Optional[Tuple[str, float]] = None):
+        self.k = k
+        self.after = after
+        self._heap: List[_Ranked] = []
+
+    def full(self) -> bool:
+        return self.k is not None and len(self._heap) >= self.k
+
+    def beats_cutoff(self, score: float, user_id: str) -> bool:
+        """Whether a match with this score and ID would make the list"""
+        if self.k is not None and self.k <= 0:
+            return False
+        if not self.full():
+            return True
+        worst = self._heap[0]
+        return score > worst.score or (score == worst.score and user_id < worst.user_id)
+
+    def ranks_after(self, score: float, user_id: str) -> bool:
+        """Whether a match comes after the cursor (score descending, then user ID)"""
+        if self.after is None:
+            return True
+        after_user_id, after_score = self.after
+        return score < after_score or (score == after_score and user_id > after_user_id)
+
+    def push(self, score: float, user_id: str):
+        if not self.ranks_after(score, user_id) or not self.beats_cutoff(score, user_id):
+            return
+        if self.full():
+            heapq.heapreplace(self._heap, _Ranked(score, user_id))
+        else:
+            heapq.heappush(self._heap, _Ranked(score, user_id))
+
+    def cutoff(self) -> Optional[float]:
+        """Score of the worst kept match once the list is full"""
+        if not self.full():
+            return None
+        return self._heap[0].score if self._heap else float("inf")
+
+    def results(self) -> List[Tuple[str, float]]:
+        ranked = sorted(self._heap, key=lambda entry: (-entry.score, entry.user_id))
+        return [(entry.user_id, entry.score) for entry in ranked]
+
+def _tier_score(roles_differ: bool, has_skills: bool, experience_differs: bool, same_timezone: bool) -> float:
+    """Exact score of a candidate sharing no skills, summed like score_prepared"""
+    score = 0.0
+    if roles_differ:
+        score += 0.3
+    if has_skills:
+        score += 0.1  # No overlap means the "too little overlap" bucket
+    if experience_differs:
+        score += 0.2
+    if same_timezone:
+        score += 0.1
+    return min(score, 1.0)
+
+def _upper_bound(query: PreparedProfile, candidate: PreparedProfile) -> float:
+    """Best score a candidate could reach if its skill overlap were ideal"""
+    score = 0.0
+    if query.roles != candidate.roles:
+        score += 0.3
+    score += 0.4
+    if query.experience != candidate.experience:
+        score += 0.2
+    if query.timezone == candidate.timezone:
+        score += 0.1
+    return min(score, 1.0)
+
+def _insort(postings: Dict[Any, List[str]], key: Any, user_id: str):
+    """Insert a user ID into a sorted posting list"""
+    bisect.insort(postings.setdefault(key, []), user_id)
+
+def _remove_sorted(postings: Dict[Any, List[str]], key: Any, user_id: str):
+    """Remove a user ID from a sorted posting list"""
+    members = postings.get(key)
+    if not members:
+        return
+    i = bisect.bisect_left(members, user_id)
+    if i < len(members) and members[i] == user_id:
+        del members[i]
+    if not members:
+        del postings[key]
+
+class CandidateIndex:
+    """Inverted index over profiles with score-bounded top-k lookups"""
+
+    def __init__(self, class_score_cache_size: int = CLASS_SCORE_CACHE_SIZE):
+        self._lock = threading.RLock()
+        self.version = 0
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._prepared: Dict[str, PreparedProfile] = {}
+        self._sorted_ids: List[str] = []
+
+        # Interned profile classes and their members in user ID order
+        self._classes: Dict[PreparedProfile, _ProfileClass] = {}
+        self._class_of: Dict[str, _ProfileClass] = {}
+        self._class_scores = LRUCache(class_score_cache_size)
+
+        # Posting lists; the sorted ones double as tie-break order for tier walks
+        self._by_skill: Dict[str, Set[_ProfileClass]] = {}
+        self._by_role: Dict[str, Set[str]] = {}
+        self._by_role_set: Dict[frozenset, List[str]] = {}
+        self._by_timezone: Dict[Any, List[str]] = {}
+        self._by_experience: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._prepared)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._prepared
+
+    def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Indexed profile dict for a user, or None"""
+        return self._profiles.get(user_id)
+
+    def profiles(self) -> List[Dict[str, Any]]:
+        """Snapshot of every indexed profile dict"""
+        with self._lock:
+            return list(self._profiles.values())
+
+    def user_ids_with_role(self, role: str) -> Set[str]:
+        """Users listing a role"""
+        with self._lock:
+            return set(self._by_role.get(role, ()))
+
+    def add(self, profile: Dict[str, Any]):
+        """Add or replace a profile"""
+        user_id = profile["user_id"]
+        with self._lock:
+            if user_id in self._prepared:
+                self._unindex(user_id)
+            profile_class = self._join_class(prepare_profile(profile), user_id)
+            prepared = profile_class.prepared
+            self._profiles[user_id] = profile
+            self._prepared[user_id] = prepared
+            bisect.insort(self._sorted_ids, user_id)
+            for role in prepared.roles:
+                self._by_role.setdefault(role, set()).add(user_id)
+            _insort(self._by_role_set, prepared.roles, user_id)
+            _insort(self._by_timezone, prepared.timezone, user_id)
+            _insort(self._by_experience, prepared.experience, user_id)
+            self.version += 1
+
+    def remove(self, user_id: str) -> bool:
+        """Remove a profile"""
+        with self._lock:
+            if user_id not in self._prepared:
+                return False
+            self._unindex(user_id)
+            self.version += 1
+            return True
+
+    def _unindex(self, user_id: str):
+        prepared = self._prepared.pop(user_id)
+        del self._profiles[user_id]
+        i = bisect.bisect_left(self._sorted_ids, user_id)
+        del self._sorted_ids[i]
+        self._leave_class(user_id)
+        for role in prepared.roles:
+            members = self._by_role[role]
+            members.discard(user_id)
+            if not members:
+                del self._by_role[role]
+        _remove_sorted(self._by_role_set, prepared.roles, user_id)
+        _remove_sorted(self._by_timezone, prepared.timezone, user_id)
+        _remove_sorted(self._by_experience, prepared.experience, user_id)
+
+    def _join_class(self, prepared: PreparedProfile, user_id: str) -> _ProfileClass:
+        """Add a user to the class of a prepared profile, interning the class if new"""
+        profile_class = self._classes.get(prepared)
+        if profile_class is None:
+            profile_class = self._classes[prepared] = _ProfileClass(prepared)
+            for skill in prepared.skills:
+                self._by_skill.setdefault(skill, set()).add(profile_class)
+        bisect.insort(profile_class.members, user_id)
+        self._class_of[user_id] = profile_class
+        return profile_class
+
+    def _leave_class(self, user_id: str):
+        """Remove a user from its class, dropping the class once it is empty"""
+        profile_class = self._class_of.pop(user_id)
+        members = profile_class.members
+        del members[bisect.bisect_left(members, user_id)]
+        if members:
+            return
+        del self._classes[profile_class.prepared]
+        for skill in profile_class.prepared.skills:
+            classes = self._by_skill[skill]
+            classes.discard(profile_class)
+            if not classes:
+                del self._by_skill[skill]
+
+    def class_score(self, query: PreparedProfile, profile_class: PreparedProfile) -> float:
+        """Compatibility score between two profile classes, cached by class pair"""
+        key = (query, profile_class)
+        score = self._class_scores.get(key)
+        if score is None:
+            score = score_prepared(query, profile_class)
+            self._class_scores.put(key, score)
+        return score
+
+    def class_stats(self) -> Dict[str, Any]:
+        """Profile class statistics; duplication_factor is the scoring work saved per lookup"""
+        with self._lock:
+            sizes = sorted((len(profile_class.members) for profile_class in self._classes.values()), reverse=True)
+        profiles = sum(sizes)
+        return {
+            "profiles": profiles,
+            "classes": len(sizes),
+            "duplication_factor": profiles / len(sizes) if sizes else 1.0,
+            "singleton_classes": sum(1 for size in sizes if size == 1),
+            "largest_classes": sizes[:5],
+            "score_cache": self._class_scores.stats()
+        }
+
+    def handle_profile_change(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Profile listener hook for utils.database writes"""
+        if profile is None:
+            self.remove(user_id)
+        else:
+            self.add(profile)
+
+    def top_k(self, profile: Dict[str, Any], k: Optional[int] = None, min_score: float = MIN_COMPATIBILITY_SCORE, exclude: Optional[str] = None, candidates: Optional[Set[str]] = None, after: Optional[Tuple[str, float]] = None) -> List[Tuple[str, float]]:
+        """Best k (user_id, score) pairs above min_score, ties broken by user ID
+
+        Same results as utils.matching.find_compatible_teammates over the indexed
+        profiles. When candidates is given, only those user IDs are considered.
+        after pages on from the last (user_id, score) pair of a previous call.
+        """
+        query = prepare_profile(profile)
+        best = _TopK(k, after)
+        after_score = after[1] if after is not None else None
+        with self._lock:
+            # Classes sharing a skill: one exact score per class, skipped when even
+            # an ideal overlap could not beat the threshold or the top-k cutoff
+            candidate_pool = None
+            if candidates is not None:
+                # A small candidate set (one hackathon) is cheaper to scan than the postings
+                candidate_pool = sorted(user_id for user_id in candidates if user_id in self._prepared)
+                # Classes narrowed to their candidate members
+                grouped: Dict[PreparedProfile, _ProfileClass] = {}
+                for user_id in candidate_pool:
+                    candidate = self._prepared[user_id]
+                    if not query.skills.isdisjoint(candidate.skills):
+                        if candidate not in grouped:
+                            grouped[candidate] = _ProfileClass(candidate)
+                        grouped[candidate].members.append(user_id)
+                sharing: Iterable[_ProfileClass] = grouped.values()
+            else:
+                sharing = set()
+                for skill in query.skills:
+                    sharing.update(self._by_skill.get(skill, ()))
+            for profile_class in sharing:
+                candidate = profile_class.prepared
+                members = profile_class.members
+                # Members are in ID order, so the first one is the best tie-break
+                bound = _upper_bound(query, candidate)
+                if bound <= min_score or not best.beats_cutoff(bound, members[0]):
+                    continue
+                if len(members) > 1:
+                    score = self.class_score(query, candidate)
+                else:
+                    score = score_prepared(query, candidate)  # Nothing to share, skip the cache
+                if score <= min_score or (after_score is not None and score > after_score):
+                    continue
+                for user_id in members:
+                    if user_id == exclude:
+                        continue
+                    if not best.beats_cutoff(score, user_id):
+                        break
+                    best.push(score, user_id)
+
+            # Everyone else, one score tier at a time, best tier first
+            for tier in self._tiers(query):
+                tier_score = tier[0]
+                if tier_score <= min_score:
+                    break
+                cutoff = best.cutoff()
+                if cutoff is not None and cutoff > tier_score:
+                    break
+                if after_score is not None and tier_score > after_score:
+                    continue  # The whole tier was on earlier pages
+                for user_id in self._walk_tier(query, tier, exclude, candidates, candidate_pool):
+                    if not best.beats_cutoff(tier_score, user_id):
+                        break  # Members come in ID order, so the rest lose the tie too
+                    best.push(tier_score, user_id)
+        return best.results()
+
+    def _tiers(self, query: PreparedProfile) -> List[Tuple[float, bool, bool, bool, bool]]:
+        """(score, roles_differ, has_skills, experience_differs, same_timezone), best first"""
+        skill_options = (True,) if query.skills else (True, False)
+        tiers = [
+            (_tier_score(roles_differ, has_skills, experience_differs, same_timezone),
+             roles_differ, has_skills, experience_differs, same_timezone)
+            for roles_differ in (True, False)
+            for has_skills in skill_options
+            for experience_differs in (True, False)
+            for same_timezone in (True, False)
+        ]
+        tiers.sort(key=lambda tier: -tier[0])
+        return tiers
+
+    def _walk_tier(self, query: PreparedProfile, tier: Tuple[float, bool, bool, bool, bool], exclude: Optional[str], candidates: Optional[Set[str]], candidate_pool: Optional[List[str]]) -> Iterable[str]:
+        """Non-sharing members of a tier in user ID order"""
+        _, roles_differ, has_skills, experience_differs, same_timezone = tier
+
+        # Walk the smallest sorted posting list that pins one of the tier's conditions
+        pools = [self._sorted_ids if candidate_pool is None else candidate_pool]
+        if same_timezone:
+            pools.append(self._by_timezone.get(query.timezone, []))
+        if not roles_differ:
+            pools.append(self._by_role_set.get(query.roles, []))
+        if not experience_differs:
+            pools.append(self._by_experience.get(query.experience, []))
+        pool = min(pools, key=len)
+
+        for user_id in pool:
+            if user_id == exclude:
+                continue
+            if candidates is not None and user_id not in candidates:
+                continue
+            candidate = self._prepared[user_id]
+            if not query.skills.isdisjoint(candidate.skills):
+                continue  # Already scored with its class
+            if (candidate.roles != query.roles) != roles_differ:
+                continue
+            if bool(query.skills or candidate.skills) != has_skills:
+                continue
+            if (candidate.experience != query.experience) != experience_differs:
+                continue
+            if (candidate.timezone == query.timezone) != same_timezone:
+                continue
+            yield user_id
+
+def _load_candidate_index(guild_id: str, index: CandidateIndex, snapshot: Snapshot):
+    from .database import iter_user_profiles, row_to_profile, PROFILE_MATCH_COLUMNS
+    for row in iter_user_profiles(PROFILE_MATCH_COLUMNS, guild_id, primary=True):
+        profile = row_to_profile(row)
+        snapshot.fill([profile["user_id"]], lambda: index.add(profile))
+    stats = index.class_stats()
+    logger.info(
+        f"Candidate index built for guild {guild_id}: {stats['profiles']} profiles in {stats['classes']} classes "
+        f"(duplication factor {stats['duplication_factor']:.2f})"
+    )
+
+def _route_profile_change(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    """Profile listener: update the changed guild's index, if it is loaded"""
+    _candidate_indexes.apply(guild_id, [user_id], lambda index: index.handle_profile_change(user_id, profile))
+
+def _subscribe():
+    from .database import add_profile_listener
+    add_profile_listener(_route_profile_change)
+
+_candidate_indexes: GuildPartitions[CandidateIndex] = GuildPartitions(
+    lambda guild_id: CandidateIndex(), _load_candidate_index, _subscribe
+)
+
+def get_candidate_index(guild_id: str) -> CandidateIndex:
+    """A guild's index, built from its profiles on first use and kept current by profile writes"""
+    return _candidate_indexes.get(guild_id)
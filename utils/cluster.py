@@ -0,0 +1,344 @@
+"""
+Shard clusters for the Hackathon Team Finder Discord Bot
+
+One process holds one gateway connection and one core, however many guilds
+it serves. launcher.py splits the shards into clusters and runs each cluster
+as its own process, with its own AutoShardedClient, database engine and
+matching pool, all against the shared database. A guild's events always
+arrive on the same shard, so its partitioned indexes and caches
+(utils.partitions) live in exactly one cluster.
+
+Each cluster sends a heartbeat with its shard latencies and queue depths over
+a pipe; ClusterManager restarts clusters that exit or go silent, and restarts
+all of them one at a time on request (a rolling restart), so only one
+cluster's guilds are offline at once.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Any, Optional
+from config import (
+    CLUSTER_HEARTBEAT_INTERVAL, CLUSTER_HEARTBEAT_TIMEOUT,
+    CLUSTER_STOP_TIMEOUT, CLUSTER_READY_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest wait before restarting a cluster that keeps failing (seconds)
+MAX_RESTART_BACKOFF = 60.0
+
+def plan_clusters(shard_count: int, shards_per_cluster: int) -> List[List[int]]:
+    """Shard IDs 0..shard_count-1 split into consecutive clusters of at most shards_per_cluster"""
+    shards_per_cluster = max(1, shards_per_cluster)
+    return [list(range(start, min(start + shards_per_cluster, shard_count)))
+            for start in range(0, shard_count, shards_per_cluster)]
+
+async def fetch_recommended_shards(token: str) -> int:
+    """How many shards Discord recommends for this bot"""
+    from discord.http import HTTPClient
+
+    http = HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shard_count, _, _ = await http.get_bot_gateway()
+        return shard_count
+    finally:
+        await http.close()
+
+# Cluster process side
+
+def _cluster_health(bot, cluster_id: int) -> Dict[str, Any]:
+    from .jobs import get_job_runner
+    from .write_queue import get_write_queue
+
+    shards = {}
+    for shard_id, shard in bot.shards.items():
+        latency = shard.latency
+        shards[str(shard_id)] = {
+            "connected": not shard.is_closed(),
+            "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None
+        }
+    jobs = get_job_runner().stats()
+    return {
+        "cluster_id": cluster_id,
+        "pid": os.getpid(),
+        "ready": bot.is_ready(),
+        "guilds": len(bot.guilds),
+        "shards": shards,
+        "jobs_active": jobs["active"],
+        "write_queue_pending": get_write_queue().stats()["pending"]
+    }
+
+async def _report_health(bot, cluster_id: int, conn: Connection):
+    while True:
+        try:
+            conn.send(_cluster_health(bot, cluster_id))
+        except (BrokenPipeError, OSError):
+            # The launcher is gone; stop rather than serve guilds nobody supervises
+            await bot.close()
+            return
+        await asyncio.sleep(CLUSTER_HEARTBEAT_INTERVAL)
+
+def _wait_for_stop(conn: Connection, loop: asyncio.AbstractEventLoop, stop: asyncio.Event):
+    """Blocks on the pipe in a thread; any message (or the launcher exiting) means stop"""
+    try:
+        conn.recv()
+    except (EOFError, OSError):
+        pass
+    loop.call_soon_threadsafe(stop.set)
+
+async def _run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int,
+                       conn: Connection, sync_commands: bool):
+    from bot import create_bot, get_bot_token
+
+    bot = create_bot(sharded=True, shard_ids=shard_ids, shard_count=shard_count,
+                     sync_commands=sync_commands, stagger_identify=True)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    threading.Thread(target=_wait_for_stop, args=(conn, loop, stop), name="cluster-stop", daemon=True).start()
+
+    running = asyncio.create_task(bot.start(get_bot_token()))
+    stopping = asyncio.create_task(stop.wait())
+    reporter = asyncio.create_task(_report_health(bot, cluster_id, conn))
+    try:
+        await asyncio.wait({running, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        if stopping.done():
+            logger.info("Cluster %d stopping: flushing queued writes and closing shards %s", cluster_id, shard_ids)
+            await bot.close()
+        await running
+    finally:
+        reporter.cancel()
+        stopping.cancel()
+        if not bot.is_closed():
+            await bot.close()
+
+def run_cluster(cluster_id: int, shard_ids: List[int], shard_count: int, conn: Connection, sync_commands: bool):
+    """Entry point of a cluster process"""
+    # Ctrl+C reaches the whole process group; the launcher decides how clusters stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=f"[cluster {cluster_id}] %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_run_cluster(cluster_id, shard_ids, shard_count, conn, sync_commands))
+
+# Launcher side
+
+class ClusterProcess:
+    """One cluster: its shards, its current process and the last health it reported"""
+
+    def __init__(self, cluster_id: int, shard_ids: List[int]):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn: Optional[Connection] = None
+        self.health: Dict[str, Any] = {}
+        self.started_at = 0.0
+        self.last_heartbeat = 0.0
+        self.ready_at: Optional[float] = None
+        self.restarts = 0
+        self.failures = 0
+        self.next_start = 0.0
+        self.stopping = False
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def is_ready(self) -> bool:
+        return self.is_alive() and self.ready_at is not None and not self.stopping
+
+    def is_healthy(self, now: float) -> bool:
+        """Alive, ready, heard from recently and with every shard connected"""
+        return (self.is_ready() and now - self.last_heartbeat <= CLUSTER_HEARTBEAT_TIMEOUT
+                and all(shard["connected"] for shard in self.health.get("shards", {}).values()))
+
+    def status(self, now: float) -> Dict[str, Any]:
+        return {
+            "cluster_id": self.cluster_id,
+            "shard_ids": self.shard_ids,
+            "pid": self.process.pid if self.process is not None else None,
+            "alive": self.is_alive(),
+            "healthy": self.is_healthy(now),
+            "uptime": round(now - self.started_at, 1) if self.is_alive() else 0.0,
+            "last_heartbeat_age": round(now - self.last_heartbeat, 1) if self.last_heartbeat else None,
+            "restarts": self.restarts,
+            "guilds": self.health.get("guilds"),
+            "shards": self.health.get("shards", {}),
+            "jobs_active": self.health.get("jobs_active"),
+            "write_queue_pending": self.health.get("write_queue_pending")
+        }
+
+class ClusterManager:
+    """Starts, supervises and restarts the cluster processes
+
+    Clusters are started one at a time, each after the previous one is ready,
+    which keeps IDENTIFYs within Discord's rate limit. supervise() runs in the
+    launcher's main thread; status() and request_rolling_restart() may be
+    called from any thread.
+    """
+
+    def __init__(self, shard_count: int, shards_per_cluster: int):
+        self.shard_count = shard_count
+        self.clusters = [ClusterProcess(cluster_id, shard_ids)
+                         for cluster_id, shard_ids in enumerate(plan_clusters(shard_count, shards_per_cluster))]
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._rolling_requested = threading.Event()
+        self._shutdown_requested = threading.Event()
+
+    def _start(self, cluster: ClusterProcess):
+        parent_conn, child_conn = self._context.Pipe()
+        # Commands are global: the first cluster syncs them for everyone
+        process = self._context.Process(
+            target=run_cluster, name=f"cluster-{cluster.cluster_id}",
+            args=(cluster.cluster_id, cluster.shard_ids, self.shard_count, child_conn, cluster.cluster_id == 0)
+        )
+        process.start()
+        child_conn.close()
+        with self._lock:
+            cluster.process = process
+            cluster.conn = parent_conn
+            cluster.health = {}
+            cluster.started_at = time.monotonic()
+            cluster.last_heartbeat = cluster.started_at
+            cluster.ready_at = None
+            cluster.stopping = False
+        logger.info("Started cluster %d (shards %s) as pid %d", cluster.cluster_id, cluster.shard_ids, process.pid)
+
+    def _stop(self, cluster: ClusterProcess):
+        """Ask a cluster to close its shards and flush its writes, killing it after CLUSTER_STOP_TIMEOUT"""
+        if cluster.process is None:
+            return
+        cluster.stopping = True
+        if cluster.process.is_alive():
+            try:
+                cluster.conn.send("stop")
+            except (BrokenPipeError, OSError):
+                pass
+            deadline = time.monotonic() + CLUSTER_STOP_TIMEOUT
+            while cluster.process.is_alive() and time.monotonic() < deadline:
+                self.poll(min(0.5, max(0.0, deadline - time.monotonic())))
+            if cluster.process.is_alive():
+                logger.warning("Cluster %d did not stop within %.0fs; terminating it", cluster.cluster_id, CLUSTER_STOP_TIMEOUT)
+                cluster.process.terminate()
+                cluster.process.join(5)
+                if cluster.process.is_alive():
+                    cluster.process.kill()
+        cluster.process.join()
+        cluster.conn.close()
+        logger.info("Cluster %d exited with code %s", cluster.cluster_id, cluster.process.exitcode)
+
+    def _wait_ready(self, cluster: ClusterProcess) -> bool:
+        """Poll until the cluster reports ready; False if it dies or CLUSTER_READY_TIMEOUT passes"""
+        deadline = time.monotonic() + CLUSTER_READY_TIMEOUT
+        while time.monotonic() < deadline and not self._shutdown_requested.is_set():
+            self.poll(0.5)
+            if cluster.is_ready():
+                return True
+            if not cluster.is_alive():
+                return False
+        return False
+
+    def poll(self, timeout: float):
+        """Read whatever heartbeats arrive within timeout seconds"""
+        conns = {cluster.conn: cluster for cluster in self.clusters
+                 if cluster.conn is not None and not cluster.conn.closed}
+        if not conns:
+            time.sleep(timeout)
+            return
+        for conn in wait(list(conns), timeout):
+            cluster = conns[conn]
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                # The process exited; check() notices and restarts it
+                conn.close()
+                continue
+            with self._lock:
+                cluster.last_heartbeat = time.monotonic()
+                cluster.health = message
+                if message.get("ready") and cluster.ready_at is None:
+                    cluster.ready_at = cluster.last_heartbeat
+                    cluster.failures = 0
+                    logger.info("Cluster %d is ready with %d guild(s)", cluster.cluster_id, message.get("guilds", 0))
+
+    def _restart(self, cluster: ClusterProcess, reason: str):
+        logger.warning("Restarting cluster %d: %s", cluster.cluster_id, reason)
+        self._stop(cluster)
+        cluster.restarts += 1
+        cluster.failures += 1
+        cluster.next_start = time.monotonic() + min(2.0 ** (cluster.failures - 1), MAX_RESTART_BACKOFF)
+
+    def check(self):
+        """Restart clusters that exited or stopped reporting; start any that are due"""
+        now = time.monotonic()
+        for cluster in self.clusters:
+            if cluster.process is None:
+                if now >= cluster.next_start:
+                    self._start(cluster)
+            elif not cluster.process.is_alive():
+                self._restart(cluster, f"exited with code {cluster.process.exitcode}")
+                cluster.process = None
+            elif now - cluster.last_heartbeat > CLUSTER_HEARTBEAT_TIMEOUT:
+                self._restart(cluster, f"no heartbeat for {now - cluster.last_heartbeat:.0f}s")
+                cluster.process = None
+
+    def start_all(self):
+        """Start the clusters in order, each once the previous one is ready"""
+        for cluster in self.clusters:
+            if self._shutdown_requested.is_set():
+                return
+            self._start(cluster)
+            if not self._wait_ready(cluster):
+                logger.warning("Cluster %d is not ready; starting the next one anyway", cluster.cluster_id)
+
+    def rolling_restart(self):
+        """Replace each cluster in turn, moving on only once its replacement is ready"""
+        logger.info("Rolling restart of %d cluster(s)", len(self.clusters))
+        for cluster in self.clusters:
+            if self._shutdown_requested.is_set():
+                return
+            self._stop(cluster)
+            cluster.restarts += 1
+            self._start(cluster)
+            if not self._wait_ready(cluster):
+                logger.error("Cluster %d did not come back; rolling restart stopped", cluster.cluster_id)
+                return
+        logger.info("Rolling restart complete")
+
+    def request_rolling_restart(self):
+        self._rolling_requested.set()
+
+    def request_shutdown(self):
+        self._shutdown_requested.set()
+
+    def supervise(self):
+        """Run until shutdown is requested, then stop every cluster"""
+        self.start_all()
+        while not self._shutdown_requested.is_set():
+            self.poll(1.0)
+            if self._rolling_requested.is_set():
+                self._rolling_requested.clear()
+                self.rolling_restart()
+            self.check()
+        self.stop_all()
+
+    def stop_all(self):
+        """Stop every cluster, in reverse order"""
+        for cluster in reversed(self.clusters):
+            self._stop(cluster)
+
+    def status(self) -> Dict[str, Any]:
+        """Health of every cluster, for the launcher's health check"""
+        now = time.monotonic()
+        with self._lock:
+            clusters = [cluster.status(now) for cluster in self.clusters]
+        return {
+            "shard_count": self.shard_count,
+            "healthy": sum(1 for cluster in clusters if cluster["healthy"]),
+            "clusters": clusters
+        }
@@ -4,17 +4,86 @@ Data management utilities for the Hackathon Team Finder Discord Bot
 
 import json
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Iterator, AsyncIterator, Optional, Sequence, Hashable, Tuple
+from sqlalchemy.engine import Row
+from config import (
+    PROFILE_CACHE_MAX_ENTRIES, PROFILE_CACHE_MAX_BYTES, PROFILE_CACHE_TTL,
+    HACKATHON_CACHE_MAX_ENTRIES, HACKATHON_CACHE_MAX_BYTES, HACKATHON_CACHE_TTL, WRITE_QUEUE_ENABLED, HACKATHON_PAGE_SIZE
+)
 from .database import (
-    save_user_profile, get_user_profile, get_all_users, delete_user_profile,
-    save_hackathon, get_hackathon, get_all_hackathons, delete_hackathon,
-    add_user_to_hackathon, remove_user_from_hackathon
+    save_user_profile, bulk_save_user_profiles, get_user_profile, get_all_users, iter_user_profiles, delete_user_profile,
+    bulk_save_hackathons,
+    save_hackathon, get_hackathon, get_all_hackathons, get_hackathon_summaries, delete_hackathon,
+    add_user_to_hackathon, remove_user_from_hackathon,
+    add_profile_listener, add_hackathon_listener, add_participant_listener, set_current_user, get_data_version
 )
+from .lru_cache import ExpiringLRUCache
+from .write_queue import get_write_queue
+from . import async_database
+
+class _ReadThroughCache:
+    """ExpiringLRUCache filled by reads and written through by committed changes
+
+    A read that started before a write may return the old row; fill drops it
+    so a stale value never lands after the write that replaced it.
+    """
+
+    def __init__(self, cache: ExpiringLRUCache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        return self.cache.get(key)
+
+    def begin_fill(self) -> int:
+        """Token to pass to fill after loading a missed key"""
+        return self._writes
+
+    def fill(self, key: Hashable, value: Optional[Dict[str, Any]], token: int):
+        """Cache a loaded value unless a write happened since begin_fill"""
+        with self._lock:
+            if value and token == self._writes:
+                self.cache.put(key, value)
 
-def load_data() -> Dict[str, Any]:
-    """Load user data from database"""
+    def write(self, key: Hashable, value: Optional[Dict[str, Any]] = None):
+        """Store a committed value, or drop the key when there is none"""
+        with self._lock:
+            self._writes += 1
+            if value:
+                self.cache.put(key, value)
+            else:
+                self.cache.pop(key)
+
+_profile_cache = _ReadThroughCache(ExpiringLRUCache(
+    PROFILE_CACHE_MAX_ENTRIES, ttl=PROFILE_CACHE_TTL, max_bytes=PROFILE_CACHE_MAX_BYTES
+))
+_hackathon_cache = _ReadThroughCache(ExpiringLRUCache(
+    HACKATHON_CACHE_MAX_ENTRIES, ttl=HACKATHON_CACHE_TTL, max_bytes=HACKATHON_CACHE_MAX_BYTES
+))
+
+# Every committed write (sync, async and bulk) reaches the caches through the
+# database change listeners: saves store the returned row, deletes, joins and
+# leaves drop the entry. Entries are keyed by (guild_id, id), so a guild only
+# ever reads its own rows.
+add_profile_listener(lambda guild_id, user_id, profile: _profile_cache.write((guild_id, user_id), profile))
+add_hackathon_listener(lambda guild_id, hackathon_id, hackathon: _hackathon_cache.write((guild_id, hackathon_id), hackathon))
+add_participant_listener(lambda guild_id, hackathon_id, _user_id, _joined: _hackathon_cache.write((guild_id, hackathon_id)))
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss, eviction and size counters of the profile and hackathon caches"""
+    return {"profiles": _profile_cache.cache.stats(), "hackathons": _hackathon_cache.cache.stats()}
+
+def clear_caches():
+    """Drop every cached profile and hackathon"""
+    _profile_cache.cache.clear()
+    _hackathon_cache.cache.clear()
+
+def load_data(guild_id: str) -> Dict[str, Any]:
+    """Load a guild's user data from database"""
     try:
-        users = get_all_users()
+        users = get_all_users(guild_id)
         # Convert list to dict format for backward compatibility
         user_dict = {}
         for user in users:
@@ -24,59 +93,150 @@ def load_data() -> Dict[str, Any]:
         print(f"Error loading data from database: {e}")
         return {}
 
-def save_data(data: Dict[str, Any]) -> None:
-    """Save user data to database"""
+def save_data(data: Dict[str, Any]) -> Dict[str, bool]:
+    """Save user data to database in one bulk write; returns success per key
+
+    Each profile names its own guild_id, so data may span guilds.
+    """
     try:
-        for user_id, user_data in data.items():
-            save_user_profile(user_data)
+        keys = list(data.keys())
+        results = bulk_save_user_profiles([data[key] for key in keys])
+        return dict(zip(keys, results))
     except Exception as e:
         print(f"Error saving data to database: {e}")
+        return {key: False for key in data}
 
-def load_hackathons() -> List[Dict[str, Any]]:
-    """Load hackathon data from database"""
+def load_hackathons(guild_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load a guild's hackathon data (every guild's when guild_id is None) from database"""
     try:
-        return get_all_hackathons()
+        return get_all_hackathons(guild_id)
     except Exception as e:
         print(f"Error loading hackathons from database: {e}")
         return []
 
-def save_hackathons(hackathons: List[Dict[str, Any]]) -> None:
-    """Save hackathon data to database"""
+def save_hackathons(hackathons: List[Dict[str, Any]]) -> List[bool]:
+    """Save hackathon data to database in one bulk write; returns success per hackathon"""
     try:
-        for hackathon in hackathons:
-            save_hackathon(hackathon)
+        return bulk_save_hackathons(hackathons)
     except Exception as e:
         print(f"Error saving hackathons to database: {e}")
+        return [False] * len(hackathons)
+
+def iter_users(guild_id: str, columns: Optional[Sequence[str]] = None) -> Iterator[Row]:
+    """Stream a guild's users as lightweight rows of the requested columns"""
+    return iter_user_profiles(columns, guild_id)
 
 # Additional helper functions for better database integration
-def get_user_by_id(user_id: str) -> Dict[str, Any]:
-    """Get a specific user by ID"""
-    return get_user_profile(user_id) or {}
+def get_user_by_id(guild_id: str, user_id: str) -> Dict[str, Any]:
+    """Get a user's profile in a guild, through the profile cache"""
+    profile = _profile_cache.get((guild_id, user_id))
+    if profile is None:
+        token = _profile_cache.begin_fill()
+        profile = get_user_profile(guild_id, user_id)
+        _profile_cache.fill((guild_id, user_id), profile, token)
+    return profile or {}
 
 def save_user(user_data: Dict[str, Any]) -> bool:
     """Save a single user"""
     return save_user_profile(user_data)
 
-def delete_user(user_id: str) -> bool:
-    """Delete a user by ID"""
-    return delete_user_profile(user_id)
+def delete_user(guild_id: str, user_id: str) -> bool:
+    """Delete a user's profile in a guild"""
+    return delete_user_profile(guild_id, user_id)
 
-def get_hackathon_by_id(hackathon_id: int) -> Dict[str, Any]:
-    """Get a specific hackathon by ID"""
-    return get_hackathon(hackathon_id) or {}
+def get_hackathon_by_id(guild_id: str, hackathon_id: int) -> Dict[str, Any]:
+    """Get a guild's hackathon by ID, through the hackathon cache"""
+    hackathon = _hackathon_cache.get((guild_id, hackathon_id))
+    if hackathon is None:
+        token = _hackathon_cache.begin_fill()
+        hackathon = get_hackathon(guild_id, hackathon_id)
+        _hackathon_cache.fill((guild_id, hackathon_id), hackathon, token)
+    return hackathon or {}
 
 def save_single_hackathon(hackathon_data: Dict[str, Any]) -> bool:
     """Save a single hackathon"""
     return save_hackathon(hackathon_data)
 
-def delete_hackathon_by_id(hackathon_id: int) -> bool:
-    """Delete a hackathon by ID"""
-    return delete_hackathon(hackathon_id)
+def delete_hackathon_by_id(guild_id: str, hackathon_id: int) -> bool:
+    """Delete a guild's hackathon by ID"""
+    return delete_hackathon(guild_id, hackathon_id)
 
-def join_hackathon(hackathon_id: int, user_id: str, username: str) -> bool:
+def join_hackathon(guild_id: str, hackathon_id: int, user_id: str, username: str) -> bool:
     """Add user to hackathon team"""
-    return add_user_to_hackathon(hackathon_id, user_id, username)
+    return add_user_to_hackathon(guild_id, hackathon_id, user_id, username)
 
-def leave_hackathon(hackathon_id: int, user_id: str) -> bool:
+def leave_hackathon(guild_id: str, hackathon_id: int, user_id: str) -> bool:
     """Remove user from hackathon team"""
-    return remove_user_from_hackathon(hackathon_id, user_id) 
\ No newline at end of file
+    return remove_user_from_hackathon(guild_id, hackathon_id, user_id) 
+
+# Async helpers for command handlers and modals, so database round trips
+# never block the gateway event loop
+async def get_user_by_id_async(guild_id: str, user_id: str) -> Dict[str, Any]:
+    """Get a user's profile in a guild, through the profile cache"""
+    profile = _profile_cache.get((guild_id, user_id))
+    if profile is None:
+        token = _profile_cache.begin_fill()
+        profile = await async_database.get_user_profile(guild_id, user_id)
+        _profile_cache.fill((guild_id, user_id), profile, token)
+    return profile or {}
+
+async def get_all_users_async(guild_id: str) -> List[Dict[str, Any]]:
+    """Get all user profiles of a guild"""
+    return await async_database.get_all_users(guild_id)
+
+async def stream_users_async(guild_id: str, columns: Optional[Sequence[str]] = None) -> AsyncIterator[Row]:
+    """Stream a guild's users as lightweight rows of the requested columns"""
+    async for row in async_database.stream_user_profiles(columns, guild_id):
+        yield row
+
+async def save_user_async(user_data: Dict[str, Any]) -> bool:
+    """Save a single user, group-committed with other queued writes"""
+    if WRITE_QUEUE_ENABLED:
+        return await get_write_queue().save_profile(user_data)
+    return await async_database.save_user_profile(user_data)
+
+async def delete_user_async(guild_id: str, user_id: str) -> bool:
+    """Delete a user's profile in a guild"""
+    return await async_database.delete_user_profile(guild_id, user_id)
+
+async def get_all_hackathons_async(guild_id: str) -> List[Dict[str, Any]]:
+    """Get all hackathons of a guild"""
+    return await async_database.get_all_hackathons(guild_id)
+
+async def get_hackathon_summaries_async(guild_id: str) -> List[Dict[str, Any]]:
+    """Get a guild's hackathons with participant counts"""
+    return await async_database.get_hackathon_summaries(guild_id)
+
+async def get_hackathon_summaries_page_async(guild_id: str, after_id: Optional[int] = None, before_id: Optional[int] = None,
+                                             limit: int = HACKATHON_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], bool]:
+    """One page of a guild's hackathons with participant counts, and whether more follow"""
+    return await async_database.get_hackathon_summaries_page(guild_id, after_id, before_id, limit)
+
+async def get_hackathon_by_id_async(guild_id: str, hackathon_id: int) -> Dict[str, Any]:
+    """Get a guild's hackathon by ID, through the hackathon cache"""
+    hackathon = _hackathon_cache.get((guild_id, hackathon_id))
+    if hackathon is None:
+        token = _hackathon_cache.begin_fill()
+        hackathon = await async_database.get_hackathon(guild_id, hackathon_id)
+        _hackathon_cache.fill((guild_id, hackathon_id), hackathon, token)
+    return hackathon or {}
+
+async def save_single_hackathon_async(hackathon_data: Dict[str, Any]) -> bool:
+    """Save a single hackathon"""
+    return await async_database.save_hackathon(hackathon_data)
+
+async def delete_hackathon_by_id_async(guild_id: str, hackathon_id: int) -> bool:
+    """Delete a guild's hackathon by ID"""
+    return await async_database.delete_hackathon(guild_id, hackathon_id)
+
+async def join_hackathon_async(guild_id: str, hackathon_id: int, user_id: str, username: str) -> bool:
+    """Add user to hackathon team, group-committed with other queued writes"""
+    if WRITE_QUEUE_ENABLED:
+        return await get_write_queue().join(guild_id, hackathon_id, user_id, username)
+    return await async_database.add_user_to_hackathon(guild_id, hackathon_id, user_id, username)
+
+async def leave_hackathon_async(guild_id: str, hackathon_id: int, user_id: str) -> bool:
+    """Remove user from hackathon team, group-committed with other queued writes"""
+    if WRITE_QUEUE_ENABLED:
+        return await get_write_queue().leave(guild_id, hackathon_id, user_id)
+    return await async_database.remove_user_from_hackathon(guild_id, hackathon_id, user_id)
@@ -4,13 +4,26 @@ Database utilities for the Hackathon Team Finder Discord Bot
 
 import os
 import logging
-from typing import Dict, Any, List, Optional
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, DateTime, Text, JSON
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Callable, Iterator, Sequence, Tuple
+from sqlalchemy import (
+    create_engine, event, insert, select, delete, exists, func, cast, text, and_, Column, String, Integer, Boolean, DateTime,
+    Text, JSON, ForeignKey, Index, MetaData, Table
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from datetime import datetime
 import json
+from config import (
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, BULK_WRITE_BATCH_SIZE, DB_STREAM_BATCH_SIZE,
+    HACKATHON_PAGE_SIZE, DB_AUTO_MIGRATE, READ_YOUR_WRITES_WINDOW
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,9 +33,17 @@ logger = logging.getLogger(__name__)
 Base = declarative_base()
 
 class UserProfile(Base):
-    """User profile model"""
+    """User profile model, one per user per guild"""
     __tablename__ = 'user_profiles'
+    # Every profile read is scoped to one guild, so the filter columns are indexed behind guild_id
+    __table_args__ = (
+        Index('ix_user_profiles_guild_looking_for_team', 'guild_id', 'looking_for_team'),
+        Index('ix_user_profiles_guild_timezone', 'guild_id', 'timezone'),
+        Index('ix_user_profiles_guild_experience', 'guild_id', 'experience'),
+        Index('ix_user_profiles_guild_updated_at', 'guild_id', 'updated_at'),
+    )
     
+    guild_id = Column(String(50), primary_key=True)
     user_id = Column(String(50), primary_key=True)
     username = Column(String(100), nullable=False)
     roles = Column(JSON, default=list)
@@ -33,45 +54,218 @@ class UserProfile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# GIN indexes over the JSON list columns let Postgres answer skill and role
+# pre-filters (?| and ? on the jsonb cast) without scanning every profile; the
+# planner combines them with the guild_id primary key prefix
+POSTGRES_INDEXES = [
+    Index('ix_user_profiles_tech_skills_gin', cast(UserProfile.tech_skills, JSONB), postgresql_using='gin')
+        .ddl_if(dialect='postgresql'),
+    Index('ix_user_profiles_roles_gin', cast(UserProfile.roles, JSONB), postgresql_using='gin')
+        .ddl_if(dialect='postgresql'),
+]
+
+# SQLite has no GIN; a normalized (guild_id, skill, user_id) table kept in sync
+# by triggers (created by the migrations) answers the same skill-overlap filter
+# from an index
+sqlite_metadata = MetaData()
+user_skills = Table(
+    'user_skills', sqlite_metadata,
+    Column('guild_id', String(50), primary_key=True),
+    Column('skill', String(100), primary_key=True),
+    Column('user_id', String(50), primary_key=True),
+    Index('ix_user_skills_guild_user', 'guild_id', 'user_id')
+)
+
 class Hackathon(Base):
-    """Hackathon model"""
+    """Hackathon model; IDs are unique across guilds"""
     __tablename__ = 'hackathons'
+    __table_args__ = (
+        Index('ix_hackathons_guild_id', 'guild_id', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
+    guild_id = Column(String(50), nullable=False)
     name = Column(String(200), nullable=False)
     description = Column(Text)
     date = Column(String(100))
+    # Legacy participant list, moved into hackathon_participants at startup
     teams = Column(JSON, default=list)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class HackathonParticipant(Base):
+    """Hackathon participant model, one row per user per hackathon"""
+    __tablename__ = 'hackathon_participants'
+    __table_args__ = (
+        Index('ix_hackathon_participants_guild_user', 'guild_id', 'user_id'),
+        Index('ix_hackathon_participants_joined', 'hackathon_id', 'joined_at'),
+    )
+    
+    hackathon_id = Column(Integer, ForeignKey('hackathons.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(String(50), primary_key=True)
+    # The hackathon's guild, copied here so participants join to that guild's profiles
+    guild_id = Column(String(50), nullable=False)
+    username = Column(String(100))
+    joined_at = Column(DateTime, default=datetime.utcnow)
+
+def _normalize_url(database_url: str) -> str:
+    """Heroku-style URLs use a scheme SQLAlchemy no longer accepts"""
+    if database_url.startswith("postgres://"):
+        return "postgresql://" + database_url[len("postgres://"):]
+    return database_url
+
+def get_database_url() -> str:
+    """Database URL from the environment, falling back to local SQLite"""
+    database_url = os.getenv('DATABASE_URL')
+    
+    if not database_url:
+        # Fallback to local SQLite for development
+        logger.warning("DATABASE_URL not found, using SQLite for development")
+        database_url = "sqlite:///./bot_data.db"
+    
+    return _normalize_url(database_url)
+
+def get_replica_url() -> Optional[str]:
+    """Read replica URL from the environment, or None to read from the primary"""
+    replica_url = os.getenv('DATABASE_REPLICA_URL')
+    return _normalize_url(replica_url) if replica_url else None
+
+# User the running command or interaction acts for; its reads stick to the
+# primary for a short while after it writes
+_current_user: ContextVar[Optional[str]] = ContextVar('current_user', default=None)
+
+def set_current_user(user_id: Optional[str]):
+    """Record which user the current task acts for, for read-your-writes routing"""
+    _current_user.set(user_id)
+
+class ReadYourWrites:
+    """Users who wrote in the last window seconds; a replica may not have their writes yet"""
+    
+    def __init__(self, window: float = READ_YOUR_WRITES_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._written: Dict[str, float] = {}
+    
+    def record(self, *user_ids: Optional[str]):
+        """Note a committed write by (or about) these users and the current user"""
+        now = time.monotonic()
+        with self._lock:
+            for user_id in (*user_ids, _current_user.get()):
+                if user_id:
+                    self._written[user_id] = now + self.window
+            if len(self._written) > 10000:
+                self._written = {user_id: until for user_id, until in self._written.items() if until > now}
+    
+    def is_sticky(self, *user_ids: Optional[str]) -> bool:
+        """Whether a read by the current user about these users must see the primary"""
+        now = time.monotonic()
+        return any(
+            self._written.get(user_id, 0.0) > now
+            for user_id in (*user_ids, _current_user.get()) if user_id
+        )
+
+read_your_writes = ReadYourWrites()
+
+class DataVersions:
+    """Counters that rise with every committed write to a kind of data in a guild
+
+    Results derived from the data (rendered embeds) can be cached under the
+    versions they were built from instead of being invalidated by hand; a
+    write in one guild leaves every other guild's versions alone.
+    """
+    
+    KINDS = ('profiles', 'hackathons')
+    
+    def __init__(self, window: float = READ_YOUR_WRITES_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._bumped_at: Dict[Tuple[str, str], float] = {}
+    
+    def bump(self, kind: str, guild_id: str):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown data kind: {kind}")
+        with self._lock:
+            self._versions[(kind, guild_id)] = self._versions.get((kind, guild_id), 0) + 1
+            self._bumped_at[(kind, guild_id)] = time.monotonic()
+    
+    def get(self, guild_id: str, *kinds: str) -> Optional[Tuple[int, ...]]:
+        """Current versions of these kinds in a guild; None while a replica may still serve older data"""
+        with self._lock:
+            if os.getenv('DATABASE_REPLICA_URL'):
+                settled_before = time.monotonic() - self.window
+                if any(self._bumped_at.get((kind, guild_id), float('-inf')) > settled_before for kind in kinds):
+                    return None
+            return tuple(self._versions.get((kind, guild_id), 0) for kind in kinds)
+
+data_versions = DataVersions()
+
+def get_data_version(guild_id: str, *kinds: str) -> Optional[Tuple[int, ...]]:
+    """Versions of a guild's 'profiles' and/or 'hackathons' data, or None if reads may not reflect them yet"""
+    return data_versions.get(guild_id, *kinds)
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """Connection pool settings for create_engine / create_async_engine"""
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': True
+    }
+
+def _enable_sqlite_savepoints(engine):
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest inside the transaction
+
+    pysqlite only opens a transaction before DML, so a SAVEPOINT issued first
+    would start (and RELEASE would commit) a transaction of its own.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
 class DatabaseManager:
     """Database manager for handling PostgreSQL operations"""
     
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.replica_engine = None
+        self.ReplicaSessionLocal = None
         self._setup_database()
     
     def _setup_database(self):
         """Set up database connection"""
         try:
             # Get database URL from environment variable
-            database_url = os.getenv('DATABASE_URL')
-            
-            if not database_url:
-                # Fallback to local SQLite for development
-                logger.warning("DATABASE_URL not found, using SQLite for development")
-                database_url = "sqlite:///./bot_data.db"
+            database_url = get_database_url()
             
             # Create engine
-            self.engine = create_engine(database_url)
+            self.engine = create_engine(database_url, **engine_options(database_url))
+            if self.engine.dialect.name == 'sqlite':
+                _enable_sqlite_savepoints(self.engine)
             
             # Create session factory
             self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
             
-            # Create tables
-            Base.metadata.create_all(bind=self.engine)
+            # Reads can go to a replica; its schema follows the primary's
+            replica_url = get_replica_url()
+            if replica_url:
+                self.replica_engine = create_engine(replica_url, **engine_options(replica_url))
+                self.ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.replica_engine)
+                logger.info("Routing reads to the database replica")
+            
+            # The schema belongs to the migrations; the local SQLite fallback
+            # upgrades itself, other databases must already be at head
+            from .schema import ensure_schema
+            ensure_schema(self.engine, auto_upgrade=DB_AUTO_MIGRATE or self.engine.dialect.name == 'sqlite')
+            migrate_legacy_teams(self.SessionLocal)
             
             logger.info("Database connection established successfully")
             
@@ -83,42 +277,455 @@ class DatabaseManager:
         """Get database session"""
         return self.SessionLocal()
     
+    def get_read_session(self, sticky: bool = False) -> Session:
+        """Session for reads: the replica when there is one, unless the read is sticky"""
+        if self.ReplicaSessionLocal is None or sticky:
+            return self.SessionLocal()
+        return self.ReplicaSessionLocal()
+    
     def close_session(self, session: Session):
         """Close database session"""
         session.close()
 
-# Global database manager instance
-db_manager = DatabaseManager()
+def _parse_joined_at(value: Any) -> datetime:
+    """joined_at from a legacy teams entry, defaulting to now when missing or malformed"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+def migrate_legacy_teams(session_factory) -> int:
+    """Move participants out of the legacy Hackathon.teams JSON column; safe to re-run"""
+    session = session_factory()
+    try:
+        migrated = 0
+        for hackathon in session.scalars(select(Hackathon)):
+            if not hackathon.teams:
+                continue
+            existing = set(session.scalars(
+                select(HackathonParticipant.user_id).where(HackathonParticipant.hackathon_id == hackathon.id)
+            ))
+            for member in hackathon.teams:
+                user_id = member.get('user_id')
+                if not user_id or user_id in existing:
+                    continue
+                existing.add(user_id)
+                session.add(HackathonParticipant(
+                    hackathon_id=hackathon.id,
+                    user_id=user_id,
+                    guild_id=hackathon.guild_id,
+                    username=member.get('username'),
+                    joined_at=_parse_joined_at(member.get('joined_at'))
+                ))
+                migrated += 1
+            hackathon.teams = []
+        session.commit()
+        if migrated:
+            logger.info(f"Migrated {migrated} hackathon participants from the legacy teams column")
+        return migrated
+        
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Error migrating legacy hackathon teams: {e}")
+        raise
+    finally:
+        session.close()
+
+# Global database manager instance, created on first use so the migration
+# environment can import the models without connecting
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
+
+def get_db_manager() -> DatabaseManager:
+    """Shared database manager; the first call connects and checks the schema"""
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
+    return _db_manager
 
 def get_db_session() -> Session:
     """Get a database session"""
-    return db_manager.get_session()
+    return get_db_manager().get_session()
+
+def get_read_session(*user_ids: Optional[str]) -> Session:
+    """Session for a read about these users, on the primary if any of them (or the current user) just wrote"""
+    return get_db_manager().get_read_session(read_your_writes.is_sticky(*user_ids))
+
+def get_snapshot_session(primary: bool) -> Session:
+    """Session for a read: the primary when primary is set, otherwise routed like get_read_session
+
+    In-memory indexes load a snapshot and then follow the change listeners,
+    which fire on commit to the primary. A snapshot from a lagging replica
+    could miss a write whose listener call the index has already had, and the
+    index would never learn of it; so index loads read the primary.
+    """
+    return get_db_session() if primary else get_read_session()
 
 def close_db_session(session: Session):
     """Close a database session"""
-    db_manager.close_session(session)
+    get_db_manager().close_session(session)
+
+def _column_values(model, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the keys that are columns of a model, parsing ISO timestamps for DateTime columns"""
+    columns = model.__table__.columns
+    values = {}
+    for key, value in data.items():
+        if key not in columns:
+            continue
+        if isinstance(value, str) and isinstance(columns[key].type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[key] = value
+    return values
+
+def _user_to_dict(user: UserProfile) -> Dict[str, Any]:
+    """Convert a UserProfile row to the profile dict used across the bot"""
+    return {
+        'guild_id': user.guild_id,
+        'user_id': user.user_id,
+        'username': user.username,
+        'roles': user.roles or [],
+        'tech_skills': user.tech_skills or [],
+        'experience': user.experience,
+        'timezone': user.timezone,
+        'looking_for_team': user.looking_for_team,
+        'created_at': user.created_at.isoformat() if user.created_at else None,
+        'updated_at': user.updated_at.isoformat() if user.updated_at else None
+    }
+
+def _hackathon_to_dict(hackathon: Hackathon, teams: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Convert a Hackathon row and its participant dicts to the hackathon dict used across the bot"""
+    return {
+        'id': hackathon.id,
+        'guild_id': hackathon.guild_id,
+        'name': hackathon.name,
+        'description': hackathon.description,
+        'date': hackathon.date,
+        'teams': teams if teams is not None else [],
+        'created_at': hackathon.created_at.isoformat() if hackathon.created_at else None,
+        'updated_at': hackathon.updated_at.isoformat() if hackathon.updated_at else None
+    }
+
+# Profile fields the matcher and match embeds use; timestamps are left out
+PROFILE_MATCH_COLUMNS = ('guild_id', 'user_id', 'username', 'roles', 'tech_skills', 'experience', 'timezone', 'looking_for_team')
+
+def row_to_profile(row: Row) -> Dict[str, Any]:
+    """Profile dict from a streamed row, with the same empty-list defaults as _user_to_dict"""
+    profile = row._asdict()
+    for key in ('roles', 'tech_skills'):
+        if key in profile and profile[key] is None:
+            profile[key] = []
+    return profile
+
+def _projection(model, columns: Optional[Sequence[str]], guild_id: Optional[str] = None):
+    """SELECT of some columns of a model (all of them when columns is None), in primary key order
+
+    With a guild_id only that guild's rows are selected.
+    """
+    table = model.__table__
+    selected = [table.c[name] for name in columns] if columns else list(table.c)
+    statement = select(*selected).order_by(*table.primary_key.columns)
+    if guild_id is not None:
+        statement = statement.where(table.c.guild_id == guild_id)
+    return statement
+
+def _hackathon_summary(hackathon: Hackathon, participant_count: int) -> Dict[str, Any]:
+    """Hackathon dict with a participant count instead of the participant list"""
+    summary = _hackathon_to_dict(hackathon)
+    del summary['teams']
+    summary['participant_count'] = participant_count
+    return summary
+
+def _participant_to_dict(participant: HackathonParticipant) -> Dict[str, Any]:
+    """Convert a HackathonParticipant row to a 'teams' entry"""
+    return {
+        'user_id': participant.user_id,
+        'username': participant.username,
+        'joined_at': participant.joined_at.isoformat() if participant.joined_at else None
+    }
+
+# Statements shared with utils.async_database
+def _participants_statement(hackathon_ids: List[int]):
+    """Participants of some hackathons in join order"""
+    return (
+        select(HackathonParticipant)
+        .where(HackathonParticipant.hackathon_id.in_(hackathon_ids))
+        .order_by(HackathonParticipant.hackathon_id, HackathonParticipant.joined_at, HackathonParticipant.user_id)
+    )
+
+def _summaries_statement(guild_id: str):
+    """Every hackathon of a guild with its participant count, from one aggregate query"""
+    return (
+        select(Hackathon, func.count(HackathonParticipant.user_id))
+        .outerjoin(HackathonParticipant, HackathonParticipant.hackathon_id == Hackathon.id)
+        .where(Hackathon.guild_id == guild_id)
+        .group_by(Hackathon.id)
+        .order_by(Hackathon.id)
+    )
+
+def _summaries_page_statement(guild_id: str, after_id: Optional[int], before_id: Optional[int], limit: int):
+    """One keyset page of summaries plus one extra row that says whether more follow
+
+    before_id pages backwards, so its rows come newest first.
+    """
+    statement = _summaries_statement(guild_id)
+    if before_id is not None:
+        statement = statement.where(Hackathon.id < before_id).order_by(None).order_by(Hackathon.id.desc())
+    elif after_id is not None:
+        statement = statement.where(Hackathon.id > after_id)
+    return statement.limit(limit + 1)
+
+def _summaries_page(rows, limit: int, backwards: bool) -> Tuple[List[Dict[str, Any]], bool]:
+    """Summaries in ID order and whether another page lies in the fetched direction"""
+    summaries = [_hackathon_summary(hackathon, count) for hackathon, count in rows]
+    more = len(summaries) > limit
+    summaries = summaries[:limit]
+    if backwards:
+        summaries.reverse()
+    return summaries, more
+
+def _candidate_statement(dialect_name: str, guild_id: str, hackathon_id: Optional[int] = None,
+                         required_role: Optional[str] = None, skills: Sequence[str] = (), min_skill_overlap: int = 0,
+                         looking_for_team: bool = True, exclude_user_id: Optional[str] = None):
+    """SELECT of a guild's candidate user IDs with the match pre-filters applied in the database"""
+    if dialect_name not in ('postgresql', 'sqlite'):
+        raise ValueError(f"Candidate pre-filtering is not supported on {dialect_name}")
+    statement = select(UserProfile.user_id).where(UserProfile.guild_id == guild_id)
+    if hackathon_id is not None:
+        statement = statement.join(HackathonParticipant, and_(
+            HackathonParticipant.guild_id == UserProfile.guild_id,
+            HackathonParticipant.user_id == UserProfile.user_id
+        )).where(HackathonParticipant.hackathon_id == hackathon_id)
+    if looking_for_team:
+        # NULL counts as looking, like the column default
+        statement = statement.where(UserProfile.looking_for_team.is_not(False))
+    if exclude_user_id:
+        statement = statement.where(UserProfile.user_id != exclude_user_id)
+    
+    if required_role:
+        if dialect_name == 'postgresql':
+            statement = statement.where(cast(UserProfile.roles, JSONB).has_key(required_role))
+        else:
+            roles = func.json_each(UserProfile.roles).table_valued('value')
+            statement = statement.where(exists(select(1).select_from(roles).where(roles.c.value == required_role)))
+    
+    skills = sorted(set(skills))
+    if min_skill_overlap > 0 and skills:
+        needed = min(min_skill_overlap, len(skills))
+        if dialect_name == 'postgresql':
+            profile_skills = cast(UserProfile.tech_skills, JSONB)
+            statement = statement.where(profile_skills.has_any(postgresql.array(skills, type_=Text)))
+            if needed > 1:
+                elements = func.jsonb_array_elements_text(profile_skills).table_valued('value')
+                shared = select(func.count()).select_from(elements).where(elements.c.value.in_(skills)).scalar_subquery()
+                statement = statement.where(shared >= needed)
+        else:
+            statement = statement.where(UserProfile.user_id.in_(
+                select(user_skills.c.user_id)
+                .where(user_skills.c.guild_id == guild_id, user_skills.c.skill.in_(skills))
+                .group_by(user_skills.c.user_id)
+                .having(func.count() >= needed)
+            ))
+    return statement
+
+def _leave_statement(guild_id: str, hackathon_id: int, user_id: str):
+    return delete(HackathonParticipant).where(
+        HackathonParticipant.guild_id == guild_id,
+        HackathonParticipant.hackathon_id == hackathon_id,
+        HackathonParticipant.user_id == user_id
+    )
+
+def _group_participants(hackathon_ids: List[int], participants) -> Dict[int, List[Dict[str, Any]]]:
+    """Participant dicts per hackathon ID"""
+    grouped = {hackathon_id: [] for hackathon_id in hackathon_ids}
+    for participant in participants:
+        grouped[participant.hackathon_id].append(_participant_to_dict(participant))
+    return grouped
+
+def _load_participants(session: Session, hackathon_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Participant dicts per hackathon ID"""
+    return _group_participants(hackathon_ids, session.scalars(_participants_statement(hackathon_ids)))
+
+def _team_values(guild_id: str, hackathon_id: int, teams: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Participant rows for a 'teams' list given to save_hackathon"""
+    return [
+        {
+            'hackathon_id': hackathon_id,
+            'user_id': member['user_id'],
+            'guild_id': guild_id,
+            'username': member.get('username'),
+            'joined_at': _parse_joined_at(member.get('joined_at'))
+        }
+        for member in {member['user_id']: member for member in teams if member.get('user_id')}.values()
+    ]
+
+# Native upserts: INSERT ... ON CONFLICT DO UPDATE ... RETURNING, one round trip per statement
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def _upsert_statement(dialect_name: str, model, keys, index_elements: List[str], owner_columns: Sequence[str] = ()):
+    """Upsert of the given columns returning the stored row, or None if the dialect has no upsert
+
+    A conflicting row whose owner_columns differ from the new values is left
+    unchanged and returns nothing, so a write cannot move a row between owners.
+    """
+    dialect_insert = _DIALECT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    statement = dialect_insert(model.__table__)
+    updates = {key: statement.excluded[key] for key in keys if key not in index_elements and key not in owner_columns}
+    updates['updated_at'] = datetime.utcnow()
+    same_owner = and_(*(model.__table__.c[column] == statement.excluded[column] for column in owner_columns)) if owner_columns else None
+    return statement.on_conflict_do_update(index_elements=index_elements, set_=updates, where=same_owner).returning(
+        *model.__table__.columns, sort_by_parameter_order=True
+    )
+
+def _insert_statement(model):
+    """Plain INSERT returning the stored rows in parameter order"""
+    return insert(model.__table__).returning(*model.__table__.columns, sort_by_parameter_order=True)
+
+def _execute_by_keys(session: Session, statement_for_keys: Callable[[tuple], Any], rows: List[Dict[str, Any]],
+                     match_columns: Sequence[str] = ()) -> List[Any]:
+    """One executemany per distinct key set, returning the RETURNING rows in input order
+
+    Statements that may skip rows (a guarded upsert) return fewer rows than
+    they were given; groups that have every match_column are paired with
+    their returned rows by those columns instead of by position, and rows
+    nothing came back for are None.
+    """
+    returned: List[Any] = [None] * len(rows)
+    groups: Dict[tuple, List[int]] = {}
+    for position, row in enumerate(rows):
+        groups.setdefault(tuple(sorted(row)), []).append(position)
+    for keys, positions in groups.items():
+        result = session.execute(statement_for_keys(keys), [rows[position] for position in positions])
+        if match_columns and all(column in keys for column in match_columns):
+            stored_by_key = {tuple(getattr(stored, column) for column in match_columns): stored for stored in result.all()}
+            for position in positions:
+                returned[position] = stored_by_key.get(tuple(rows[position][column] for column in match_columns))
+        else:
+            for position, stored in zip(positions, result.all()):
+                returned[position] = stored
+    return returned
+
+def _write_in_batches(session: Session, rows: List[Dict[str, Any]], write: Callable[[Session, List[Dict[str, Any]]], List[Any]], label: str) -> List[Any]:
+    """Run write over batches inside savepoints; a failing batch is retried row by row
+
+    Returns write's result per row, or None for rows that failed.
+    """
+    results: List[Any] = [None] * len(rows)
+    for start in range(0, len(rows), BULK_WRITE_BATCH_SIZE):
+        batch = rows[start:start + BULK_WRITE_BATCH_SIZE]
+        try:
+            with session.begin_nested():
+                results[start:start + len(batch)] = write(session, batch)
+            continue
+        except SQLAlchemyError as e:
+            logger.warning(f"Bulk {label} batch failed, retrying row by row: {e}")
+        for offset, row in enumerate(batch):
+            try:
+                with session.begin_nested():
+                    results[start + offset] = write(session, [row])[0]
+            except SQLAlchemyError as e:
+                logger.error(f"Error in bulk {label} write for row {start + offset}: {e}")
+    return results
+
+# Change listeners let in-process indexes and caches follow profile writes.
+# Each callback receives (guild_id, user_id, profile) after commit; profile is None on delete.
+_profile_listeners: List[Callable[[str, str, Optional[Dict[str, Any]]], None]] = []
+
+def add_profile_listener(callback: Callable[[str, str, Optional[Dict[str, Any]]], None]):
+    """Register a callback for committed profile saves and deletes"""
+    if callback not in _profile_listeners:
+        _profile_listeners.append(callback)
+
+def remove_profile_listener(callback: Callable[[str, str, Optional[Dict[str, Any]]], None]):
+    """Unregister a profile change callback"""
+    if callback in _profile_listeners:
+        _profile_listeners.remove(callback)
+
+def _notify_profile_listeners(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    """Tell listeners about a committed profile change"""
+    read_your_writes.record(user_id)
+    for callback in list(_profile_listeners):
+        try:
+            callback(guild_id, user_id, profile)
+        except Exception as e:
+            logger.error(f"Profile listener failed for user {user_id} in guild {guild_id}: {e}")
+    # Bumped last, so whatever is cached under the new version already includes this write
+    data_versions.bump('profiles', guild_id)
+
+# Hackathon listeners receive (guild_id, hackathon_id, hackathon) after commit; hackathon is None on delete
+_hackathon_listeners: List[Callable[[str, int, Optional[Dict[str, Any]]], None]] = []
+
+def add_hackathon_listener(callback: Callable[[str, int, Optional[Dict[str, Any]]], None]):
+    """Register a callback for committed hackathon and participant changes"""
+    if callback not in _hackathon_listeners:
+        _hackathon_listeners.append(callback)
+
+def remove_hackathon_listener(callback: Callable[[str, int, Optional[Dict[str, Any]]], None]):
+    """Unregister a hackathon change callback"""
+    if callback in _hackathon_listeners:
+        _hackathon_listeners.remove(callback)
+
+def _notify_hackathon_listeners(guild_id: str, hackathon_id: int, hackathon: Optional[Dict[str, Any]]):
+    """Tell listeners about a committed hackathon change"""
+    read_your_writes.record()
+    for callback in list(_hackathon_listeners):
+        try:
+            callback(guild_id, hackathon_id, hackathon)
+        except Exception as e:
+            logger.error(f"Hackathon listener failed for hackathon {hackathon_id}: {e}")
+    # Bumped last, so whatever is cached under the new version already includes this write
+    data_versions.bump('hackathons', guild_id)
+
+# Participant listeners receive (guild_id, hackathon_id, user_id, joined) after a join or leave commits.
+# Hackathon saves and deletes are reported to hackathon listeners instead.
+_participant_listeners: List[Callable[[str, int, str, bool], None]] = []
+
+def add_participant_listener(callback: Callable[[str, int, str, bool], None]):
+    """Register a callback for committed hackathon joins and leaves"""
+    if callback not in _participant_listeners:
+        _participant_listeners.append(callback)
+
+def remove_participant_listener(callback: Callable[[str, int, str, bool], None]):
+    """Unregister a participant change callback"""
+    if callback in _participant_listeners:
+        _participant_listeners.remove(callback)
+
+def _notify_participant_listeners(guild_id: str, hackathon_id: int, user_id: str, joined: bool):
+    """Tell listeners about a committed join or leave"""
+    read_your_writes.record(user_id)
+    for callback in list(_participant_listeners):
+        try:
+            callback(guild_id, hackathon_id, user_id, joined)
+        except Exception as e:
+            logger.error(f"Participant listener failed for hackathon {hackathon_id}: {e}")
+    # Bumped last, so whatever is cached under the new version already includes this write
+    data_versions.bump('hackathons', guild_id)
 
 # User profile operations
 def save_user_profile(user_data: Dict[str, Any]) -> bool:
-    """Save or update user profile"""
+    """Save or update a user's profile in their guild in one upsert statement"""
     session = get_db_session()
     try:
-        # Check if user exists
-        existing_user = session.query(UserProfile).filter(UserProfile.user_id == user_data['user_id']).first()
+        values = _column_values(UserProfile, user_data)
+        statement = _upsert_statement(session.get_bind().dialect.name, UserProfile, values, ['guild_id', 'user_id'])
         
-        if existing_user:
-            # Update existing user
-            for key, value in user_data.items():
-                if hasattr(existing_user, key):
-                    setattr(existing_user, key, value)
-            existing_user.updated_at = datetime.utcnow()
+        if statement is not None:
+            saved_profile = _user_to_dict(session.execute(statement.values(values)).one())
         else:
-            # Create new user
-            new_user = UserProfile(**user_data)
-            session.add(new_user)
-        
+            # No native upsert on this database: let the ORM select, then insert or update
+            user = session.merge(UserProfile(**values))
+            user.updated_at = datetime.utcnow()
+            session.flush()
+            saved_profile = _user_to_dict(user)
         session.commit()
-        logger.info(f"User profile saved/updated for user {user_data['user_id']}")
+        logger.info(f"User profile saved/updated for user {user_data['user_id']} in guild {user_data['guild_id']}")
+        _notify_profile_listeners(user_data['guild_id'], user_data['user_id'], saved_profile)
         return True
         
     except SQLAlchemyError as e:
@@ -128,23 +735,62 @@ def save_user_profile(user_data: Dict[str, Any]) -> bool:
     finally:
         close_db_session(session)
 
-def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
-    """Get user profile by user ID"""
+def bulk_save_user_profiles(profiles: List[Dict[str, Any]]) -> List[bool]:
+    """Upsert many profiles in batched statements inside one transaction
+
+    Returns per-profile success. A failing batch is retried row by row so one
+    bad profile does not fail the others; a user repeated within a guild keeps
+    the last one.
+    """
+    results = [False] * len(profiles)
+    latest: Dict[Tuple[str, str], int] = {}
+    for position, profile in enumerate(profiles):
+        if profile.get('guild_id') and profile.get('user_id'):
+            latest[(profile['guild_id'], profile['user_id'])] = position
+    positions = sorted(latest.values())
+    rows = [_column_values(UserProfile, profiles[position]) for position in positions]
+    
     session = get_db_session()
     try:
-        user = session.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        dialect_name = session.get_bind().dialect.name
+        if dialect_name not in _DIALECT_INSERTS:
+            # No native upsert on this database: save one by one
+            session.close()
+            return [
+                save_user_profile(profile) if profile.get('guild_id') and profile.get('user_id') else False
+                for profile in profiles
+            ]
+        
+        def write(session: Session, batch: List[Dict[str, Any]]) -> List[Any]:
+            return _execute_by_keys(
+                session, lambda keys: _upsert_statement(dialect_name, UserProfile, keys, ['guild_id', 'user_id']), batch
+            )
+        
+        stored = _write_in_batches(session, rows, write, "profile")
+        saved_profiles = {(row.guild_id, row.user_id): _user_to_dict(row) for row in stored if row is not None}
+        session.commit()
+        
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Error bulk saving user profiles: {e}")
+        return results
+    finally:
+        close_db_session(session)
+    
+    for position, profile in enumerate(profiles):
+        results[position] = (profile.get('guild_id'), profile.get('user_id')) in saved_profiles
+    logger.info(f"Bulk saved {len(saved_profiles)} of {len(latest)} user profiles")
+    for (guild_id, user_id), saved_profile in saved_profiles.items():
+        _notify_profile_listeners(guild_id, user_id, saved_profile)
+    return results
+
+def get_user_profile(guild_id: str, user_id: str, primary: bool = False) -> Optional[Dict[str, Any]]:
+    """Get a user's profile in a guild; primary=True reads the primary even with a replica"""
+    session = get_db_session() if primary else get_read_session(user_id)
+    try:
+        user = session.get(UserProfile, (guild_id, user_id))
         if user:
-            return {
-                'user_id': user.user_id,
-                'username': user.username,
-                'roles': user.roles or [],
-                'tech_skills': user.tech_skills or [],
-                'experience': user.experience,
-                'timezone': user.timezone,
-                'looking_for_team': user.looking_for_team,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'updated_at': user.updated_at.isoformat() if user.updated_at else None
-            }
+            return _user_to_dict(user)
         return None
         
     except SQLAlchemyError as e:
@@ -153,25 +799,13 @@ def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
     finally:
         close_db_session(session)
 
-def get_all_users() -> List[Dict[str, Any]]:
-    """Get all user profiles"""
-    session = get_db_session()
+def get_all_users(guild_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get all user profiles of a guild, or of every guild when guild_id is None"""
+    session = get_read_session()
     try:
-        users = session.query(UserProfile).all()
-        return [
-            {
-                'user_id': user.user_id,
-                'username': user.username,
-                'roles': user.roles or [],
-                'tech_skills': user.tech_skills or [],
-                'experience': user.experience,
-                'timezone': user.timezone,
-                'looking_for_team': user.looking_for_team,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'updated_at': user.updated_at.isoformat() if user.updated_at else None
-            }
-            for user in users
-        ]
+        # Plain rows: no ORM instances or identity map for a whole-table read
+        users = session.execute(_projection(UserProfile, None, guild_id))
+        return [_user_to_dict(user) for user in users]
         
     except SQLAlchemyError as e:
         logger.error(f"Error getting all users: {e}")
@@ -179,15 +813,56 @@ def get_all_users() -> List[Dict[str, Any]]:
     finally:
         close_db_session(session)
 
-def delete_user_profile(user_id: str) -> bool:
-    """Delete user profile"""
+def get_candidate_ids(guild_id: str, hackathon_id: Optional[int] = None, required_role: Optional[str] = None,
+                      skills: Sequence[str] = (), min_skill_overlap: int = 0, looking_for_team: bool = True,
+                      exclude_user_id: Optional[str] = None) -> frozenset:
+    """User IDs of a guild passing the match pre-filters, evaluated in the database"""
+    session = get_read_session(exclude_user_id)
+    try:
+        statement = _candidate_statement(
+            session.get_bind().dialect.name, guild_id, hackathon_id, required_role, skills, min_skill_overlap,
+            looking_for_team, exclude_user_id
+        )
+        return frozenset(session.scalars(statement))
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error getting match candidates: {e}")
+        return frozenset()
+    finally:
+        close_db_session(session)
+
+def iter_user_profiles(columns: Optional[Sequence[str]] = None, guild_id: Optional[str] = None,
+                       batch_size: int = DB_STREAM_BATCH_SIZE, primary: bool = False) -> Iterator[Row]:
+    """Stream user profiles as named tuples of the requested columns, in (guild ID, user ID) order
+
+    Only one guild's profiles when guild_id is given. Rows are fetched
+    batch_size at a time (a server-side cursor on Postgres), so scanning the
+    whole table takes constant memory. Timestamps stay datetimes and empty
+    lists may be None; use row_to_profile for a profile dict. A failure part
+    way through is raised rather than ending the stream early, so a caller
+    never takes a partial scan for the whole guild. primary=True reads the
+    primary even with a replica (see get_snapshot_session).
+    """
+    session = get_snapshot_session(primary)
+    try:
+        yield from session.execute(_projection(UserProfile, columns, guild_id).execution_options(yield_per=batch_size))
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error streaming user profiles: {e}")
+        raise
+    finally:
+        close_db_session(session)
+
+def delete_user_profile(guild_id: str, user_id: str) -> bool:
+    """Delete a user's profile in a guild"""
     session = get_db_session()
     try:
-        user = session.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        user = session.get(UserProfile, (guild_id, user_id))
         if user:
             session.delete(user)
             session.commit()
-            logger.info(f"User profile deleted for user {user_id}")
+            logger.info(f"User profile deleted for user {user_id} in guild {guild_id}")
+            _notify_profile_listeners(guild_id, user_id, None)
             return True
         return False
         
@@ -200,24 +875,42 @@ def delete_user_profile(user_id: str) -> bool:
 
 # Hackathon operations
 def save_hackathon(hackathon_data: Dict[str, Any]) -> bool:
-    """Save or update hackathon"""
+    """Save or update a guild's hackathon; a 'teams' list replaces the participants
+
+    Returns False when an id is given that no hackathon of this guild has.
+    """
     session = get_db_session()
     try:
+        values = _column_values(Hackathon, hackathon_data)
+        values.pop('teams', None)
         if 'id' in hackathon_data and hackathon_data['id']:
-            # Update existing hackathon
-            existing_hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_data['id']).first()
-            if existing_hackathon:
-                for key, value in hackathon_data.items():
-                    if hasattr(existing_hackathon, key) and key != 'id':
-                        setattr(existing_hackathon, key, value)
-                existing_hackathon.updated_at = datetime.utcnow()
+            # Update existing hackathon; another guild's hackathon is never touched
+            existing_hackathon = session.query(Hackathon).filter(
+                Hackathon.id == hackathon_data['id'], Hackathon.guild_id == hackathon_data['guild_id']
+            ).first()
+            if not existing_hackathon:
+                logger.warning(f"Hackathon {hackathon_data['id']} not found in guild {hackathon_data['guild_id']}; nothing saved")
+                return False
+            for key, value in values.items():
+                if key not in ('id', 'guild_id'):
+                    setattr(existing_hackathon, key, value)
+            existing_hackathon.updated_at = datetime.utcnow()
+            hackathon = existing_hackathon
         else:
             # Create new hackathon
-            new_hackathon = Hackathon(**hackathon_data)
-            session.add(new_hackathon)
+            hackathon = Hackathon(**values)
+            session.add(hackathon)
         
+        session.flush()
+        if 'teams' in hackathon_data:
+            session.execute(delete(HackathonParticipant).where(HackathonParticipant.hackathon_id == hackathon.id))
+            team_values = _team_values(hackathon.guild_id, hackathon.id, hackathon_data['teams'] or [])
+            if team_values:
+                session.execute(insert(HackathonParticipant), team_values)
+        saved_hackathon = _hackathon_to_dict(hackathon, _load_participants(session, [hackathon.id])[hackathon.id])
         session.commit()
         logger.info(f"Hackathon saved/updated: {hackathon_data.get('name', 'Unknown')}")
+        _notify_hackathon_listeners(saved_hackathon['guild_id'], saved_hackathon['id'], saved_hackathon)
         return True
         
     except SQLAlchemyError as e:
@@ -227,21 +920,78 @@ def save_hackathon(hackathon_data: Dict[str, Any]) -> bool:
     finally:
         close_db_session(session)
 
-def get_hackathon(hackathon_id: int) -> Optional[Dict[str, Any]]:
-    """Get hackathon by ID"""
+def bulk_save_hackathons(hackathons: List[Dict[str, Any]]) -> List[bool]:
+    """Save many hackathons in batched statements inside one transaction
+
+    Hackathons with an id are upserted on it (a restore recreates missing
+    ones), the rest are inserted. An id that belongs to another guild's
+    hackathon is not saved. A 'teams' list replaces the participants.
+    Returns per-hackathon success.
+    """
     session = get_db_session()
     try:
-        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
+        dialect_name = session.get_bind().dialect.name
+        if dialect_name not in _DIALECT_INSERTS:
+            # No native upsert on this database: save one by one
+            session.close()
+            return [save_hackathon(hackathon) for hackathon in hackathons]
+        
+        def write(session: Session, batch: List[Dict[str, Any]]) -> List[Any]:
+            rows = []
+            for hackathon in batch:
+                values = _column_values(Hackathon, hackathon)
+                values.pop('teams', None)
+                if not values.get('id'):
+                    values.pop('id', None)
+                rows.append(values)
+            
+            def statement_for_keys(keys):
+                if 'id' in keys:
+                    # Hackathon IDs are global: never take over another guild's hackathon
+                    return _upsert_statement(dialect_name, Hackathon, keys, ['id'], owner_columns=['guild_id'])
+                return _insert_statement(Hackathon)
+            
+            stored = _execute_by_keys(session, statement_for_keys, rows, match_columns=['id'])
+            replaced = [row.id for row, hackathon in zip(stored, batch) if row is not None and 'teams' in hackathon]
+            if replaced:
+                session.execute(delete(HackathonParticipant).where(HackathonParticipant.hackathon_id.in_(replaced)))
+                team_values = [
+                    value
+                    for row, hackathon in zip(stored, batch) if row is not None and 'teams' in hackathon
+                    for value in _team_values(row.guild_id, row.id, hackathon['teams'] or [])
+                ]
+                if team_values:
+                    session.execute(insert(HackathonParticipant), team_values)
+            return stored
+        
+        stored = _write_in_batches(session, hackathons, write, "hackathon")
+        if dialect_name == 'postgresql' and any(hackathon.get('id') for hackathon in hackathons):
+            # Explicit ids do not advance the serial sequence
+            session.execute(text("SELECT setval(pg_get_serial_sequence('hackathons', 'id'), (SELECT MAX(id) FROM hackathons))"))
+        saved_ids = [row.id for row in stored if row is not None]
+        participants = _load_participants(session, saved_ids)
+        saved_hackathons = [_hackathon_to_dict(row, participants[row.id]) for row in stored if row is not None]
+        session.commit()
+        
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Error bulk saving hackathons: {e}")
+        return [False] * len(hackathons)
+    finally:
+        close_db_session(session)
+    
+    logger.info(f"Bulk saved {len(saved_hackathons)} of {len(hackathons)} hackathons")
+    for saved_hackathon in saved_hackathons:
+        _notify_hackathon_listeners(saved_hackathon['guild_id'], saved_hackathon['id'], saved_hackathon)
+    return [row is not None for row in stored]
+
+def get_hackathon(guild_id: str, hackathon_id: int, primary: bool = False) -> Optional[Dict[str, Any]]:
+    """Get a guild's hackathon by ID, with its participants"""
+    session = get_snapshot_session(primary)
+    try:
+        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id, Hackathon.guild_id == guild_id).first()
         if hackathon:
-            return {
-                'id': hackathon.id,
-                'name': hackathon.name,
-                'description': hackathon.description,
-                'date': hackathon.date,
-                'teams': hackathon.teams or [],
-                'created_at': hackathon.created_at.isoformat() if hackathon.created_at else None,
-                'updated_at': hackathon.updated_at.isoformat() if hackathon.updated_at else None
-            }
+            return _hackathon_to_dict(hackathon, _load_participants(session, [hackathon_id])[hackathon_id])
         return None
         
     except SQLAlchemyError as e:
@@ -250,23 +1000,13 @@ def get_hackathon(hackathon_id: int) -> Optional[Dict[str, Any]]:
     finally:
         close_db_session(session)
 
-def get_all_hackathons() -> List[Dict[str, Any]]:
-    """Get all hackathons"""
-    session = get_db_session()
+def get_all_hackathons(guild_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get all hackathons of a guild (of every guild when guild_id is None), with their participants"""
+    session = get_read_session()
     try:
-        hackathons = session.query(Hackathon).all()
-        return [
-            {
-                'id': hackathon.id,
-                'name': hackathon.name,
-                'description': hackathon.description,
-                'date': hackathon.date,
-                'teams': hackathon.teams or [],
-                'created_at': hackathon.created_at.isoformat() if hackathon.created_at else None,
-                'updated_at': hackathon.updated_at.isoformat() if hackathon.updated_at else None
-            }
-            for hackathon in hackathons
-        ]
+        hackathons = session.execute(_projection(Hackathon, None, guild_id)).all()
+        participants = _load_participants(session, [hackathon.id for hackathon in hackathons])
+        return [_hackathon_to_dict(hackathon, participants[hackathon.id]) for hackathon in hackathons]
         
     except SQLAlchemyError as e:
         logger.error(f"Error getting all hackathons: {e}")
@@ -274,15 +1014,71 @@ def get_all_hackathons() -> List[Dict[str, Any]]:
     finally:
         close_db_session(session)
 
-def delete_hackathon(hackathon_id: int) -> bool:
-    """Delete hackathon"""
+def iter_hackathons(columns: Optional[Sequence[str]] = None, guild_id: Optional[str] = None,
+                    batch_size: int = DB_STREAM_BATCH_SIZE, primary: bool = False) -> Iterator[Row]:
+    """Stream hackathons (of one guild when guild_id is given) as named tuples of the requested columns, in ID order"""
+    session = get_snapshot_session(primary)
+    try:
+        yield from session.execute(_projection(Hackathon, columns, guild_id).execution_options(yield_per=batch_size))
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error streaming hackathons: {e}")
+        raise
+    finally:
+        close_db_session(session)
+
+def iter_participants(columns: Optional[Sequence[str]] = None, guild_id: Optional[str] = None,
+                      batch_size: int = DB_STREAM_BATCH_SIZE, primary: bool = False) -> Iterator[Row]:
+    """Stream hackathon participants (of one guild when guild_id is given) as named tuples, in (hackathon ID, user ID) order"""
+    session = get_snapshot_session(primary)
+    try:
+        yield from session.execute(_projection(HackathonParticipant, columns, guild_id).execution_options(yield_per=batch_size))
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error streaming hackathon participants: {e}")
+        raise
+    finally:
+        close_db_session(session)
+
+def get_hackathon_summaries(guild_id: str, primary: bool = False) -> List[Dict[str, Any]]:
+    """Get a guild's hackathons with a participant_count instead of the participant list"""
+    session = get_snapshot_session(primary)
+    try:
+        return [_hackathon_summary(hackathon, count) for hackathon, count in session.execute(_summaries_statement(guild_id))]
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error getting hackathon summaries: {e}")
+        return []
+    finally:
+        close_db_session(session)
+
+def get_hackathon_summaries_page(guild_id: str, after_id: Optional[int] = None, before_id: Optional[int] = None,
+                                 limit: int = HACKATHON_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], bool]:
+    """One page of a guild's hackathon summaries after (or before) a hackathon ID, and whether more follow"""
+    session = get_read_session()
+    try:
+        rows = session.execute(_summaries_page_statement(guild_id, after_id, before_id, limit))
+        return _summaries_page(rows, limit, before_id is not None)
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Error getting hackathon summaries page: {e}")
+        return [], False
+    finally:
+        close_db_session(session)
+
+def delete_hackathon(guild_id: str, hackathon_id: int) -> bool:
+    """Delete a guild's hackathon and its participants"""
     session = get_db_session()
     try:
-        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
+        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id, Hackathon.guild_id == guild_id).first()
         if hackathon:
+            name = hackathon.name
+            # Explicit delete: SQLite does not enforce the cascade by default
+            session.execute(delete(HackathonParticipant).where(HackathonParticipant.hackathon_id == hackathon_id))
             session.delete(hackathon)
             session.commit()
-            logger.info(f"Hackathon deleted: {hackathon.name}")
+            logger.info(f"Hackathon deleted: {name}")
+            _notify_hackathon_listeners(guild_id, hackathon_id, None)
             return True
         return False
         
@@ -293,31 +1089,28 @@ def delete_hackathon(hackathon_id: int) -> bool:
     finally:
         close_db_session(session)
 
-def add_user_to_hackathon(hackathon_id: int, user_id: str, username: str) -> bool:
-    """Add user to hackathon team"""
+def add_user_to_hackathon(guild_id: str, hackathon_id: int, user_id: str, username: str) -> bool:
+    """Add user to one of their guild's hackathons; the primary key rejects duplicate joins"""
     session = get_db_session()
     try:
-        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
-        if hackathon:
-            teams = hackathon.teams or []
-            
-            # Check if user is already in the team
-            if not any(member.get('user_id') == user_id for member in teams):
-                teams.append({
-                    'user_id': user_id,
-                    'username': username,
-                    'joined_at': datetime.utcnow().isoformat()
-                })
-                hackathon.teams = teams
-                hackathon.updated_at = datetime.utcnow()
-                session.commit()
-                logger.info(f"User {username} added to hackathon {hackathon.name}")
-                return True
-            else:
-                logger.info(f"User {username} is already in hackathon {hackathon.name}")
-                return False
-        return False
+        if session.query(Hackathon).filter(Hackathon.id == hackathon_id, Hackathon.guild_id == guild_id).first() is None:
+            return False
+        session.add(HackathonParticipant(
+            hackathon_id=hackathon_id,
+            user_id=user_id,
+            guild_id=guild_id,
+            username=username,
+            joined_at=datetime.utcnow()
+        ))
+        session.commit()
+        logger.info(f"User {username} added to hackathon {hackathon_id}")
+        _notify_participant_listeners(guild_id, hackathon_id, user_id, True)
+        return True
         
+    except IntegrityError:
+        session.rollback()
+        logger.info(f"User {username} is already in hackathon {hackathon_id}")
+        return False
     except SQLAlchemyError as e:
         session.rollback()
         logger.error(f"Error adding user to hackathon: {e}")
@@ -325,27 +1118,17 @@ def add_user_to_hackathon(hackathon_id: int, user_id: str, username: str) -> boo
     finally:
         close_db_session(session)
 
-def remove_user_from_hackathon(hackathon_id: int, user_id: str) -> bool:
-    """Remove user from hackathon team"""
+def remove_user_from_hackathon(guild_id: str, hackathon_id: int, user_id: str) -> bool:
+    """Remove user from one of their guild's hackathons"""
     session = get_db_session()
     try:
-        hackathon = session.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
-        if hackathon:
-            teams = hackathon.teams or []
-            original_length = len(teams)
-            
-            # Remove user from team
-            teams = [member for member in teams if member.get('user_id') != user_id]
-            
-            if len(teams) < original_length:
-                hackathon.teams = teams
-                hackathon.updated_at = datetime.utcnow()
-                session.commit()
-                logger.info(f"User {user_id} removed from hackathon {hackathon.name}")
-                return True
-            else:
-                logger.info(f"User {user_id} not found in hackathon {hackathon.name}")
-                return False
+        removed = session.execute(_leave_statement(guild_id, hackathon_id, user_id)).rowcount
+        session.commit()
+        if removed:
+            logger.info(f"User {user_id} removed from hackathon {hackathon_id}")
+            _notify_participant_listeners(guild_id, hackathon_id, user_id, False)
+            return True
+        logger.info(f"User {user_id} not found in hackathon {hackathon_id}")
         return False
         
     except SQLAlchemyError as e:
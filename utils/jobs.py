@@ -0,0 +1,250 @@
+"""
+Deferred-response jobs for the Hackathon Team Finder Discord Bot
+
+Discord drops an interaction that is not answered within three seconds, and
+matching or stats over a large guild can take longer. Commands hand their work
+to the job runner instead: it defers the interaction at once, runs the work as
+a tracked background task under a concurrency limit and a timeout, and shows
+the result by editing the original response. Work may show partial results
+while it runs through Job.progress. A user re-running the same command with
+the same key (by default every run of a command shares one) cancels their
+previous job. Time spent waiting for a slot and time spent running are
+recorded separately per command.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Tuple, Any, Optional, Callable, Awaitable, Hashable
+import discord
+from config import JOB_TIMEOUT, JOB_MAX_CONCURRENCY, JOB_PROGRESS_INTERVAL, JOB_TIMING_SAMPLES
+
+logger = logging.getLogger(__name__)
+
+# Replies shown when a job does not finish normally
+TIMEOUT_MESSAGE = "⏱️ That took too long. Please try again in a moment."
+CANCELLED_MESSAGE = "❌ This request was cancelled."
+SUPERSEDED_MESSAGE = "↪️ Replaced by your newer request."
+FAILED_MESSAGE = "❌ Something went wrong while handling this request."
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values; 0.0 when there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def _notice(text: str) -> Dict[str, Any]:
+    """Replace whatever the response showed (partial results included) with text"""
+    return {"content": text, "embed": None, "view": None}
+
+class Job:
+    """One deferred interaction's background work, with its status and timings"""
+
+    def __init__(self, job_id: int, name: str, interaction: discord.Interaction, progress_interval: float,
+                 key: Hashable = None):
+        self.id = job_id
+        self.name = name
+        self.key = key
+        self.interaction = interaction
+        self.user_id = str(interaction.user.id)
+        self.progress_interval = progress_interval
+        self.status = "queued"
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.superseded = False
+        self._last_progress: Optional[float] = None
+
+    @property
+    def supersede_key(self) -> Tuple[str, str, Hashable]:
+        """Jobs sharing this key replace each other"""
+        return (self.user_id, self.name, self.key)
+
+    @property
+    def queue_wait(self) -> float:
+        """Seconds between submission and the start of execution"""
+        return (self.started_at or self.finished_at or time.monotonic()) - self.created_at
+
+    @property
+    def execution_time(self) -> float:
+        """Seconds spent running, 0.0 when the job never started"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    async def progress(self, **message: Any):
+        """Show a partial result, at most once per progress interval
+
+        Takes the keyword arguments of edit_original_response. A failed edit
+        is logged and otherwise ignored; the final result is sent regardless.
+        """
+        now = time.monotonic()
+        if self._last_progress is not None and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        try:
+            await self.interaction.edit_original_response(**message)
+        except discord.HTTPException as e:
+            logger.warning(f"Job {self.id} ({self.name}) could not show progress: {e}")
+
+    def cancel(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+class JobRunner:
+    """Runs deferred interaction work in the background and records its latency"""
+
+    def __init__(self, max_concurrency: int = JOB_MAX_CONCURRENCY, timeout: float = JOB_TIMEOUT,
+                 progress_interval: float = JOB_PROGRESS_INTERVAL, samples: int = JOB_TIMING_SAMPLES):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+        self.samples = samples
+        self.jobs: Dict[int, Job] = {}
+        self._latest: Dict[Tuple[str, str, Hashable], Job] = {}
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._queue_waits: Dict[str, deque] = {}
+        self._execution_times: Dict[str, deque] = {}
+        self._outcomes: Dict[str, Dict[str, int]] = {}
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    async def submit(self, interaction: discord.Interaction, name: str,
+                     work: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]],
+                     timeout: Optional[float] = None, key: Hashable = None) -> Job:
+        """Defer the interaction now and run work(job) as a background job
+
+        work returns the keyword arguments for edit_original_response (or None
+        when it has already replied). A still active job of the same user,
+        command and key is cancelled; pass a key (such as the hackathon a
+        command acts on) to let runs on different targets proceed side by side.
+        Returns the job without waiting for it.
+        """
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+        job = Job(next(self._ids), name, interaction, self.progress_interval, key)
+        previous = self._latest.get(job.supersede_key)
+        if previous is not None:
+            previous.superseded = True
+            previous.cancel()
+        self._latest[job.supersede_key] = job
+        self.jobs[job.id] = job
+
+        job.task = asyncio.create_task(self._run(job, work, self.timeout if timeout is None else timeout),
+                                       name=f"job-{job.id}-{name}")
+        job.task.add_done_callback(lambda task: self._cancelled_before_start(job))
+        return job
+
+    async def _run(self, job: Job, work: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]], timeout: float):
+        message: Optional[Dict[str, Any]] = None
+        try:
+            async with self._get_slots():
+                job.status = "running"
+                job.started_at = time.monotonic()
+                # The timeout covers execution only; waiting for a slot is reported separately
+                message = await asyncio.wait_for(work(job), timeout)
+            job.status = "done"
+        except asyncio.TimeoutError:
+            job.status = "timed_out"
+            message = _notice(TIMEOUT_MESSAGE)
+        except asyncio.CancelledError:
+            message = self._cancelled(job)
+        except Exception:
+            job.status = "failed"
+            logger.exception(f"Job {job.id} ({job.name}) failed")
+            message = _notice(FAILED_MESSAGE)
+        finally:
+            job.finished_at = time.monotonic()
+            self._finish(job)
+
+        if message:
+            await self._reply(job, message)
+
+    def _cancelled(self, job: Job) -> Dict[str, Any]:
+        job.status = "superseded" if job.superseded else "cancelled"
+        return _notice(SUPERSEDED_MESSAGE if job.superseded else CANCELLED_MESSAGE)
+
+    def _cancelled_before_start(self, job: Job):
+        """A task cancelled before its first step never runs _run, so finish it here"""
+        if job.finished_at is not None:
+            return
+        message = self._cancelled(job)
+        job.finished_at = time.monotonic()
+        self._finish(job)
+        asyncio.get_running_loop().create_task(self._reply(job, message))
+
+    async def _reply(self, job: Job, message: Dict[str, Any]):
+        try:
+            await job.interaction.edit_original_response(**message)
+        except Exception as e:
+            # The bot may be shutting down, or the interaction token may have expired
+            logger.warning(f"Job {job.id} ({job.name}) could not send its result: {e}")
+
+    def _finish(self, job: Job):
+        self.jobs.pop(job.id, None)
+        if self._latest.get(job.supersede_key) is job:
+            del self._latest[job.supersede_key]
+
+        self._queue_waits.setdefault(job.name, deque(maxlen=self.samples)).append(job.queue_wait)
+        if job.started_at is not None:
+            self._execution_times.setdefault(job.name, deque(maxlen=self.samples)).append(job.execution_time)
+        outcomes = self._outcomes.setdefault(job.name, {})
+        outcomes[job.status] = outcomes.get(job.status, 0) + 1
+        logger.info(f"Job {job.id} ({job.name}) {job.status}: waited {job.queue_wait * 1000:.1f}ms, "
+                    f"ran {job.execution_time * 1000:.1f}ms")
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a running or queued job; False when it is not active"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    async def close(self):
+        """Cancel every active job and wait for them to wind down"""
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Active jobs and, per command, outcomes and p50/p95 queue wait and execution time (seconds)"""
+        commands = {}
+        for name, outcomes in self._outcomes.items():
+            queue_waits = list(self._queue_waits.get(name, ()))
+            execution_times = list(self._execution_times.get(name, ()))
+            commands[name] = {
+                **outcomes,
+                "queue_wait_p50": _percentile(queue_waits, 0.5),
+                "queue_wait_p95": _percentile(queue_waits, 0.95),
+                "execution_p50": _percentile(execution_times, 0.5),
+                "execution_p95": _percentile(execution_times, 0.95)
+            }
+        return {
+            "active": len(self.jobs),
+            "running": sum(1 for job in self.jobs.values() if job.status == "running"),
+            "commands": commands
+        }
+
+_job_runner: Optional[JobRunner] = None
+
+def get_job_runner() -> JobRunner:
+    """Shared job runner, configured from JOB_MAX_CONCURRENCY, JOB_TIMEOUT and JOB_PROGRESS_INTERVAL"""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner()
+    return _job_runner
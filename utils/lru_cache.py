@@ -0,0 +1,175 @@
+"""
+Bounded LRU cache for the Hackathon Team Finder Discord Bot
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters"""
+
+    def __init__(self, max_entries: int, on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max(1, max_entries)
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it recently used"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value without touching recency or counters"""
+        return self._entries.get(key, default)
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if over capacity"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted_key, evicted_value = self._entries.popitem(last=False)
+                self.evictions += 1
+                if self._on_evict:
+                    self._on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value without counting it as an eviction"""
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def keys(self):
+        """Snapshot of the cached keys, least recently used first"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+def approximate_size(value: Any) -> int:
+    """Rough deep size in bytes of JSON-like data (dicts, lists, strings, numbers)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+class ExpiringLRUCache(LRUCache):
+    """LRUCache whose entries also expire after ttl seconds and share a byte budget
+
+    Entry sizes come from sizeof (approximate_size by default); the least
+    recently used entries are evicted until both the entry and byte limits hold.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = approximate_size,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        super().__init__(max_entries, on_evict)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self.expirations = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: Tuple[Any, float, int]) -> bool:
+        return self.ttl is not None and entry[1] <= time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live value and mark it recently used; expired entries count as misses"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live value without touching recency or counters"""
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry):
+            return default
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value with a fresh TTL, evicting until both limits hold"""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._discard(key)
+            # A value larger than the whole budget would only evict everything else
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                evicted_key, (evicted_value, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+                if self._on_evict:
+                    self._on_evict(evicted_key, evicted_value)
+
+    def _discard(self, key: Hashable) -> Optional[Tuple[Any, float, int]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+        return entry
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value without counting it as an eviction"""
+        with self._lock:
+            entry = self._discard(key)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        stats = super().stats()
+        stats.update({"bytes": self.bytes, "max_bytes": self.max_bytes, "ttl": self.ttl, "expirations": self.expirations})
+        return stats
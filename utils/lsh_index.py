@@ -0,0 +1,137 @@
+"""
+MinHash/LSH approximate matching for the Hackathon Team Finder Discord Bot
+
+Opt-in mode for very large guilds (MATCHING_MODE=approximate). Each profile's
+tech_skills get a MinHash signature that is split into bands; profiles whose
+band hashes collide land in the same bucket. A lookup pulls a shortlist from
+the query's buckets and reranks it with the exact compatibility score, so
+returned scores are exact while recall depends on the band/row settings.
+"""
+
+import threading
+import zlib
+from typing import Dict, List, Tuple, Any, Optional, Set
+import numpy as np
+from config import LSH_BANDS, LSH_ROWS
+from .candidate_index import CandidateIndex
+from .matching import MIN_COMPATIBILITY_SCORE
+from .partitions import GuildPartitions, Snapshot
+
+# Universal hashing modulo a Mersenne prime; 31-bit inputs keep a*x+b inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+def _skill_hashes(skills) -> np.ndarray:
+    """Stable 31-bit hash per distinct skill (Python's hash() is salted per process)"""
+    return np.array(
+        [zlib.crc32(skill.encode("utf-8")) & 0x7FFFFFFF for skill in set(skills)],
+        dtype=np.uint64
+    )
+
+class MinHashLSH:
+    """Banded MinHash buckets over tech_skills with exact reranking"""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        permutations = bands * rows
+        self._a = rng.integers(1, int(_PRIME), size=(permutations, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(permutations, 1), dtype=np.uint64)
+        self._lock = threading.RLock()
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._band_keys: Dict[str, List[bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._band_keys)
+
+    def signature(self, skills) -> Optional[np.ndarray]:
+        """MinHash signature of a skill list, or None when it is empty"""
+        hashes = _skill_hashes(skills)
+        if hashes.size == 0:
+            return None
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+    def _keys(self, skills) -> Optional[List[bytes]]:
+        signature = self.signature(skills)
+        if signature is None:
+            return None
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, profile: Dict[str, Any]):
+        """Add or replace a profile; profiles without skills are not bucketed"""
+        user_id = profile["user_id"]
+        keys = self._keys(profile.get("tech_skills", []))
+        with self._lock:
+            self.remove(user_id)
+            if keys is None:
+                return
+            for band, key in enumerate(keys):
+                self._buckets[band].setdefault(key, set()).add(user_id)
+            self._band_keys[user_id] = keys
+
+    def remove(self, user_id: str) -> bool:
+        with self._lock:
+            keys = self._band_keys.pop(user_id, None)
+            if keys is None:
+                return False
+            for band, key in enumerate(keys):
+                members = self._buckets[band][key]
+                members.discard(user_id)
+                if not members:
+                    del self._buckets[band][key]
+            return True
+
+    def handle_profile_change(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Profile listener hook for utils.database writes"""
+        if profile is None:
+            self.remove(user_id)
+        else:
+            self.add(profile)
+
+    def candidates(self, profile: Dict[str, Any]) -> Set[str]:
+        """Shortlist of users sharing at least one band bucket with the profile"""
+        keys = self._keys(profile.get("tech_skills", []))
+        shortlist: Set[str] = set()
+        if keys is None:
+            return shortlist
+        with self._lock:
+            for band, key in enumerate(keys):
+                shortlist.update(self._buckets[band].get(key, ()))
+        shortlist.discard(profile.get("user_id"))
+        return shortlist
+
+    def top_k(self, index: CandidateIndex, profile: Dict[str, Any], k: Optional[int], min_score: float = MIN_COMPATIBILITY_SCORE, after: Optional[Tuple[str, float]] = None) -> List[Tuple[str, float]]:
+        """Approximate top k: shortlist from the buckets, exact scores from the index"""
+        shortlist = self.candidates(profile)
+        if not shortlist:
+            return []
+        return index.top_k(profile, k=k, min_score=min_score, exclude=profile.get("user_id"), candidates=shortlist, after=after)
+
+    def stats(self) -> Dict[str, Any]:
+        bucket_sizes = [len(members) for buckets in self._buckets for members in buckets.values()]
+        return {
+            "profiles": len(self._band_keys),
+            "bands": self.bands,
+            "rows": self.rows,
+            "buckets": len(bucket_sizes),
+            "largest_bucket": max(bucket_sizes, default=0)
+        }
+
+def _load_lsh_index(guild_id: str, lsh: MinHashLSH, snapshot: Snapshot):
+    from .candidate_index import get_candidate_index
+    for profile in get_candidate_index(guild_id).profiles():
+        snapshot.fill([profile["user_id"]], lambda: lsh.add(profile))
+
+def _route_profile_change(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    """Profile listener: update the changed guild's LSH index, if it is loaded"""
+    _lsh_indexes.apply(guild_id, [user_id], lambda lsh: lsh.handle_profile_change(user_id, profile))
+
+def _subscribe():
+    from .database import add_profile_listener
+    add_profile_listener(_route_profile_change)
+
+_lsh_indexes: GuildPartitions[MinHashLSH] = GuildPartitions(lambda guild_id: MinHashLSH(), _load_lsh_index, _subscribe)
+
+def get_lsh_index(guild_id: str) -> MinHashLSH:
+    """A guild's LSH index, built from its candidate index and kept current by profile writes"""
+    return _lsh_indexes.get(guild_id)
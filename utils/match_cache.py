@@ -0,0 +1,125 @@
+"""
+Incrementally maintained match cache for the Hackathon Team Finder Discord Bot
+
+Compatibility between two profiles only changes when one of them is edited, so
+per-user top-k lists are kept between commands. A profile write only patches
+the rows it touches: the edited user's own list is dropped and every other
+cached list gets that one user's score re-inserted. The cache is bounded and
+evicts the least recently queried users first.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Tuple, Any, Optional
+from config import MATCH_CACHE_MAX_USERS, MATCH_CACHE_DEPTH
+from .candidate_index import CandidateIndex, get_candidate_index
+from .lru_cache import LRUCache
+from .partitions import GuildPartitions
+from .matching import prepare_profile, score_prepared, MIN_COMPATIBILITY_SCORE
+
+class _CachedMatches:
+    """Exact top-len(matches) list for one user
+
+    complete means every candidate above the threshold is in the list, so it
+    can answer any k.
+    """
+    __slots__ = ("matches", "complete")
+
+    def __init__(self, matches: List[Tuple[str, float]], complete: bool):
+        self.matches = matches
+        self.complete = complete
+
+    def can_serve(self, k: int) -> bool:
+        return self.complete or len(self.matches) >= k
+
+def _rank_key(match: Tuple[str, float]) -> Tuple[float, str]:
+    """Sort key for (user_id, score): score descending, then user ID"""
+    return (-match[1], match[0])
+
+class MatchCache:
+    """Per-user top-k lists over a CandidateIndex"""
+
+    def __init__(self, index: CandidateIndex, max_users: int = MATCH_CACHE_MAX_USERS, depth: int = MATCH_CACHE_DEPTH, min_score: float = MIN_COMPATIBILITY_SCORE):
+        self.index = index
+        self.depth = depth
+        self.min_score = min_score
+        self._lock = threading.RLock()
+        self._top_lists = LRUCache(max_users)
+
+    def top_k(self, profile: Dict[str, Any], k: int, after: Optional[Tuple[str, float]] = None) -> List[Tuple[str, float]]:
+        """Best k (user_id, score) matches for a profile, excluding the user
+
+        after pages on from a previous page's last match; pages within the
+        cached list are sliced from it, deeper pages go to the index uncached.
+        """
+        user_id = profile["user_id"]
+        with self._lock:
+            cached = self._top_lists.get(user_id)
+            start = 0
+            if cached is not None and after is not None:
+                start = next((position + 1 for position, match in enumerate(cached.matches) if match == after), None)
+            if cached is not None and start is not None and cached.can_serve(start + k):
+                return cached.matches[start:start + k]
+            if after is not None:
+                return self.index.top_k(profile, k=k, min_score=self.min_score, exclude=user_id, after=after)
+
+            depth = max(k, self.depth)
+            matches = self.index.top_k(profile, k=depth, min_score=self.min_score, exclude=user_id)
+            # Only cache lists computed from the indexed profile, so edits keep them valid
+            if user_id in self.index:
+                self._top_lists.put(user_id, _CachedMatches(matches, complete=len(matches) < depth))
+            return matches[:k]
+
+    def invalidate(self, user_id: str):
+        """Drop everything cached about a user without patching other lists"""
+        with self._lock:
+            self._top_lists.pop(user_id)
+
+    def handle_profile_change(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Profile listener hook: re-rank only the changed user in cached lists"""
+        with self._lock:
+            self.invalidate(user_id)
+            prepared = prepare_profile(profile) if profile is not None else None
+            for owner_id in self._top_lists.keys():
+                cached = self._top_lists.peek(owner_id)
+                owner = self.index.get_profile(owner_id)
+                if cached is None or owner is None:
+                    self._top_lists.pop(owner_id)
+                    continue
+                self._patch(cached, user_id, score_prepared(prepare_profile(owner), prepared) if prepared else None)
+
+    def _patch(self, cached: _CachedMatches, user_id: str, score: Optional[float]):
+        """Replace one user's entry in an exact top list, keeping it exact"""
+        matches = [match for match in cached.matches if match[0] != user_id]
+        if score is not None and score > self.min_score:
+            entry = (user_id, score)
+            position = bisect.bisect_left([_rank_key(match) for match in matches], _rank_key(entry))
+            # Past the end of a partial list the entry might lose to unseen candidates
+            if position < len(matches) or cached.complete:
+                matches.insert(position, entry)
+        if len(matches) > self.depth:
+            matches = matches[:self.depth]
+            cached.complete = False
+        cached.matches = matches
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for sizing the cache"""
+        return {"top_lists": self._top_lists.stats()}
+
+def _route_profile_change(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    """Profile listener: patch the changed guild's cache, if it is loaded"""
+    _match_caches.apply(guild_id, [user_id], lambda cache: cache.handle_profile_change(user_id, profile))
+
+def _subscribe():
+    from .database import add_profile_listener
+    add_profile_listener(_route_profile_change)
+
+# The index is fetched (and its listener registered) in create, so caches are
+# patched against fresh profiles; a new cache has nothing to load
+_match_caches: GuildPartitions[MatchCache] = GuildPartitions(
+    lambda guild_id: MatchCache(get_candidate_index(guild_id)), lambda guild_id, cache, snapshot: None, _subscribe
+)
+
+def get_match_cache(guild_id: str) -> MatchCache:
+    """A guild's match cache over its candidate index"""
+    return _match_caches.get(guild_id)
@@ -0,0 +1,240 @@
+"""
+Async matching service for the Hackathon Team Finder Discord Bot
+
+Scoring is CPU-bound, so command handlers await this service instead of
+calling the matcher on the gateway event loop. Work runs in a thread pool
+(sharing the in-process candidate index) or a process pool (each worker keeps
+its own index and catches up from a change log). Indexes are per guild, taken
+from the profile's guild_id, and a process worker loads only the guilds it is
+asked about. The process pool uses the spawn start method: a forked worker
+would share the parent's database connections and could inherit a lock held
+by another thread. Identical requests for the same user and data version that are
+already in flight share one computation. With MATCHING_MODE=approximate,
+guild-wide lookups rerank an LSH shortlist.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Hashable, AsyncIterator
+from config import MATCH_EXECUTOR, MATCH_POOL_SIZE, MATCHING_MODE, MATCH_MIN_SKILL_OVERLAP, MATCH_STREAM_CHUNK_SIZE
+from .matching import match_candidates, parse_required_role
+
+# How many recent profile changes a process worker can replay before rebuilding
+CHANGE_LOG_SIZE = 1024
+
+# Per-process state of process pool workers, per guild
+_worker_state: Dict[str, Dict[str, Any]] = {}
+
+def _worker_sync(guild_id: str, version: int, changes: List[Tuple[int, str, str]]) -> Dict[str, Any]:
+    """Bring this worker's partition of a guild up to the parent's data version"""
+    from .candidate_index import CandidateIndex
+    from .database import iter_user_profiles, row_to_profile, get_user_profile, PROFILE_MATCH_COLUMNS
+    from .lsh_index import MinHashLSH
+    from .match_cache import MatchCache
+
+    state = _worker_state.get(guild_id)
+    worker_version = state["version"] if state is not None else None
+    if worker_version == version:
+        return state
+    oldest_logged = changes[0][0] if changes else version
+    if state is None or worker_version < oldest_logged - 1:
+        # Too far behind the change log: reload the guild
+        index = CandidateIndex()
+        for row in iter_user_profiles(PROFILE_MATCH_COLUMNS, guild_id, primary=True):
+            index.add(row_to_profile(row))
+        state = _worker_state[guild_id] = {"index": index, "cache": MatchCache(index)}
+        if MATCHING_MODE == "approximate":
+            lsh = MinHashLSH()
+            for profile in index.profiles():
+                lsh.add(profile)
+            state["lsh"] = lsh
+    else:
+        # Replay only the guild's users changed since this worker last synced
+        listeners = [state["index"], state["cache"]] + ([state["lsh"]] if "lsh" in state else [])
+        changed = {
+            user_id for change_version, change_guild_id, user_id in changes
+            if change_version > worker_version and change_guild_id == guild_id
+        }
+        for user_id in changed:
+            profile = get_user_profile(guild_id, user_id, primary=True)
+            for listener in listeners:
+                listener.handle_profile_change(user_id, profile)
+    state["version"] = version
+    return state
+
+def _rank_teammates(index, cache, lsh, profile: Dict[str, Any], k: int, after: Optional[Tuple[str, float]] = None) -> List[Dict[str, Any]]:
+    """Exact matches through the cache, or LSH shortlist matches in approximate mode"""
+    if lsh is not None:
+        matches = lsh.top_k(index, profile, k, after=after)
+    else:
+        matches = cache.top_k(profile, k, after=after)
+    return [
+        {"user_id": user_id, "profile": index.get_profile(user_id), "compatibility_score": score}
+        for user_id, score in matches
+    ]
+
+def _worker_teammates(profile: Dict[str, Any], k: int, after: Optional[Tuple[str, float]], version: int, changes: List[Tuple[int, str, str]]) -> List[Dict[str, Any]]:
+    """Process pool entry point for find_teammates"""
+    state = _worker_sync(profile["guild_id"], version, changes)
+    return _rank_teammates(state["index"], state["cache"], state.get("lsh"), profile, k, after)
+
+def _worker_team_matches(profile: Dict[str, Any], candidate_ids: frozenset, k: int, version: int, changes: List[Tuple[int, str, str]]) -> List[Dict[str, Any]]:
+    """Process pool entry point for find_team_matches"""
+    state = _worker_sync(profile["guild_id"], version, changes)
+    return match_candidates(state["index"], profile, candidate_ids, k)
+
+def _thread_teammates(profile: Dict[str, Any], k: int, after: Optional[Tuple[str, float]] = None) -> List[Dict[str, Any]]:
+    """Thread pool entry point for find_teammates, using the shared indexes and cache"""
+    from .candidate_index import get_candidate_index
+    from .lsh_index import get_lsh_index
+    from .match_cache import get_match_cache
+
+    guild_id = profile["guild_id"]
+    lsh = get_lsh_index(guild_id) if MATCHING_MODE == "approximate" else None
+    return _rank_teammates(get_candidate_index(guild_id), get_match_cache(guild_id), lsh, profile, k, after)
+
+def _thread_team_matches(profile: Dict[str, Any], candidate_ids: frozenset, k: int) -> List[Dict[str, Any]]:
+    """Thread pool entry point for find_team_matches"""
+    from .candidate_index import get_candidate_index
+    return match_candidates(get_candidate_index(profile["guild_id"]), profile, candidate_ids, k)
+
+class MatchService:
+    """Awaitable matching API backed by an executor, with request coalescing"""
+
+    def __init__(self, executor_kind: str = MATCH_EXECUTOR, pool_size: int = MATCH_POOL_SIZE):
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(f"Unknown match executor: {executor_kind}")
+        self.executor_kind = executor_kind
+        self.pool_size = max(1, pool_size)
+        self._executor: Optional[Executor] = None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.data_version = 0
+        self._changes: deque = deque(maxlen=CHANGE_LOG_SIZE)
+        self.coalesced = 0
+        self.computed = 0
+
+    def handle_profile_change(self, guild_id: str, user_id: str, _profile: Optional[Dict[str, Any]]):
+        """Profile listener hook: bump the data version and log the change"""
+        with self._lock:
+            self.data_version += 1
+            self._changes.append((self.data_version, guild_id, user_id))
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # Spawned, not forked: workers open their own database connections
+                self._executor = ProcessPoolExecutor(max_workers=self.pool_size, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="match")
+        return self._executor
+
+    async def _coalesced(self, key: Hashable, fn, *args) -> Any:
+        """Run fn(*args) in the pool unless an identical request is already running"""
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller does not cancel the shared computation
+        return await asyncio.shield(future)
+
+    def _process_args(self) -> Tuple[int, List[Tuple[int, str, str]]]:
+        with self._lock:
+            return self.data_version, list(self._changes)
+
+    async def find_teammates(self, profile: Dict[str, Any], k: int, after: Optional[Tuple[str, float]] = None) -> List[Dict[str, Any]]:
+        """Best k matches across the profile's guild, as match dicts
+
+        after is the (user_id, compatibility_score) of the last match on the
+        previous page; the next k matches below it are returned.
+        """
+        key = ("teammates", profile["guild_id"], profile["user_id"], k, after, self.data_version)
+        if self.executor_kind == "process":
+            return await self._coalesced(key, _worker_teammates, profile, k, after, *self._process_args())
+        return await self._coalesced(key, _thread_teammates, profile, k, after)
+
+    async def _team_candidates(self, profile: Dict[str, Any], hackathon_id: int,
+                               looking_for: Optional[str]) -> frozenset:
+        from .async_database import get_candidate_ids
+
+        return await get_candidate_ids(
+            profile["guild_id"],
+            hackathon_id=hackathon_id,
+            required_role=parse_required_role(looking_for) if looking_for else None,
+            skills=profile.get("tech_skills") or [],
+            min_skill_overlap=MATCH_MIN_SKILL_OVERLAP,
+            exclude_user_id=profile["user_id"]
+        )
+
+    async def _score_candidates(self, profile: Dict[str, Any], candidate_ids: frozenset, k: int) -> List[Dict[str, Any]]:
+        key = ("team_matches", profile["guild_id"], profile["user_id"], k, self.data_version, candidate_ids)
+        if self.executor_kind == "process":
+            return await self._coalesced(key, _worker_team_matches, profile, candidate_ids, k, *self._process_args())
+        return await self._coalesced(key, _thread_team_matches, profile, candidate_ids, k)
+
+    async def find_team_matches(self, profile: Dict[str, Any], hackathon_id: int, k: int,
+                                looking_for: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Best k matches among a hackathon's participants, as match dicts
+
+        The database narrows participants to those looking for a team, with the
+        role named in looking_for and enough shared skills; only they are scored.
+        """
+        candidate_ids = await self._team_candidates(profile, hackathon_id, looking_for)
+        if not candidate_ids:
+            return []
+        return await self._score_candidates(profile, candidate_ids, k)
+
+    async def stream_team_matches(self, profile: Dict[str, Any], hackathon_id: int, k: int,
+                                  looking_for: Optional[str] = None,
+                                  chunk_size: int = MATCH_STREAM_CHUNK_SIZE) -> AsyncIterator[Tuple[List[Dict[str, Any]], int, int]]:
+        """find_team_matches in chunks, yielding (best k so far, scored, total) after each
+
+        The last yield has scored == total and the same matches find_team_matches returns.
+        """
+        candidate_ids = await self._team_candidates(profile, hackathon_id, looking_for)
+        ordered = sorted(candidate_ids)
+        if len(ordered) <= chunk_size:
+            yield (await self._score_candidates(profile, candidate_ids, k) if ordered else []), len(ordered), len(ordered)
+            return
+
+        best: List[Dict[str, Any]] = []
+        for start in range(0, len(ordered), chunk_size):
+            chunk = frozenset(ordered[start:start + chunk_size])
+            best = sorted(best + await self._score_candidates(profile, chunk, k),
+                          key=lambda match: (-match["compatibility_score"], match["user_id"]))[:k]
+            yield best, min(start + chunk_size, len(ordered)), len(ordered)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_kind,
+            "pool_size": self.pool_size,
+            "in_flight": len(self._in_flight),
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "data_version": self.data_version
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+_match_service: Optional[MatchService] = None
+
+def get_match_service() -> MatchService:
+    """Shared matching service, configured from MATCH_EXECUTOR and MATCH_POOL_SIZE"""
+    global _match_service
+    if _match_service is None:
+        from .database import add_profile_listener
+        _match_service = MatchService()
+        add_profile_listener(_match_service.handle_profile_change)
+    return _match_service
@@ -2,44 +2,108 @@
 Team matching utilities for the Hackathon Team Finder Discord Bot
 """
 
-from typing import Dict, List, Tuple, Any
-import json
+from typing import Dict, List, Tuple, Any, Optional, NamedTuple
+import re
+import threading
+from config import USER_ROLES
+from .matching_engine import CompatibilityEngine
+from .partitions import GuildPartitions, Snapshot
 
-def find_compatible_teammates(user_profile: Dict[str, Any], all_users: Dict[str, Any]) -> List[Tuple[str, float]]:
-    """Find compatible team members based on user profile"""
-    compatible_users = []
-    user_id = user_profile.get("user_id", "")
-    
-    for other_user_id, other_profile in all_users.items():
-        if other_user_id == user_id:
-            continue
-        
-        compatibility_score = calculate_compatibility(user_profile, other_profile)
-        if compatibility_score > 0.3:  # Minimum compatibility threshold
-            compatible_users.append((other_user_id, compatibility_score))
-    
-    # Sort by compatibility score (highest first)
-    compatible_users.sort(key=lambda x: x[1], reverse=True)
-    return compatible_users
+# Minimum compatibility score for a user to count as a match
+MIN_COMPATIBILITY_SCORE = 0.3
+
+class GuildCompatibilityEngine:
+    """One guild's profiles encoded in a CompatibilityEngine, shared by every lookup
+
+    Profile listeners update it in place, so a lookup no longer re-encodes the
+    whole guild; the lock keeps an update from interleaving with a scoring pass.
+    """
+
+    def __init__(self):
+        self._engine = CompatibilityEngine()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._engine)
+
+    def add(self, profile: Dict[str, Any]):
+        with self._lock:
+            self._engine.add(profile["user_id"], profile)
+
+    def handle_profile_change(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Profile listener hook: apply a committed save or delete"""
+        with self._lock:
+            if profile is None:
+                self._engine.remove(user_id)
+            else:
+                self._engine.add(user_id, profile)
+
+    def top_k(self, profile: Dict[str, Any], k: Optional[int], min_score: float, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        with self._lock:
+            return self._engine.top_k(profile, k, min_score, exclude)
+
+def _load_compatibility_engine(guild_id: str, engine: GuildCompatibilityEngine, snapshot: Snapshot):
+    """Encode a guild's stored profiles"""
+    from .database import iter_user_profiles, row_to_profile, PROFILE_MATCH_COLUMNS
+    for row in iter_user_profiles(PROFILE_MATCH_COLUMNS, guild_id, primary=True):
+        profile = row_to_profile(row)
+        snapshot.fill([profile["user_id"]], lambda: engine.add(profile))
+
+def _route_profile_change(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    _compatibility_engines.apply(guild_id, [user_id], lambda engine: engine.handle_profile_change(user_id, profile))
+
+def _subscribe():
+    from .database import add_profile_listener
+    add_profile_listener(_route_profile_change)
+
+_compatibility_engines: GuildPartitions[GuildCompatibilityEngine] = GuildPartitions(
+    lambda guild_id: GuildCompatibilityEngine(), _load_compatibility_engine, _subscribe
+)
+
+def get_compatibility_engine(guild_id: str) -> GuildCompatibilityEngine:
+    """A guild's compatibility engine, built on first use and kept current by the profile listeners"""
+    return _compatibility_engines.get(guild_id)
+
+def find_compatible_teammates(user_profile: Dict[str, Any], k: Optional[int] = None, min_score: float = MIN_COMPATIBILITY_SCORE) -> List[Tuple[str, float]]:
+    """Find the k most compatible members of the user's guild (all of them if k is None)
+
+    Results are ordered by score, highest first, with ties broken by user ID.
+    """
+    engine = get_compatibility_engine(user_profile["guild_id"])
+    return engine.top_k(user_profile, k, min_score, exclude=user_profile.get("user_id", ""))
+
+class PreparedProfile(NamedTuple):
+    """The profile fields calculate_compatibility depends on, ready to compare"""
+    roles: frozenset
+    skills: frozenset
+    experience: str
+    timezone: Any
+
+def prepare_profile(profile: Dict[str, Any]) -> PreparedProfile:
+    """Build the sets and normalized values used for scoring once per profile"""
+    return PreparedProfile(
+        roles=frozenset(profile.get("roles", [])),
+        skills=frozenset(profile.get("tech_skills", [])),
+        experience=(profile.get("experience", "") or "").lower(),
+        timezone=profile.get("timezone", "")
+    )
 
 def calculate_compatibility(profile1: Dict[str, Any], profile2: Dict[str, Any]) -> float:
     """Calculate compatibility score between two users"""
+    return score_prepared(prepare_profile(profile1), prepare_profile(profile2))
+
+def score_prepared(profile1: PreparedProfile, profile2: PreparedProfile) -> float:
+    """Calculate compatibility score between two prepared profiles"""
     score = 0.0
     
     # Role compatibility (complementary roles get higher scores)
-    roles1 = set(profile1.get("roles", []))
-    roles2 = set(profile2.get("roles", []))
-    
     # Different roles are better for team diversity
-    if roles1 != roles2:
+    if profile1.roles != profile2.roles:
         score += 0.3
     
     # Skill overlap (some overlap is good, but not too much)
-    skills1 = set(profile1.get("tech_skills", []))
-    skills2 = set(profile2.get("tech_skills", []))
-    
-    overlap = len(skills1.intersection(skills2))
-    total_skills = len(skills1.union(skills2))
+    overlap = len(profile1.skills & profile2.skills)
+    total_skills = len(profile1.skills | profile2.skills)
     
     if total_skills > 0:
         overlap_ratio = overlap / total_skills
@@ -52,66 +116,113 @@ def calculate_compatibility(profile1: Dict[str, Any], profile2: Dict[str, Any])
             score += 0.1  # Too little overlap
     
     # Experience level compatibility
-    exp1 = profile1.get("experience", "").lower()
-    exp2 = profile2.get("experience", "").lower()
-    
     # Mix of experience levels is good
-    if exp1 != exp2:
+    if profile1.experience != profile2.experience:
         score += 0.2
     
     # Timezone compatibility (same timezone is better)
-    tz1 = profile1.get("timezone", "")
-    tz2 = profile2.get("timezone", "")
-    
-    if tz1 == tz2:
+    if profile1.timezone == profile2.timezone:
         score += 0.1
     
     return min(score, 1.0)  # Cap at 1.0
 
-def find_team_matches(user_profile: Dict[str, Any], hackathon_id: int) -> List[Dict[str, Any]]:
-    """Find team matches for a specific hackathon"""
-    # Load all users and hackathon data
-    try:
-        with open("example_data.json", "r") as f:
-            all_users = json.load(f)
-    except FileNotFoundError:
-        return []
-    
-    try:
-        with open("example_hackathons.json", "r") as f:
-            hackathons = json.load(f)
-    except FileNotFoundError:
-        return []
+# Participant IDs per (guild ID, hackathon ID), kept current by hackathon writes in utils.database
+_participant_ids: Dict[Tuple[str, int], frozenset] = {}
+_participant_ids_lock = threading.Lock()
+_participant_listener_registered = False
+
+_participants_version = 0
+
+def participants_version() -> int:
+    """Counter bumped whenever any cached participant set changes"""
+    return _participants_version
+
+def _handle_hackathon_change(guild_id: str, hackathon_id: int, hackathon: Optional[Dict[str, Any]]):
+    """Hackathon listener hook: refresh the cached participant set"""
+    global _participants_version
+    with _participant_ids_lock:
+        _participants_version += 1
+        if hackathon is None:
+            _participant_ids.pop((guild_id, hackathon_id), None)
+        else:
+            _participant_ids[(guild_id, hackathon_id)] = frozenset(
+                member.get("user_id") for member in hackathon.get("teams", [])
+            )
+
+def _handle_participant_change(guild_id: str, hackathon_id: int, user_id: str, joined: bool):
+    """Participant listener hook: patch a cached participant set after a join or leave"""
+    global _participants_version
+    with _participant_ids_lock:
+        _participants_version += 1
+        participant_ids = _participant_ids.get((guild_id, hackathon_id))
+        if participant_ids is not None:
+            _participant_ids[(guild_id, hackathon_id)] = (
+                participant_ids | {user_id} if joined else participant_ids - {user_id}
+            )
+
+def get_participant_ids(guild_id: str, hackathon_id: int) -> frozenset:
+    """User IDs participating in a guild's hackathon, loaded once and then cached"""
+    global _participant_listener_registered
+    from .database import get_hackathon, add_hackathon_listener, add_participant_listener
+    
+    if not _participant_listener_registered:
+        add_hackathon_listener(_handle_hackathon_change)
+        add_participant_listener(_handle_participant_change)
+        _participant_listener_registered = True
+    
+    participant_ids = _participant_ids.get((guild_id, hackathon_id))
+    if participant_ids is None:
+        # The cached set follows the listeners from here on, so read the primary
+        version = _participants_version
+        hackathon = get_hackathon(guild_id, hackathon_id, primary=True)
+        if not hackathon:
+            return frozenset()
+        participant_ids = frozenset(member.get("user_id") for member in hackathon.get("teams", []))
+        with _participant_ids_lock:
+            # A join or leave during the read may be newer than it; cache only if none came
+            if _participants_version == version:
+                _participant_ids[(guild_id, hackathon_id)] = participant_ids
+    return participant_ids
+
+def find_team_matches(user_profile: Dict[str, Any], hackathon_id: int, k: Optional[int] = None, min_score: float = MIN_COMPATIBILITY_SCORE) -> List[Dict[str, Any]]:
+    """Find the k best team matches among a hackathon's participants (all of them if k is None)
+
+    The hackathon and the candidates come from the profile's guild.
+    """
+    from .candidate_index import get_candidate_index
     
-    # Find the specific hackathon
-    hackathon = next((h for h in hackathons if h["id"] == hackathon_id), None)
-    if not hackathon:
+    guild_id = user_profile["guild_id"]
+    participant_ids = get_participant_ids(guild_id, hackathon_id)
+    if not participant_ids:
         return []
-    
-    # Get participants in this hackathon
-    participants = hackathon.get("participants", [])
-    
-    # Find compatible users among participants
-    compatible_users = []
+    return match_candidates(get_candidate_index(guild_id), user_profile, participant_ids, k, min_score)
+
+def parse_required_role(looking_for: str) -> Optional[str]:
+    """The USER_ROLES entry a free-text 'looking for' names, or None when it names none"""
+    text = looking_for.strip().lower()
+    if text in USER_ROLES:
+        return text
+    for role in USER_ROLES:
+        if re.search(rf"(?<![\w/]){re.escape(role)}(?![\w/])", text):
+            return role
+    return None
+
+def match_candidates(index, user_profile: Dict[str, Any], candidate_ids: Optional[frozenset], k: Optional[int] = None, min_score: float = MIN_COMPATIBILITY_SCORE) -> List[Dict[str, Any]]:
+    """Rank candidates from a CandidateIndex into the match dicts format_matches renders
+
+    Only candidate_ids are scored (everyone when None); ties break by user ID.
+    """
     user_id = user_profile.get("user_id", "")
-    
-    for participant_id in participants:
-        if participant_id == user_id or participant_id not in all_users:
-            continue
-        
-        other_profile = all_users[participant_id]
-        compatibility_score = calculate_compatibility(user_profile, other_profile)
-        
-        if compatibility_score > 0.3:
-            compatible_users.append({
-                "user_id": participant_id,
-                "profile": other_profile,
-                "compatibility_score": compatibility_score
-            })
-    
-    # Sort by compatibility score
-    compatible_users.sort(key=lambda x: x["compatibility_score"], reverse=True)
-    return compatible_users
+    matches = index.top_k(user_profile, k=k, min_score=min_score, exclude=user_id, candidates=candidate_ids)
+    
+    return [
+        {
+            "user_id": match_id,
+            "profile": index.get_profile(match_id),
+            "compatibility_score": compatibility_score
+        }
+        for match_id, compatibility_score in matches
+    ]
 
 def format_matches(matches: List[Dict[str, Any]]) -> str:
     """Format team matches for display"""
@@ -0,0 +1,289 @@
+"""
+Vectorized compatibility engine for the Hackathon Team Finder Discord Bot
+
+Profiles are encoded once into NumPy arrays so a single user can be scored
+against everyone else in one batched call. Roles and tech skills become
+bitmasks over the fixed config vocabularies, anything outside the vocabulary
+spills into an overflow dictionary, and experience/timezone become small
+integer codes. Scores are identical to utils.matching.calculate_compatibility.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+import numpy as np
+from config import USER_ROLES, TECH_SKILLS, EXPERIENCE_LEVELS, TIMEZONES
+
+WORD_BITS = 64
+
+def _build_vocabulary(words: List[str]) -> Dict[str, Tuple[int, np.uint64]]:
+    """Map each vocabulary word to its (word index, bit) position"""
+    return {
+        word: (i // WORD_BITS, np.uint64(1) << np.uint64(i % WORD_BITS))
+        for i, word in enumerate(words)
+    }
+
+ROLE_VOCABULARY = _build_vocabulary(USER_ROLES)
+SKILL_VOCABULARY = _build_vocabulary(TECH_SKILLS)
+ROLE_WORDS = max(1, -(-len(USER_ROLES) // WORD_BITS))
+SKILL_WORDS = max(1, -(-len(TECH_SKILLS) // WORD_BITS))
+
+if hasattr(np, "bitwise_count"):
+    def popcount(masks: np.ndarray) -> np.ndarray:
+        """Count set bits per row of a (rows, words) uint64 array"""
+        return np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(masks: np.ndarray) -> np.ndarray:
+        """Count set bits per row of a (rows, words) uint64 array"""
+        as_bytes = np.ascontiguousarray(masks).view(np.uint8).reshape(masks.shape[0], -1)
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+def _encode_mask(values: Iterable[str], vocabulary: Dict[str, Tuple[int, np.uint64]], words: int) -> Tuple[np.ndarray, frozenset]:
+    """Encode values as a bitmask, returning (mask, values outside the vocabulary)"""
+    mask = np.zeros(words, dtype=np.uint64)
+    overflow = set()
+    for value in set(values):
+        position = vocabulary.get(value)
+        if position is None:
+            overflow.add(value)
+        else:
+            mask[position[0]] |= position[1]
+    return mask, frozenset(overflow)
+
+def select_top_k(scores: np.ndarray, ranks: np.ndarray, k: Optional[int], min_score: float) -> np.ndarray:
+    """Rows of the k best scores above min_score, highest first with ties broken by rank
+
+    Uses argpartition so the work beyond one linear pass grows with k rather
+    than with the number of rows that clear the floor.
+    """
+    candidates = np.flatnonzero(scores > min_score)
+    if k is not None and len(candidates) > k:
+        if k <= 0:
+            return candidates[:0]
+        candidate_scores = scores[candidates]
+        cutoff = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+        above = candidates[candidate_scores > cutoff]
+        tied = candidates[candidate_scores == cutoff]
+        # Scores are coarse, so the cutoff is usually shared by many rows
+        needed = k - len(above)
+        if needed < len(tied):
+            tied = tied[np.argpartition(ranks[tied], needed - 1)[:needed]]
+        candidates = np.concatenate([above, tied])
+    return candidates[np.lexsort((ranks[candidates], -scores[candidates]))]
+
+class CompatibilityEngine:
+    """Column-oriented store of encoded profiles with batched scoring"""
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, capacity)
+        self._size = 0
+        self._dead = 0
+        self._user_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._id_ranks: Optional[np.ndarray] = None
+
+        self._role_masks = np.zeros((capacity, ROLE_WORDS), dtype=np.uint64)
+        self._skill_masks = np.zeros((capacity, SKILL_WORDS), dtype=np.uint64)
+        self._role_extra = np.zeros(capacity, dtype=np.int32)
+        self._skill_extra_count = np.zeros(capacity, dtype=np.int32)
+        self._experience = np.zeros(capacity, dtype=np.int32)
+        self._timezone = np.zeros(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+        # Overflow dictionary: unknown skill -> rows that list it
+        self._skill_overflow: Dict[str, set] = {}
+        self._row_overflow: Dict[int, frozenset] = {}
+
+        # Interned codes; 0 is reserved for "no unknown roles"
+        self._role_sets: Dict[frozenset, int] = {frozenset(): 0}
+        self._experience_codes: Dict[Any, int] = {level: i for i, level in enumerate(EXPERIENCE_LEVELS)}
+        self._timezone_codes: Dict[Any, int] = {tz: i for i, tz in enumerate(TIMEZONES)}
+
+    @classmethod
+    def from_profiles(cls, profiles: Dict[str, Dict[str, Any]]) -> "CompatibilityEngine":
+        """Build an engine from a user_id -> profile mapping, keeping its order"""
+        engine = cls(capacity=len(profiles))
+        for user_id, profile in profiles.items():
+            engine.add(user_id, profile)
+        return engine
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._rows
+
+    @property
+    def size(self) -> int:
+        """Number of rows in use, including removed rows awaiting compaction"""
+        return self._size
+
+    def row_of(self, user_id: str) -> Optional[int]:
+        """Row index for a user, or None"""
+        return self._rows.get(user_id)
+
+    def user_id_at(self, row: int) -> Optional[str]:
+        """User ID stored at a row"""
+        return self._user_ids[row]
+
+    @staticmethod
+    def _normalize(profile: Dict[str, Any]) -> Tuple[Any, Any]:
+        """Experience and timezone exactly as calculate_compatibility compares them"""
+        experience = (profile.get("experience", "") or "").lower()
+        timezone = profile.get("timezone", "")
+        return experience, timezone
+
+    def _code(self, table: Dict[Any, int], value: Any, register: bool) -> int:
+        """Look up (and optionally register) a small integer code"""
+        code = table.get(value)
+        if code is None:
+            if not register:
+                return -1
+            code = len(table)
+            table[value] = code
+        return code
+
+    def _grow(self):
+        """Double array capacity"""
+        capacity = self._alive.shape[0] * 2
+        for name in ("_role_masks", "_skill_masks"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, old.shape[1]), dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+        for name in ("_role_extra", "_skill_extra_count", "_experience", "_timezone", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
+
+    def _clear_overflow(self, row: int):
+        """Drop a row from the skill overflow dictionary"""
+        for skill in self._row_overflow.pop(row, ()):
+            rows = self._skill_overflow.get(skill)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._skill_overflow[skill]
+
+    def add(self, user_id: str, profile: Dict[str, Any]):
+        """Add or update a profile; updates keep their original row"""
+        row = self._rows.get(user_id)
+        if row is None:
+            if self._size == self._alive.shape[0]:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._user_ids.append(user_id)
+            self._rows[user_id] = row
+            self._id_ranks = None
+        else:
+            self._clear_overflow(row)
+
+        role_mask, role_overflow = _encode_mask(profile.get("roles", []), ROLE_VOCABULARY, ROLE_WORDS)
+        skill_mask, skill_overflow = _encode_mask(profile.get("tech_skills", []), SKILL_VOCABULARY, SKILL_WORDS)
+        experience, timezone = self._normalize(profile)
+
+        self._role_masks[row] = role_mask
+        self._skill_masks[row] = skill_mask
+        self._role_extra[row] = self._code(self._role_sets, role_overflow, register=True)
+        self._skill_extra_count[row] = len(skill_overflow)
+        self._experience[row] = self._code(self._experience_codes, experience, register=True)
+        self._timezone[row] = self._code(self._timezone_codes, timezone, register=True)
+        self._alive[row] = True
+
+        if skill_overflow:
+            self._row_overflow[row] = skill_overflow
+            for skill in skill_overflow:
+                self._skill_overflow.setdefault(skill, set()).add(row)
+
+    def remove(self, user_id: str) -> bool:
+        """Remove a profile; rows are compacted once enough are dead"""
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return False
+        self._clear_overflow(row)
+        self._alive[row] = False
+        self._user_ids[row] = None
+        self._id_ranks = None
+        self._dead += 1
+        if self._dead > len(self):
+            self._compact()
+        return True
+
+    def id_ranks(self) -> np.ndarray:
+        """Rank of each row's user ID in sorted order, used to break score ties"""
+        if self._id_ranks is None:
+            ids = np.array([user_id or "" for user_id in self._user_ids], dtype=str)
+            ranks = np.empty(len(ids), dtype=np.int64)
+            ranks[np.argsort(ids, kind="stable")] = np.arange(len(ids))
+            self._id_ranks = ranks
+        return self._id_ranks
+
+    def top_k(self, profile: Dict[str, Any], k: Optional[int], min_score: float, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Best k (user_id, score) pairs scoring above min_score"""
+        scores = self.scores(profile)
+        if exclude is not None and exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        rows = select_top_k(scores, self.id_ranks(), k, min_score)
+        return [(self._user_ids[row], float(scores[row])) for row in rows]
+
+    def _compact(self):
+        """Drop dead rows while preserving row order"""
+        keep = np.flatnonzero(self._alive[:self._size])
+        remap = {int(old): new for new, old in enumerate(keep)}
+        for name in ("_role_masks", "_skill_masks", "_role_extra", "_skill_extra_count", "_experience", "_timezone", "_alive"):
+            array = getattr(self, name)
+            compacted = np.zeros_like(array)
+            compacted[:len(keep)] = array[keep]
+            setattr(self, name, compacted)
+
+        self._user_ids = [self._user_ids[old] for old in keep]
+        self._rows = {user_id: row for row, user_id in enumerate(self._user_ids)}
+        self._row_overflow = {remap[old]: skills for old, skills in self._row_overflow.items()}
+        self._skill_overflow = {
+            skill: {remap[old] for old in rows}
+            for skill, rows in self._skill_overflow.items()
+        }
+        self._id_ranks = None
+        self._size = len(keep)
+        self._dead = 0
+
+    def scores(self, profile: Dict[str, Any]) -> np.ndarray:
+        """Score a profile against every row; removed rows score -inf"""
+        n = self._size
+        role_mask, role_overflow = _encode_mask(profile.get("roles", []), ROLE_VOCABULARY, ROLE_WORDS)
+        skill_mask, skill_overflow = _encode_mask(profile.get("tech_skills", []), SKILL_VOCABULARY, SKILL_WORDS)
+        experience, timezone = self._normalize(profile)
+
+        # Different roles are better for team diversity
+        roles_equal = np.all(self._role_masks[:n] == role_mask, axis=1)
+        roles_equal &= self._role_extra[:n] == self._code(self._role_sets, role_overflow, register=False)
+        score = np.where(roles_equal, 0.0, 0.3)
+
+        # Skill overlap via popcount, plus exact counts for overflow skills
+        overflow_overlap = np.zeros(n, dtype=np.int64)
+        for skill in skill_overflow:
+            rows = self._skill_overflow.get(skill)
+            if rows:
+                overflow_overlap[np.fromiter(rows, dtype=np.int64, count=len(rows))] += 1
+        overlap = popcount(self._skill_masks[:n] & skill_mask) + overflow_overlap
+        total_skills = (
+            popcount(self._skill_masks[:n] | skill_mask)
+            + self._skill_extra_count[:n] + len(skill_overflow) - overflow_overlap
+        )
+        has_skills = total_skills > 0
+        overlap_ratio = np.divide(overlap, total_skills, out=np.zeros(n), where=has_skills)
+        skill_score = np.where(
+            (overlap_ratio >= 0.2) & (overlap_ratio <= 0.6), 0.4,
+            np.where(overlap_ratio > 0.6, 0.2, 0.1)
+        )
+        score += np.where(has_skills, skill_score, 0.0)
+
+        # Mix of experience levels is good, same timezone is better
+        score += np.where(self._experience[:n] != self._code(self._experience_codes, experience, register=False), 0.2, 0.0)
+        score += np.where(self._timezone[:n] == self._code(self._timezone_codes, timezone, register=False), 0.1, 0.0)
+
+        score = np.minimum(score, 1.0)
+        score[~self._alive[:n]] = -np.inf
+        return score
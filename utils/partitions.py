@@ -0,0 +1,154 @@
+"""
+Per-guild partitions for the Hackathon Team Finder Discord Bot
+
+Indexes, caches and counters used to cover every profile the bot knows about,
+so a lookup in a small guild paid for the largest one and a write anywhere
+touched all of them. Each is now built per guild on first use: a guild's
+partition is loaded from that guild's rows only, is kept current by the
+change listeners (which route a write to its guild's partition alone) and can
+be dropped again when the bot leaves the guild.
+
+A guild's rows can change while its partition loads. Listener changes reach a
+loading partition at once and mark the keys they touch (a user, a
+hackathon); the loader's snapshot rows for those keys are older than the
+change, or at best equal to it, so they are skipped instead of applied over it.
+Recording starts before the loader reads anything.
+"""
+
+import threading
+from typing import Dict, List, Any, Callable, Generic, Hashable, Iterable, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+# Every GuildPartitions, so a guild can be dropped from all of them at once
+_registry: List["GuildPartitions"] = []
+
+class Snapshot:
+    """A partition load in progress: the keys listeners changed since it began
+
+    Listener changes and snapshot rows are applied under one lock, so a row
+    is either applied before a change to its key or skipped after it.
+    """
+
+    def __init__(self, partition: Any):
+        self.partition = partition
+        self._lock = threading.Lock()
+        self._touched: Set[Hashable] = set()
+
+    def fill(self, keys: Iterable[Hashable], apply: Callable[[], None]) -> bool:
+        """Apply one snapshot row unless a listener already changed any of its keys"""
+        with self._lock:
+            if any(key in self._touched for key in keys):
+                return False
+            apply()
+            return True
+
+    def _change(self, keys: Iterable[Hashable], change: Callable[[Any], None]):
+        with self._lock:
+            self._touched.update(keys)
+            change(self.partition)
+
+    @property
+    def changed_keys(self) -> int:
+        """How many keys listeners changed during the load"""
+        with self._lock:
+            return len(self._touched)
+
+class GuildPartitions(Generic[T]):
+    """Lazily loaded objects, one per guild
+
+    create(guild_id) makes an empty partition, load(guild_id, partition,
+    snapshot) fills it from the database through snapshot.fill(), and
+    subscribe() registers the change listeners once, before the first load.
+    Listeners hand their changes to apply(), which also reaches a partition
+    that is still loading and marks the keys it touched so the load does not
+    overwrite them; guilds that were never loaded are skipped and read fresh
+    rows when they load.
+    """
+
+    def __init__(self, create: Callable[[str], T], load: Callable[[str, T, Snapshot], None],
+                 subscribe: Optional[Callable[[], None]] = None):
+        self._create = create
+        self._load = load
+        self._subscribe = subscribe
+        self._subscribed = False
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, T] = {}
+        self._loading: Dict[str, Snapshot] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        _registry.append(self)
+
+    def get(self, guild_id: str) -> T:
+        """A guild's partition, loading it on first use
+
+        Only callers of the same guild wait for a load; other guilds' loaded
+        partitions stay available meanwhile. If the load raises, the partial
+        partition is discarded and the error propagates; the next get() loads
+        the guild again.
+        """
+        partition = self._loaded.get(guild_id)
+        if partition is not None:
+            return partition
+        with self._lock:
+            if not self._subscribed:
+                if self._subscribe is not None:
+                    self._subscribe()
+                self._subscribed = True
+            load_lock = self._load_locks.setdefault(guild_id, threading.Lock())
+        with load_lock:
+            partition = self._loaded.get(guild_id)
+            if partition is not None:
+                return partition
+            partition = self._create(guild_id)
+            snapshot = Snapshot(partition)
+            # Registered before the load reads anything, so every later change is recorded
+            with self._lock:
+                self._loading[guild_id] = snapshot
+            try:
+                self._load(guild_id, partition, snapshot)
+            finally:
+                with self._lock:
+                    self._loading.pop(guild_id, None)
+            with self._lock:
+                self._loaded[guild_id] = partition
+            return partition
+
+    def apply(self, guild_id: str, keys: Iterable[Hashable], change: Callable[[T], None]) -> bool:
+        """Apply a listener's change to a guild's partition, loaded or still loading
+
+        keys name what the change touched; a loading partition skips its
+        snapshot rows for them. Returns False when the guild is not loaded.
+        """
+        with self._lock:
+            partition = self._loaded.get(guild_id)
+            snapshot = self._loading.get(guild_id) if partition is None else None
+        if partition is not None:
+            change(partition)
+            return True
+        if snapshot is None:
+            return False
+        snapshot._change(keys, change)
+        return True
+
+    def peek(self, guild_id: str) -> Optional[T]:
+        """A guild's loaded partition, without loading it"""
+        return self._loaded.get(guild_id)
+
+    def loaded(self) -> List[str]:
+        """IDs of the guilds whose partitions are loaded"""
+        with self._lock:
+            return list(self._loaded)
+
+    def drop(self, guild_id: str) -> bool:
+        """Forget a guild's partition; the next get() loads it again"""
+        with self._lock:
+            self._load_locks.pop(guild_id, None)
+            return self._loaded.pop(guild_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"loaded": len(self._loaded), "loading": len(self._loading)}
+
+def drop_guild(guild_id: str) -> int:
+    """Drop a guild from every partitioned index and cache; returns how many held it"""
+    return sum(partitions.drop(guild_id) for partitions in list(_registry))
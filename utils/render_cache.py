@@ -0,0 +1,85 @@
+"""
+Versioned render cache for the Hackathon Team Finder Discord Bot
+
+The hackathon list and /stats show every user the same embeds, and the data
+behind them changes only a few times a day. Rendered results are cached under
+the data versions they were built from (utils.database.get_data_version), so
+each one is built once per version; any write moves the version on and the
+old entries simply age out of the LRU. Cached embeds are shared between
+replies and must not be modified after they are built.
+"""
+
+import threading
+from typing import Dict, Any, Callable, Awaitable, Hashable, Optional, Tuple
+from config import RENDER_CACHE_MAX_ENTRIES
+from .lru_cache import LRUCache
+
+_MISSING = object()
+
+class RenderCache:
+    """Bounded cache of rendered values keyed by (key, data version)"""
+
+    def __init__(self, max_entries: int = RENDER_CACHE_MAX_ENTRIES):
+        self._cache = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.uncacheable = 0
+
+    def _lookup(self, key: Hashable, version: Optional[Tuple[int, ...]]) -> Tuple[bool, Any]:
+        if version is None:
+            return False, None
+        cached = self._cache.get((key, version), _MISSING)
+        return cached is not _MISSING, cached
+
+    def _store(self, key: Hashable, version: Optional[Tuple[int, ...]], value: Any):
+        with self._lock:
+            self.renders += 1
+            if version is None:
+                self.uncacheable += 1
+            else:
+                self._cache.put((key, version), value)
+
+    def get_or_render(self, key: Hashable, version: Optional[Tuple[int, ...]], render: Callable[[], Any]) -> Any:
+        """The value rendered for key at this version, rendering it on a miss
+
+        A version of None (reads may not reflect the newest write yet) always
+        renders and caches nothing.
+        """
+        found, value = self._lookup(key, version)
+        if found:
+            return value
+        value = render()
+        self._store(key, version, value)
+        return value
+
+    async def get_or_render_async(self, key: Hashable, version: Optional[Tuple[int, ...]],
+                                  render: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_render for a render that has to await, such as a database read"""
+        found, value = self._lookup(key, version)
+        if found:
+            return value
+        value = await render()
+        self._store(key, version, value)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """LRU counters, plus how many renders ran and how many a hit avoided"""
+        stats = self._cache.stats()
+        stats.update({
+            "renders": self.renders,
+            "renders_avoided": self._cache.hits,
+            "uncacheable": self.uncacheable
+        })
+        return stats
+
+_render_cache: Optional[RenderCache] = None
+
+def get_render_cache() -> RenderCache:
+    """Shared render cache, bounded by RENDER_CACHE_MAX_ENTRIES"""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
@@ -0,0 +1,54 @@
+"""
+Schema version checks for the Hackathon Team Finder Discord Bot
+
+The schema is owned by the Alembic migrations in migrations/. At startup the
+database's revision is compared with the latest one: an outdated database is
+either upgraded in place or refused, so new code never runs against tables
+(or indexes) it does not expect.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+class SchemaOutdatedError(RuntimeError):
+    """The database is behind the migrations this code expects"""
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic config for migrations/, optionally bound to an open connection"""
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def schema_revisions(engine: Engine) -> Tuple[Optional[str], str]:
+    """(current revision of the database, latest revision of the migrations)"""
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    return current, head
+
+def ensure_schema(engine: Engine, auto_upgrade: bool):
+    """Upgrade an outdated database to the latest revision, or refuse to run against it"""
+    current, head = schema_revisions(engine)
+    if current == head:
+        return
+    if not auto_upgrade:
+        raise SchemaOutdatedError(
+            f"Database schema is at revision {current or 'none'} but this version needs {head}; "
+            "run 'alembic upgrade head' (or set DB_AUTO_MIGRATE=1)"
+        )
+
+    logger.info(f"Upgrading database schema from revision {current or 'none'} to {head}")
+    with engine.connect() as connection:
+        command.upgrade(alembic_config(connection), "head")
@@ -0,0 +1,173 @@
+"""
+Incremental server statistics for the Hackathon Team Finder Discord Bot
+
+/stats used to scan every profile and recount roles and experience levels on
+each call. The store counts them once from the database and then follows
+committed writes through the change listeners: for a saved or deleted profile
+it subtracts the user's previous roles, experience, timezone and team status
+and adds the new ones, and it keeps the participants of each hackathon. Reading
+the statistics costs the same no matter how many users there are. Each guild
+has its own store, loaded the first time that guild asks for /stats; writes
+made during that load are kept over the older rows it reads (see partitions).
+"""
+
+import heapq
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Tuple, Any, Optional, Set
+from .partitions import GuildPartitions, Snapshot
+
+logger = logging.getLogger(__name__)
+
+# How many hackathons /stats lists by participant count
+TOP_HACKATHONS = 3
+
+# What the store remembers per user: the counted fields of their current profile
+_ProfileState = Tuple[Tuple[str, ...], str, str, bool]
+
+def _profile_state(profile: Dict[str, Any]) -> _ProfileState:
+    return (
+        tuple(profile.get('roles') or ()),
+        profile.get('experience') or 'unknown',
+        profile.get('timezone') or 'unknown',
+        bool(profile.get('looking_for_team'))
+    )
+
+class StatsStore:
+    """Role, experience, timezone and participant counts, updated one change at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, _ProfileState] = {}
+        self.looking_for_team = 0
+        self.role_counts: Counter = Counter()
+        self.experience_counts: Counter = Counter()
+        self.timezone_counts: Counter = Counter()
+        self._hackathon_names: Dict[int, str] = {}
+        # Participant IDs rather than counts, so a join or leave seen twice counts once
+        self._participants: Dict[int, Set[str]] = {}
+
+    def _count(self, state: _ProfileState, delta: int):
+        roles, experience, timezone, looking_for_team = state
+        for role in roles:
+            self.role_counts[role] += delta
+            if not self.role_counts[role]:
+                del self.role_counts[role]
+        self.experience_counts[experience] += delta
+        if not self.experience_counts[experience]:
+            del self.experience_counts[experience]
+        self.timezone_counts[timezone] += delta
+        if not self.timezone_counts[timezone]:
+            del self.timezone_counts[timezone]
+        if looking_for_team:
+            self.looking_for_team += delta
+
+    def _replace(self, user_id: str, state: Optional[_ProfileState]):
+        old_state = self._profiles.pop(user_id, None)
+        if old_state is not None:
+            self._count(old_state, -1)
+        if state is not None:
+            self._profiles[user_id] = state
+            self._count(state, 1)
+
+    def handle_profile_change(self, user_id: str, profile: Optional[Dict[str, Any]]):
+        """Profile listener: swap the user's old counted fields for the new ones"""
+        with self._lock:
+            self._replace(user_id, _profile_state(profile) if profile else None)
+
+    def handle_hackathon_change(self, hackathon_id: int, hackathon: Optional[Dict[str, Any]]):
+        """Hackathon listener: a saved hackathon carries its full participant list"""
+        with self._lock:
+            if hackathon is None:
+                self._hackathon_names.pop(hackathon_id, None)
+                self._participants.pop(hackathon_id, None)
+            else:
+                self._hackathon_names[hackathon_id] = hackathon.get('name', '')
+                self._participants[hackathon_id] = {
+                    member['user_id'] for member in hackathon.get('teams', []) if member.get('user_id')
+                }
+
+    def handle_participant_change(self, hackathon_id: int, user_id: str, joined: bool):
+        with self._lock:
+            if joined:
+                self._participants.setdefault(hackathon_id, set()).add(user_id)
+            else:
+                self._participants.get(hackathon_id, set()).discard(user_id)
+
+    def add_hackathon(self, hackathon_id: int, name: str):
+        """Count a hackathon read by the initial load"""
+        with self._lock:
+            self._hackathon_names[hackathon_id] = name or ''
+
+    def _participant_counts(self) -> Dict[int, int]:
+        return {
+            hackathon_id: len(self._participants.get(hackathon_id, ()))
+            for hackathon_id in self._hackathon_names
+        }
+
+    def snapshot(self, top_hackathons: int = TOP_HACKATHONS) -> Dict[str, Any]:
+        """Current counts, with the hackathons that have the most participants"""
+        with self._lock:
+            participant_counts = self._participant_counts()
+            busiest = heapq.nsmallest(
+                top_hackathons, participant_counts.items(), key=lambda item: (-item[1], item[0])
+            )
+            return {
+                "total_users": len(self._profiles),
+                "looking_for_team": self.looking_for_team,
+                "role_counts": dict(self.role_counts),
+                "experience_counts": dict(self.experience_counts),
+                "timezone_counts": dict(self.timezone_counts),
+                "hackathons": len(participant_counts),
+                "busiest_hackathons": [
+                    {"id": hackathon_id, "name": self._hackathon_names.get(hackathon_id, ''), "participant_count": count}
+                    for hackathon_id, count in busiest
+                ]
+            }
+
+def _load_stats_store(guild_id: str, store: StatsStore, snapshot: Snapshot):
+    """Count a guild's rows, skipping any whose key a listener changed since the load began"""
+    from .database import iter_user_profiles, iter_hackathons, iter_participants, row_to_profile
+    for row in iter_hackathons(('id', 'name'), guild_id, primary=True):
+        snapshot.fill([('hackathon', row.id)], lambda: store.add_hackathon(row.id, row.name))
+    for row in iter_participants(('hackathon_id', 'user_id'), guild_id, primary=True):
+        snapshot.fill(
+            [('hackathon', row.hackathon_id), ('participant', row.hackathon_id, row.user_id)],
+            lambda: store.handle_participant_change(row.hackathon_id, row.user_id, True)
+        )
+    for row in iter_user_profiles(
+        ('user_id', 'roles', 'experience', 'timezone', 'looking_for_team'), guild_id, primary=True
+    ):
+        profile = row_to_profile(row)
+        snapshot.fill([('profile', profile['user_id'])], lambda: store.handle_profile_change(profile['user_id'], profile))
+    logger.info(
+        f"Stats store built for guild {guild_id}: {len(store._profiles)} profiles, "
+        f"{len(store._hackathon_names)} hackathons, {snapshot.changed_keys} keys changed during the load"
+    )
+
+def _route_profile_change(guild_id: str, user_id: str, profile: Optional[Dict[str, Any]]):
+    _stats_stores.apply(guild_id, [('profile', user_id)], lambda store: store.handle_profile_change(user_id, profile))
+
+def _route_hackathon_change(guild_id: str, hackathon_id: int, hackathon: Optional[Dict[str, Any]]):
+    _stats_stores.apply(
+        guild_id, [('hackathon', hackathon_id)], lambda store: store.handle_hackathon_change(hackathon_id, hackathon)
+    )
+
+def _route_participant_change(guild_id: str, hackathon_id: int, user_id: str, joined: bool):
+    _stats_stores.apply(
+        guild_id, [('participant', hackathon_id, user_id)],
+        lambda store: store.handle_participant_change(hackathon_id, user_id, joined)
+    )
+
+def _subscribe():
+    from .database import add_profile_listener, add_hackathon_listener, add_participant_listener
+    add_profile_listener(_route_profile_change)
+    add_hackathon_listener(_route_hackathon_change)
+    add_participant_listener(_route_participant_change)
+
+_stats_stores: GuildPartitions[StatsStore] = GuildPartitions(lambda guild_id: StatsStore(), _load_stats_store, _subscribe)
+
+def get_stats_store(guild_id: str) -> StatsStore:
+    """A guild's store, counted from the database on first use and kept current by writes"""
+    return _stats_stores.get(guild_id)
@@ -0,0 +1,259 @@
+"""
+Stub Discord gateway for the Hackathon Team Finder Discord Bot
+
+Runs the sharded bot locally without a token or a Discord application: the
+stub answers the few REST routes the bot calls at startup (login,
+application info, gateway discovery, command sync) and speaks enough of the
+gateway protocol (HELLO, IDENTIFY, heartbeats) to bring every shard to READY
+with a set of empty guilds, each assigned to a shard by Discord's (guild_id >> 22) % shard_count
+rule. Interactions are not simulated.
+
+Run with: python -m utils.stub_gateway --port 8765 --guilds 40 --shards 8
+and point the bot at it with DISCORD_STUB_URL=http://127.0.0.1:8765, or let
+launcher.py start one with --stub-gateway.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from typing import Dict, List, Any, Optional
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v10"
+APPLICATION_ID = "1000000000000000001"
+BOT_USER = {
+    "id": APPLICATION_ID,
+    "username": "Hackathon Team Finder",
+    "discriminator": "0",
+    "global_name": None,
+    "avatar": None,
+    "bot": True,
+    "flags": 0
+}
+
+APPLICATION = {
+    "id": APPLICATION_ID,
+    "name": "Hackathon Team Finder",
+    "description": "",
+    "icon": None,
+    "bot_public": False,
+    "bot_require_code_grant": False,
+    "owner": BOT_USER,
+    "verify_key": "",
+    "flags": 0
+}
+
+# Gateway opcodes (https://discord.com/developers/docs/topics/opcodes-and-status-codes)
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RESUME = 6
+OP_INVALID_SESSION = 9
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+
+def point_discord_at(url: str):
+    """Send discord.py's REST calls and gateway connections to a stub at url instead of Discord"""
+    import yarl
+    from discord.gateway import DiscordWebSocket
+    from discord.http import Route
+
+    base = url.rstrip("/")
+    Route.BASE = base + API_PREFIX
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL("ws" + base[len("http"):] + "/")
+
+def _guild_payload(guild_id: int, index: int) -> Dict[str, Any]:
+    return {
+        "id": str(guild_id),
+        "name": f"Stub Guild {index}",
+        "owner_id": APPLICATION_ID,
+        "unavailable": False,
+        "large": False,
+        "member_count": 0,
+        "members": [],
+        "channels": [],
+        "threads": [],
+        "roles": [],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "presences": [],
+        "voice_states": [],
+        "stage_instances": [],
+        "guild_scheduled_events": []
+    }
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json, without a charset
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+class StubGateway:
+    """REST and gateway endpoints for a fake application in `guilds` guilds"""
+
+    def __init__(self, guilds: int = 10, recommended_shards: int = 1, heartbeat_interval: float = 41.25,
+                 latency: float = 0.05):
+        # Snowflake-shaped IDs whose shard is simply their index modulo the shard count
+        self.guild_ids = [(index << 22) | index for index in range(1, guilds + 1)]
+        self.recommended_shards = recommended_shards
+        self.heartbeat_interval = heartbeat_interval
+        # Simulated round trip before heartbeats are acknowledged: discord.py records
+        # a heartbeat's send time only after the send completes, and measures an
+        # instant loopback ACK against the previous heartbeat instead
+        self.latency = latency
+        self.url: Optional[str] = None
+        self.identifies = 0
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(API_PREFIX + "/users/@me", self._current_user)
+        app.router.add_get(API_PREFIX + "/oauth2/applications/@me", self._application)
+        app.router.add_get(API_PREFIX + "/gateway", self._gateway)
+        app.router.add_get(API_PREFIX + "/gateway/bot", self._gateway_bot)
+        app.router.add_put(API_PREFIX + "/applications/{application_id}/commands", self._sync_commands)
+        app.router.add_get("/stub/sessions", self._sessions)
+        app.router.add_get("/", self._websocket)
+        app.router.add_route("*", API_PREFIX + "/{path:.*}", self._unknown_route)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving on host:port (0 picks a free port) and return the stub's URL"""
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve from a daemon thread with its own event loop; returns once the stub is listening"""
+        started = threading.Event()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start(host, port))
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=serve, name="stub-gateway", daemon=True).start()
+        started.wait()
+        return self.url
+
+    def shard_guilds(self, shard_id: int, shard_count: int) -> List[int]:
+        return [guild_id for guild_id in self.guild_ids if (guild_id >> 22) % shard_count == shard_id]
+
+    async def _current_user(self, request: web.Request) -> web.Response:
+        return _json_response(BOT_USER)
+
+    async def _application(self, request: web.Request) -> web.Response:
+        return _json_response(APPLICATION)
+
+    async def _gateway(self, request: web.Request) -> web.Response:
+        return _json_response({"url": self._gateway_url()})
+
+    async def _gateway_bot(self, request: web.Request) -> web.Response:
+        return _json_response({
+            "url": self._gateway_url(),
+            "shards": self.recommended_shards,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}
+        })
+
+    async def _sync_commands(self, request: web.Request) -> web.Response:
+        # The bot only reads back the IDs Discord assigns, and tolerates none
+        return _json_response([])
+
+    async def _sessions(self, request: web.Request) -> web.Response:
+        """Connected shards, for checking a local run"""
+        return _json_response({"identifies": self.identifies, "sessions": list(self.sessions.values())})
+
+    async def _unknown_route(self, request: web.Request) -> web.Response:
+        return _json_response({"message": f"Stub gateway has no route {request.path}", "code": 0}, status=404)
+
+    def _gateway_url(self) -> str:
+        return "ws" + self.url[len("http"):] + "/"
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session_id = None
+        sequence = 0
+
+        async def send(op: int, data: Any = None, event: Optional[str] = None):
+            nonlocal sequence
+            payload = {"op": op, "d": data, "s": None, "t": event}
+            if op == OP_DISPATCH:
+                sequence += 1
+                payload["s"] = sequence
+            await ws.send_str(json.dumps(payload))
+
+        await send(OP_HELLO, {"heartbeat_interval": int(self.heartbeat_interval * 1000)})
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(message.data)
+                op = payload.get("op")
+                if op == OP_HEARTBEAT:
+                    await asyncio.sleep(self.latency)
+                    await send(OP_HEARTBEAT_ACK)
+                elif op == OP_IDENTIFY:
+                    shard_id, shard_count = payload["d"].get("shard") or (0, 1)
+                    session_id = uuid.uuid4().hex
+                    self.identifies += 1
+                    self.sessions[session_id] = {"shard_id": shard_id, "shard_count": shard_count}
+                    guild_ids = self.shard_guilds(shard_id, shard_count)
+                    await send(OP_DISPATCH, {
+                        "v": 10,
+                        "user": BOT_USER,
+                        "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in guild_ids],
+                        "session_id": session_id,
+                        "resume_gateway_url": self._gateway_url(),
+                        "shard": [shard_id, shard_count],
+                        "application": {"id": APPLICATION_ID, "flags": 0}
+                    }, "READY")
+                    for guild_id in guild_ids:
+                        await send(OP_DISPATCH, _guild_payload(guild_id, guild_id >> 22), "GUILD_CREATE")
+                elif op == OP_RESUME:
+                    # Sessions are not kept across connections; the client identifies again
+                    await send(OP_INVALID_SESSION, False)
+                # Presence updates and member requests are accepted and ignored
+        finally:
+            if session_id is not None:
+                self.sessions.pop(session_id, None)
+        return ws
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--guilds", type=int, default=10, help="number of guilds the fake application is in")
+    parser.add_argument("--shards", type=int, default=1, help="shard count recommended by GET /gateway/bot")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    async def serve():
+        gateway = StubGateway(args.guilds, args.shards)
+        url = await gateway.start(args.host, args.port)
+        logger.info("Stub gateway for %d guilds listening on %s", args.guilds, url)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Whole-hackathon team formation for the Hackathon Team Finder Discord Bot
+
+Splits every participant of a hackathon into teams of a configurable size,
+maximizing the sum of pairwise calculate_compatibility scores inside each team
+plus a bonus for every distinct role a team covers. Each restart builds a
+greedy seed and improves it with swap-based local search; restarts run in
+parallel in one long-lived process pool and share one time budget. The pool
+uses the spawn start method, since forking a process whose threads may hold
+locks (the event loop, database pools, listeners) can deadlock the child.
+"""
+
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+from config import TEAM_SOLVER_ROLE_WEIGHT, TEAM_SOLVER_TIME_BUDGET, TEAM_SOLVER_RESTARTS, TEAM_SOLVER_WORKERS
+
+# (roles mask, skills mask, experience, timezone); sets become Python int bitmasks
+EncodedProfile = Tuple[int, int, str, Any]
+
+def encode_participants(profiles: List[Dict[str, Any]]) -> List[EncodedProfile]:
+    """Intern every role and skill to a bit so pair scores are integer popcounts"""
+    role_bits: Dict[str, int] = {}
+    skill_bits: Dict[str, int] = {}
+
+    def mask(values, bits):
+        result = 0
+        for value in values:
+            if value not in bits:
+                bits[value] = 1 << len(bits)
+            result |= bits[value]
+        return result
+
+    return [
+        (
+            mask(profile.get("roles", []), role_bits),
+            mask(profile.get("tech_skills", []), skill_bits),
+            (profile.get("experience", "") or "").lower(),
+            profile.get("timezone", "")
+        )
+        for profile in profiles
+    ]
+
+def pair_score(a: EncodedProfile, b: EncodedProfile) -> float:
+    """calculate_compatibility on encoded profiles"""
+    score = 0.0
+    if a[0] != b[0]:
+        score += 0.3
+
+    total_skills = (a[1] | b[1]).bit_count()
+    if total_skills > 0:
+        overlap_ratio = (a[1] & b[1]).bit_count() / total_skills
+        if 0.2 <= overlap_ratio <= 0.6:
+            score += 0.4
+        elif overlap_ratio > 0.6:
+            score += 0.2
+        else:
+            score += 0.1
+
+    if a[2] != b[2]:
+        score += 0.2
+    if a[3] == b[3]:
+        score += 0.1
+    return min(score, 1.0)
+
+def team_sizes(participant_count: int, team_size: int) -> List[int]:
+    """Fewest teams of at most team_size, with sizes differing by at most one"""
+    if participant_count <= 0:
+        return []
+    team_count = -(-participant_count // team_size)
+    base, extra = divmod(participant_count, team_count)
+    return [base + 1 if i < extra else base for i in range(team_count)]
+
+def _team_value(members: List[int], encoded: List[EncodedProfile], role_weight: float) -> float:
+    """Pairwise compatibility inside a team plus its role coverage bonus"""
+    value = 0.0
+    roles = 0
+    for i, a in enumerate(members):
+        roles |= encoded[a][0]
+        for b in members[i + 1:]:
+            value += pair_score(encoded[a], encoded[b])
+    return value + role_weight * roles.bit_count()
+
+def evaluate(teams: List[List[int]], encoded: List[EncodedProfile], role_weight: float) -> float:
+    """Total objective of an assignment"""
+    return sum(_team_value(team, encoded, role_weight) for team in teams)
+
+def _greedy_seed(encoded: List[EncodedProfile], sizes: List[int], rng: random.Random, role_weight: float, sample_size: int, deadline: float) -> List[List[int]]:
+    """Fill teams one at a time with the best of a random sample of remaining participants"""
+    remaining = list(range(len(encoded)))
+    rng.shuffle(remaining)
+    teams = []
+    for size in sizes:
+        team = [remaining.pop()]
+        team_roles = encoded[team[0]][0]
+        while len(team) < size:
+            if time.monotonic() >= deadline:
+                team.append(remaining.pop())
+                continue
+            best_position, best_gain = len(remaining) - 1, float("-inf")
+            for position in range(max(0, len(remaining) - sample_size), len(remaining)):
+                candidate = encoded[remaining[position]]
+                gain = sum(pair_score(candidate, encoded[member]) for member in team)
+                gain += role_weight * ((team_roles | candidate[0]).bit_count() - team_roles.bit_count())
+                if gain > best_gain:
+                    best_position, best_gain = position, gain
+            chosen = remaining.pop(best_position)
+            team.append(chosen)
+            team_roles |= encoded[chosen][0]
+        teams.append(team)
+    return teams
+
+def _swap_delta(teams: List[List[int]], t1: int, i: int, t2: int, j: int, encoded: List[EncodedProfile], role_weight: float) -> float:
+    """Objective change from swapping teams[t1][i] with teams[t2][j]"""
+    a, b = teams[t1][i], teams[t2][j]
+    ea, eb = encoded[a], encoded[b]
+    delta = 0.0
+    roles1 = roles2 = 0
+    for member in teams[t1]:
+        if member != a:
+            em = encoded[member]
+            delta += pair_score(eb, em) - pair_score(ea, em)
+            roles1 |= em[0]
+    for member in teams[t2]:
+        if member != b:
+            em = encoded[member]
+            delta += pair_score(ea, em) - pair_score(eb, em)
+            roles2 |= em[0]
+    coverage_before = (roles1 | ea[0]).bit_count() + (roles2 | eb[0]).bit_count()
+    coverage_after = (roles1 | eb[0]).bit_count() + (roles2 | ea[0]).bit_count()
+    return delta + role_weight * (coverage_after - coverage_before)
+
+def _local_search(teams: List[List[int]], encoded: List[EncodedProfile], rng: random.Random, role_weight: float, deadline: float) -> int:
+    """Hill-climb with random member swaps between teams until the deadline"""
+    swaps = 0
+    if len(teams) < 2:
+        return swaps
+    # Check the clock every batch of proposals rather than on every one
+    while time.monotonic() < deadline:
+        for _ in range(256):
+            t1, t2 = rng.sample(range(len(teams)), 2)
+            i = rng.randrange(len(teams[t1]))
+            j = rng.randrange(len(teams[t2]))
+            if _swap_delta(teams, t1, i, t2, j, encoded, role_weight) > 1e-12:
+                teams[t1][i], teams[t2][j] = teams[t2][j], teams[t1][i]
+                swaps += 1
+    return swaps
+
+def _solve_restart(encoded: List[EncodedProfile], sizes: List[int], seed: int, time_budget: float, role_weight: float, sample_size: int) -> Tuple[float, List[List[int]], int]:
+    """One restart: greedy seed plus local search within its own time budget"""
+    deadline = time.monotonic() + time_budget
+    rng = random.Random(seed)
+    # Leave most of the budget for local search
+    seed_deadline = time.monotonic() + time_budget * 0.5
+    teams = _greedy_seed(encoded, sizes, rng, role_weight, sample_size, seed_deadline)
+    swaps = _local_search(teams, encoded, rng, role_weight, deadline)
+    return evaluate(teams, encoded, role_weight), teams, swaps
+
+_solver_pool: Optional[ProcessPoolExecutor] = None
+_solver_pool_workers = max(1, TEAM_SOLVER_WORKERS or min(TEAM_SOLVER_RESTARTS, os.cpu_count() or 1))
+_solver_pool_lock = threading.Lock()
+
+def get_solver_pool() -> ProcessPoolExecutor:
+    """Shared process pool for solver restarts, started on first use"""
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is None:
+            _solver_pool = ProcessPoolExecutor(max_workers=_solver_pool_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _solver_pool
+
+def shutdown_solver_pool(wait: bool = True):
+    """Stop the solver pool; the next parallel solve starts a new one"""
+    global _solver_pool
+    with _solver_pool_lock:
+        pool, _solver_pool = _solver_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+def form_teams(participants: List[Dict[str, Any]], team_size: int = 4, time_budget: float = TEAM_SOLVER_TIME_BUDGET, restarts: int = TEAM_SOLVER_RESTARTS, workers: Optional[int] = None, role_weight: float = TEAM_SOLVER_ROLE_WEIGHT, seed: int = 0, sample_size: int = 32) -> Dict[str, Any]:
+    """Split participant profiles into teams of at most team_size
+
+    Returns a dict with the teams as lists of user IDs, the objective value,
+    and solver statistics. workers=1 runs every restart in this process;
+    otherwise restarts go to the shared solver pool, at most workers at a time.
+    """
+    if team_size < 1:
+        raise ValueError("team_size must be at least 1")
+    started = time.monotonic()
+    encoded = encode_participants(participants)
+    sizes = team_sizes(len(participants), team_size)
+    restarts = max(1, restarts)
+    workers = min(restarts, workers or _solver_pool_workers, _solver_pool_workers)
+
+    jobs = [(encoded, sizes, seed + restart, time_budget, role_weight, sample_size) for restart in range(restarts)]
+    if workers == 1:
+        # Split the budget across sequential restarts
+        jobs = [job[:3] + (time_budget / restarts,) + job[4:] for job in jobs]
+        results = [_solve_restart(*job) for job in jobs]
+    else:
+        rounds = -(-restarts // workers)
+        jobs = [job[:3] + (time_budget / rounds,) + job[4:] for job in jobs]
+        results = list(get_solver_pool().map(_solve_restart, *zip(*jobs)))
+
+    best_value, best_teams, _ = max(results, key=lambda result: result[0])
+    return {
+        "teams": [[participants[member]["user_id"] for member in team] for team in best_teams],
+        "objective": best_value,
+        "restarts": restarts,
+        "workers": workers,
+        "swaps": sum(result[2] for result in results),
+        "elapsed": time.monotonic() - started
+    }
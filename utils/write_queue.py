@@ -0,0 +1,140 @@
+"""
+Group-commit write-behind queue for the Hackathon Team Finder Discord Bot
+
+Bursts of /pick-hackathon joins and profile saves each used to pay for their
+own session and commit. Writes submitted here wait at most the flush interval
+(or until the batch is full) and are then applied together in one transaction
+by utils.async_database.apply_write_batch. Every caller still awaits its own
+result, which resolves only after the batch has committed, so replies stay
+accurate. Pending writes are flushed when the queue is closed.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Dict, List, Tuple, Any, Optional
+from config import WRITE_QUEUE_FLUSH_INTERVAL, WRITE_QUEUE_MAX_BATCH
+
+logger = logging.getLogger(__name__)
+
+class WriteQueue:
+    """Batches async writes into group commits, resolving one future per write"""
+
+    def __init__(self, flush_interval: float = WRITE_QUEUE_FLUSH_INTERVAL, max_batch: int = WRITE_QUEUE_MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+        self._pending: List[Tuple[Tuple, asyncio.Future]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._has_pending: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.operations = 0
+        self.batches = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    def _start(self):
+        """Bind to the running loop and start the flusher on first use"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._has_pending = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+        if self._task is None or self._task.done():
+            # A fresh context, so the flusher does not act as whichever user started it
+            self._task = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def submit(self, operation: Tuple) -> bool:
+        """Queue one write operation and wait for its committed result"""
+        if self._closed:
+            raise RuntimeError("Write queue is closed")
+        self._start()
+        future = self._loop.create_future()
+        self._pending.append((operation, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    async def save_profile(self, user_data: Dict[str, Any]) -> bool:
+        return await self.submit(('save_profile', user_data))
+
+    async def join(self, guild_id: str, hackathon_id: int, user_id: str, username: str) -> bool:
+        return await self.submit(('join', guild_id, hackathon_id, user_id, username))
+
+    async def leave(self, guild_id: str, hackathon_id: int, user_id: str) -> bool:
+        return await self.submit(('leave', guild_id, hackathon_id, user_id))
+
+    async def _run(self):
+        """Flush a batch whenever it fills up or the oldest write has waited the interval"""
+        while True:
+            await self._has_pending.wait()
+            if len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+
+    async def flush(self):
+        """Commit every pending write now"""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            while self._pending:
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                await self._commit(batch)
+            self._has_pending.clear()
+            self._batch_full.clear()
+
+    async def _commit(self, batch: List[Tuple[Tuple, asyncio.Future]]):
+        from .async_database import apply_write_batch
+
+        try:
+            results = await apply_write_batch([operation for operation, _ in batch])
+        except Exception as e:
+            logger.error(f"Write batch of {len(batch)} failed: {e}")
+            results = [False] * len(batch)
+
+        self.operations += len(batch)
+        self.batches += 1
+        self.failed += results.count(False)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        """Flush pending writes and stop the flusher; later submits raise"""
+        self._closed = True
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "operations": self.operations,
+            "batches": self.batches,
+            "failed": self.failed,
+            "largest_batch": self.largest_batch,
+            "mean_batch": self.operations / self.batches if self.batches else 0.0
+        }
+
+_write_queue: Optional[WriteQueue] = None
+
+def get_write_queue() -> WriteQueue:
+    """Shared write queue, configured from WRITE_QUEUE_FLUSH_INTERVAL and WRITE_QUEUE_MAX_BATCH"""
+    global _write_queue
+    if _write_queue is None:
+        _write_queue = WriteQueue()
+    return _write_queue
@@ -0,0 +1 @@
+# Views package for the Hackathon Team Finder Discord Bot
@@ -0,0 +1,80 @@
+"""
+Hackathon list pager, one keyset page of hackathons per click
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import discord
+from utils.data_manager import get_hackathon_summaries_page_async, get_data_version
+from utils.render_cache import get_render_cache
+from config import EMBED_COLORS, HACKATHON_PAGE_SIZE
+from .pager import CursorPager
+
+class HackathonPager(CursorPager):
+    """Pages through hackathons by ID; each click reads one page of rows
+
+    Only the guild's hackathons are listed. Pages and their embeds are shared
+    by every pager in the guild through the render cache until a hackathon
+    write there moves the guild's data version on.
+    """
+
+    def __init__(self, owner_id: int, guild_id: str, page_size: int = HACKATHON_PAGE_SIZE):
+        super().__init__(owner_id)
+        self.guild_id = guild_id
+        self.page_size = page_size
+        self.hackathons: List[Dict[str, Any]] = []
+        self.version: Optional[Tuple[int, ...]] = None
+
+    async def _fetch_page(self, after_id: Optional[int] = None, before_id: Optional[int] = None):
+        """(hackathons, more, version) for one page, read at most once per data version"""
+        version = get_data_version(self.guild_id, 'hackathons')
+        hackathons, more = await get_render_cache().get_or_render_async(
+            ("hackathon_page", self.guild_id, after_id, before_id, self.page_size), version,
+            lambda: get_hackathon_summaries_page_async(
+                self.guild_id, after_id=after_id, before_id=before_id, limit=self.page_size
+            )
+        )
+        return hackathons, more, version
+
+    async def fetch_first(self) -> bool:
+        self.hackathons, self.has_next, self.version = await self._fetch_page()
+        self.has_previous = False
+        return bool(self.hackathons)
+
+    async def fetch_next(self):
+        hackathons, more, version = await self._fetch_page(after_id=self.hackathons[-1]['id'])
+        if hackathons:
+            self.hackathons, self.version = hackathons, version
+            self.has_previous = True
+        else:
+            # The rest were deleted since the last page; stay here
+            self.page_number -= 1
+        self.has_next = more
+
+    async def fetch_previous(self):
+        hackathons, more, version = await self._fetch_page(before_id=self.hackathons[0]['id'])
+        if hackathons:
+            self.hackathons, self.version = hackathons, version
+            self.has_next = True
+        else:
+            self.page_number += 1
+        self.has_previous = more
+
+    def build_embed(self) -> discord.Embed:
+        key = ("hackathon_embed", self.guild_id, tuple(hackathon['id'] for hackathon in self.hackathons), self.page_number)
+        return get_render_cache().get_or_render(key, self.version, self._render_embed)
+
+    def _render_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title="🏆 Available Hackathons",
+            color=EMBED_COLORS["success"]
+        )
+
+        for hackathon in self.hackathons:
+            embed.add_field(
+                name=f"#{hackathon['id']} - {hackathon['name']}",
+                value=f"📅 {hackathon.get('date', 'TBD')}\n👥 {hackathon['participant_count']} participants\n📝 {(hackathon.get('description') or 'No description')[:100]}...",
+                inline=False
+            )
+
+        embed.set_footer(text=f"Page {self.page_number}")
+        return embed
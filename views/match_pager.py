@@ -0,0 +1,70 @@
+"""
+Ranked match pager, one page of matches per click
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import discord
+from utils.match_service import get_match_service
+from config import EMBED_COLORS, MATCH_PAGE_SIZE
+from .pager import CursorPager
+
+class MatchPager(CursorPager):
+    """Pages through a user's guild-wide matches, best first
+
+    The cursor is the last (user_id, score) pair shown; each page asks the
+    match service for page_size + 1 matches below it, the extra one only
+    telling whether another page follows.
+    """
+
+    def __init__(self, owner_id: int, profile: Dict[str, Any], page_size: int = MATCH_PAGE_SIZE):
+        super().__init__(owner_id)
+        self.profile = profile
+        self.page_size = page_size
+        self.matches: List[Dict[str, Any]] = []
+        # Cursor each page was fetched from, so previous re-fetches the page before
+        self._cursors: List[Optional[Tuple[str, float]]] = []
+
+    async def _fetch(self, after: Optional[Tuple[str, float]]):
+        matches = await get_match_service().find_teammates(self.profile, k=self.page_size + 1, after=after)
+        self.matches = matches[:self.page_size]
+        self.has_next = len(matches) > self.page_size
+
+    async def fetch_first(self) -> bool:
+        self._cursors = [None]
+        await self._fetch(None)
+        return bool(self.matches)
+
+    async def fetch_next(self):
+        last = self.matches[-1]
+        self._cursors.append((last['user_id'], last['compatibility_score']))
+        await self._fetch(self._cursors[-1])
+        self.has_previous = True
+
+    async def fetch_previous(self):
+        self._cursors.pop()
+        await self._fetch(self._cursors[-1])
+        self.has_previous = len(self._cursors) > 1
+
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title="🤝 Compatible Team Members",
+            description="Here are users who might be good teammates:",
+            color=EMBED_COLORS["success"]
+        )
+
+        start = (self.page_number - 1) * self.page_size
+        for i, match in enumerate(self.matches, start + 1):
+            user_data = match['profile'] or {}
+            compatibility_score = match['compatibility_score']
+            # Add error handling for missing keys
+            roles = user_data.get('roles', [])
+            tech_skills = user_data.get('tech_skills', [])
+
+            embed.add_field(
+                name=f"{i}. {user_data.get('username', 'Unknown User')} (Score: {compatibility_score:.1f})",
+                value=f"Roles: {', '.join(roles).title() if roles else 'Not specified'}\nSkills: {', '.join(tech_skills[:3]) if tech_skills else 'Not specified'}",
+                inline=False
+            )
+
+        embed.set_footer(text=f"Page {self.page_number}")
+        return embed
@@ -0,0 +1,70 @@
+"""
+Cursor pager base view for paginated embeds
+"""
+
+import discord
+from typing import Dict, Any
+from discord.ui import View, Button
+from utils.data_manager import set_current_user
+from config import PAGER_TIMEOUT
+
+class CursorPager(View):
+    """Previous/next buttons that fetch one page per click from a cursor
+
+    Subclasses load pages with fetch_first/fetch_next/fetch_previous, keep
+    has_next/has_previous current and render the page in build_embed.
+    """
+
+    def __init__(self, owner_id: int, timeout: float = PAGER_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.owner_id = owner_id
+        self.page_number = 1
+        self.has_next = False
+        self.has_previous = False
+
+    async def fetch_first(self) -> bool:
+        """Load the first page; False when there is nothing to show"""
+        raise NotImplementedError
+
+    async def fetch_next(self):
+        raise NotImplementedError
+
+    async def fetch_previous(self):
+        raise NotImplementedError
+
+    def build_embed(self) -> discord.Embed:
+        raise NotImplementedError
+
+    async def first_page(self, empty_message: str) -> Dict[str, Any]:
+        """Load the first page as message keyword arguments, or empty_message when there is none"""
+        if not await self.fetch_first():
+            return {"content": empty_message}
+        self._update_buttons()
+        return {"embed": self.build_embed(), "view": self}
+
+    async def start(self, interaction: discord.Interaction, empty_message: str):
+        """Send the first page, or empty_message when there is none"""
+        await interaction.response.send_message(ephemeral=True, **await self.first_page(empty_message))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Only the user who ran the command can turn its pages"""
+        set_current_user(str(interaction.user.id))
+        return interaction.user.id == self.owner_id
+
+    def _update_buttons(self):
+        self.previous_button.disabled = not self.has_previous
+        self.next_button.disabled = not self.has_next
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, interaction: discord.Interaction, button: Button):
+        await self.fetch_previous()
+        self.page_number -= 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        await self.fetch_next()
+        self.page_number += 1
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)